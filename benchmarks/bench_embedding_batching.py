@@ -0,0 +1,88 @@
+"""
+Throughput of concurrent embed_query calls with and without micro-batching.
+
+Usage:
+    python -m benchmarks.bench_embedding_batching
+    python -m benchmarks.bench_embedding_batching --callers 32 --requests 4000
+    python -m benchmarks.bench_embedding_batching --model sentence-transformers/all-mpnet-base-v2
+"""
+import argparse
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from src.embeddings.scheduler import MicroBatchEmbedder
+
+
+class SyntheticEmbeddings(Embeddings):
+    """
+    CPU-only stand-in for a sentence-transformer.
+
+    Each call pays a fixed overhead (busy-waited, so it holds the GIL like
+    tokenization and dispatch do) plus a per-text cost.
+    """
+
+    def __init__(self, dimension=768, call_overhead_ms=4.0, per_text_ms=0.3):
+        self.dimension = dimension
+        self.call_overhead = call_overhead_ms / 1000
+        self.per_text = per_text_ms / 1000
+
+    def _spin(self, seconds):
+        end = time.perf_counter() + seconds
+        while time.perf_counter() < end:
+            pass
+
+    def embed_documents(self, texts):
+        self._spin(self.call_overhead + self.per_text * len(texts))
+        rng = np.random.default_rng(len(texts))
+        return rng.standard_normal((len(texts), self.dimension)).astype(np.float32).tolist()
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+
+def measure(embedder, callers, requests):
+    texts = [f"senior python developer with {i % 15} years experience" for i in range(requests)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=callers) as pool:
+        list(pool.map(embedder.embed_query, texts))
+    seconds = time.perf_counter() - start
+    return {"seconds": round(seconds, 3), "queries_per_second": round(requests / seconds, 1)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--callers", type=int, default=16, help="concurrent callers")
+    parser.add_argument("--requests", type=int, default=2000, help="total embed_query calls")
+    parser.add_argument("--max-batch", type=int, default=32)
+    parser.add_argument("--max-wait-ms", type=float, default=2.0)
+    parser.add_argument("--model", help="HuggingFace model to use instead of the synthetic embedder")
+    args = parser.parse_args()
+
+    if args.model:
+        from langchain_huggingface import HuggingFaceEmbeddings
+
+        base = HuggingFaceEmbeddings(model_name=args.model, model_kwargs={"device": "cpu"})
+    else:
+        base = SyntheticEmbeddings()
+
+    single = measure(base, args.callers, args.requests)
+    batcher = MicroBatchEmbedder(base, max_batch_size=args.max_batch, max_wait_ms=args.max_wait_ms)
+    batched = measure(batcher, args.callers, args.requests)
+    batcher.close()
+
+    print(json.dumps({
+        "callers": args.callers,
+        "requests": args.requests,
+        "single_call": single,
+        "micro_batched": batched,
+        "speedup": round(batched["queries_per_second"] / single["queries_per_second"], 2),
+        "scheduler": batcher.stats(),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
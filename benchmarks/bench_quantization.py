@@ -0,0 +1,99 @@
+"""
+Compressed vector formats of the local index against the float32 baseline.
+
+Builds one LocalIndex per format (none = float32, float16, int8, binary)
+over the same synthetic clustered 768-d vectors, then reports the bytes the
+query scan reads per vector and in total, single-query QPS, bulk (query_many)
+QPS and recall@k against exact float32 search. Candidates found on the
+compressed codes are always rescored from the float32 mmap file.
+
+Usage:
+    python -m benchmarks.bench_quantization
+    python -m benchmarks.bench_quantization --vectors 100000 --queries 200 --k 10
+    python -m benchmarks.bench_quantization --formats int8 binary --rescore-factor 32
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.bench_matching import synthetic_vectors
+from src.storage.local_index import LocalIndex
+
+
+def build(directory, quantization, vectors, rescore_factor, chunk=10000):
+    index = LocalIndex(
+        directory, ivf_min_vectors=sys.maxsize, quantization=quantization, rescore_factor=rescore_factor,
+    )
+    start = time.perf_counter()
+    for offset in range(0, len(vectors), chunk):
+        index.upsert(vectors=[
+            {"id": str(offset + i), "values": vector}
+            for i, vector in enumerate(vectors[offset:offset + chunk])
+        ])
+    return index, time.perf_counter() - start
+
+
+def recall(results, truth, k):
+    return float(np.mean([len(set(r) & set(t)) / k for r, t in zip(results, truth)]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vectors", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--dimension", type=int, default=768)
+    parser.add_argument("--formats", nargs="+", default=["none", "float16", "int8", "binary"])
+    parser.add_argument("--rescore-factor", type=int, default=0, help="0 = each format's default")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    centers = rng.standard_normal((64, args.dimension), dtype=np.float32)
+    vectors = synthetic_vectors(args.vectors, args.dimension, centers, rng)
+    queries = synthetic_vectors(args.queries, args.dimension, centers, rng)
+    truth = [list(map(str, np.argsort(-(vectors @ q))[:args.k])) for q in queries]
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for quantization in args.formats:
+            directory = os.path.join(tmp, quantization)
+            index, build_seconds = build(directory, quantization, vectors, args.rescore_factor)
+            scanned = index.codes_path if index.quantizer is not None else index.matrix_path
+
+            start = time.perf_counter()
+            single = [[m["id"] for m in index.query(vector=q, top_k=args.k)["matches"]] for q in queries]
+            single_seconds = time.perf_counter() - start
+
+            start = time.perf_counter()
+            bulk = index.query_many(queries, top_k=args.k)
+            bulk_seconds = time.perf_counter() - start
+
+            results[quantization] = {
+                "bytes_per_vector": os.path.getsize(scanned) // index._capacity(),
+                "scanned_mb": round(os.path.getsize(scanned) / 2**20, 1),
+                "rescore_factor": index.rescore_factor,
+                "build_seconds": round(build_seconds, 2),
+                "qps": round(args.queries / single_seconds, 1),
+                "bulk_qps": round(args.queries / bulk_seconds, 1),
+                f"recall@{args.k}": round(recall(single, truth, args.k), 4),
+                f"bulk_recall@{args.k}": round(
+                    recall([[m["id"] for m in r["matches"]] for r in bulk], truth, args.k), 4
+                ),
+            }
+
+    print(json.dumps({
+        "vectors": args.vectors,
+        "queries": args.queries,
+        "k": args.k,
+        "dimension": args.dimension,
+        "formats": results,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
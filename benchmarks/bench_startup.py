@@ -0,0 +1,81 @@
+"""
+Startup cost of the RAG engine: module import, engine construction and the
+first query, each measured in a fresh interpreter.
+
+Runs offline by default (hash embedder, local index, scripted LLM); pass
+--real to use whatever backends the environment configures.
+
+Usage:
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --runs 5
+    python -m benchmarks.bench_startup --real
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+OFFLINE_ENV = {
+    "EMBEDDING_BACKEND": "hash",
+    "VECTORSTORE_BACKEND": "local",
+    "LLM_BACKEND": "fake",
+    "FAKE_LLM_TOKEN_DELAY": "0",
+    "LANGCHAIN_API_KEY": "",
+}
+
+# Runs in the child interpreter; prints one JSON line of timings in seconds
+_CHILD = """
+import json, time
+t0 = time.perf_counter()
+from src.rag.engine import RagEngine
+t1 = time.perf_counter()
+engine = RagEngine(recreate_index=False)
+t2 = time.perf_counter()
+engine.interpret_query("Which candidates know Python?")
+t3 = time.perf_counter()
+print(json.dumps({"import": t1 - t0, "init": t2 - t1, "first_query": t3 - t2}))
+"""
+
+
+def run_once(env):
+    result = subprocess.run(
+        [sys.executable, "-c", _CHILD], env=env, capture_output=True, text=True, check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def summarize(samples):
+    return {
+        stage: round(1000 * statistics.median(s[stage] for s in samples), 1)
+        for stage in samples[0]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3, help="fresh interpreters per mode")
+    parser.add_argument("--real", action="store_true", help="use the configured backends instead of offline ones")
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode, lazy in (("lazy", "true"), ("eager", "false")):
+            env = dict(os.environ, LAZY_INIT=lazy, PYTHONPATH=os.getcwd())
+            if not args.real:
+                env.update(
+                    OFFLINE_ENV,
+                    CACHE_DIR=os.path.join(tmp, mode, "cache"),
+                    LOCAL_INDEX_DIR=os.path.join(tmp, mode, "index"),
+                    LEXICAL_INDEX_DIR=os.path.join(tmp, mode, "lexical"),
+                )
+            samples = [run_once(env) for _ in range(args.runs)]
+            results[mode] = summarize(samples)
+
+    print(json.dumps({"runs": args.runs, "median_ms": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
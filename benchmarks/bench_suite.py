@@ -0,0 +1,315 @@
+"""
+End-to-end benchmark suite that runs fully offline and fails on regressions.
+
+Every external service is replaced by a deterministic fake: the hash
+embedder (EMBEDDING_BACKEND=hash), the in-memory index with a fixed
+latency injected into every call (VECTORSTORE_BACKEND=memory,
+MEMORY_INDEX_LATENCY) and the scripted streaming LLM (LLM_BACKEND=fake).
+Over a synthetic resume corpus it measures
+
+- ingest: ingest_incremental throughput, i.e. the document loader's
+  process pool -> metadata extraction -> chunk_documents -> process_documents
+- query: interpret_query latency percentiles and throughput under concurrency
+- startup: import, engine init and first query in a fresh interpreter
+- memory: peak RSS of the ingest and query runs
+
+The ingest and query runs are repeated --repeats times and each metric is
+the median over the repeats. Results are printed as JSON (and written to
+--output) and compared with a stored baseline; the run exits with status 1
+when a metric is worse than the baseline by more than --tolerance. Tail
+latencies (p95, p99) swing far more between runs than the median does, so
+they are held to the wider --tail-tolerance. Record a new baseline after an
+intended change, on the machine that runs the comparison, with
+--update-baseline.
+
+Usage:
+    python -m benchmarks.bench_suite
+    python -m benchmarks.bench_suite --docs 400 --queries 400 --concurrency 16 --output results.json
+    python -m benchmarks.bench_suite --update-baseline
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from benchmarks.bench_startup import OFFLINE_ENV, run_once
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+# Timing differences below this are noise whatever the relative change
+MIN_DELTA_MS = 5.0
+# Gated with --tail-tolerance instead of --tolerance
+TAIL_METRICS = {"query_p95_ms", "query_p99_ms"}
+
+# Metric -> True when larger values are better
+METRICS = {
+    "ingest_docs_per_second": True,
+    "ingest_vectors_per_second": True,
+    "query_p50_ms": False,
+    "query_p95_ms": False,
+    "query_p99_ms": False,
+    "queries_per_second": True,
+    "startup_import_ms": False,
+    "startup_init_ms": False,
+    "startup_first_query_ms": False,
+    "peak_rss_mb": False,
+}
+
+_SKILLS = [
+    "python", "java", "rust", "go", "kubernetes", "docker", "aws", "gcp", "sql", "spark",
+    "pandas", "pytorch", "react", "typescript", "django", "flask", "terraform", "kafka",
+]
+_TITLES = ["backend engineer", "data scientist", "ml engineer", "devops engineer", "frontend developer"]
+_CITIES = ["Berlin", "London", "Toronto", "Austin", "Bangalore", "Lagos", "Madrid"]
+_DEGREES = ["BSc Computer Science", "MSc Data Science", "BEng Software Engineering", "PhD Statistics"]
+
+
+def offline_env(tmp, args) -> dict:
+    """Environment that points every backend at a fake and all state at ``tmp``."""
+    return {
+        **OFFLINE_ENV,
+        "VECTORSTORE_BACKEND": "memory",
+        "MEMORY_INDEX_LATENCY": str(args.index_latency),
+        "FAKE_LLM_TOKEN_DELAY": str(args.token_delay),
+        "ANSWER_CACHE_ENABLED": "false",  # every query runs the full path
+        "DATA_DIR": os.path.join(tmp, "corpus"),
+        "CACHE_DIR": os.path.join(tmp, "cache"),
+        "LOCAL_INDEX_DIR": os.path.join(tmp, "index"),
+        "LEXICAL_INDEX_DIR": os.path.join(tmp, "lexical"),
+        "MATCH_MATRIX_DIR": os.path.join(tmp, "resumes"),
+    }
+
+
+def write_corpus(directory, count, seed=0):
+    """Write ``count`` deterministic synthetic resumes as text files."""
+    rng = random.Random(seed)
+    os.makedirs(directory, exist_ok=True)
+    for i in range(count):
+        skills = rng.sample(_SKILLS, 5)
+        title = rng.choice(_TITLES)
+        sections = [
+            f"Candidate {i}\n{title.title()} based in {rng.choice(_CITIES)}",
+            f"Summary\n{rng.randint(1, 15)} years of experience as a {title} working with "
+            f"{', '.join(skills[:3])}.",
+            f"Skills\n{', '.join(skills)}",
+            "Experience\n" + "\n".join(
+                f"{rng.choice(_TITLES).title()} at Company {rng.randint(1, 500)} for {rng.randint(1, 5)} years: "
+                f"built and operated services in {rng.choice(skills)} and {rng.choice(skills)}, mentored "
+                f"{rng.randint(1, 8)} engineers, owned on-call for the {rng.choice(skills)} platform and "
+                f"improved p95 latency by {rng.randint(5, 60)}% while cutting infrastructure cost."
+                for _ in range(rng.randint(6, 12))
+            ),
+            f"Education\n{rng.choice(_DEGREES)}",
+        ]
+        with open(os.path.join(directory, f"resume_{i:05d}.txt"), "w") as f:
+            f.write("\n\n".join(sections))
+
+
+def questions(count, seed=1):
+    rng = random.Random(seed)
+    return [
+        f"Which {rng.choice(_TITLES)}s know {rng.choice(_SKILLS)} and {rng.choice(_SKILLS)} "
+        f"with at least {rng.randint(1, 10)} years in {rng.choice(_CITIES)}? ({i})"
+        for i in range(count)
+    ]
+
+
+def bench_ingest(engine, directory, expected_docs):
+    """
+    Ingest the corpus through the document loader; exits if any document
+    failed to load or nothing was written.
+    """
+    from src.data_processing.ingest import ingest_incremental
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        summary = ingest_incremental(engine, "**/*.txt", directory)
+    # Queries against a partial or empty index would produce meaningless timings
+    if summary["added"] != expected_docs or not summary["vectors"]:
+        sys.exit(
+            f"Ingest failed: added {summary['added']} of {expected_docs} documents "
+            f"({summary['failed']} failed), wrote {summary['vectors']} vectors"
+        )
+    return {
+        "documents": summary["added"],
+        "vectors": summary["vectors"],
+        "seconds": summary["seconds"],
+        "ingest_docs_per_second": round(summary["added"] / summary["seconds"], 1),
+        "ingest_vectors_per_second": round(summary["vectors"] / summary["seconds"], 1),
+    }
+
+
+def bench_queries(engine, count, concurrency, warmup=5):
+    def timed(question):
+        start = time.perf_counter()
+        engine.interpret_query(question)
+        return time.perf_counter() - start
+
+    # interpret_query prints progress for the interactive session
+    with contextlib.redirect_stdout(io.StringIO()):
+        for question in questions(warmup, seed=2):
+            timed(question)
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            latencies = np.array(list(pool.map(timed, questions(count))))
+        seconds = time.perf_counter() - start
+    p50, p95, p99 = np.percentile(latencies * 1000, [50, 95, 99])
+    return {
+        "queries": count,
+        "concurrency": concurrency,
+        "query_p50_ms": round(float(p50), 1),
+        "query_p95_ms": round(float(p95), 1),
+        "query_p99_ms": round(float(p99), 1),
+        "queries_per_second": round(count / seconds, 1),
+    }
+
+
+def median_runs(runs: list[dict]) -> dict:
+    """Per-key median of several runs' results."""
+    return {key: round(statistics.median(run[key] for run in runs), 3 if key == "seconds" else 1) for key in runs[0]}
+
+
+def bench_startup(env, runs):
+    child_env = dict(os.environ, **env, PYTHONPATH=os.getcwd())
+    samples = [run_once(child_env) for _ in range(runs)]
+    return {
+        f"startup_{stage}_ms": round(1000 * statistics.median(s[stage] for s in samples), 1)
+        for stage in samples[0]
+    }
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    scale = 2**20 if sys.platform == "darwin" else 2**10
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale, 1)
+
+
+def compare(metrics, baseline, tolerance, tail_tolerance):
+    """
+    Metrics that are worse than the baseline by more than their tolerance.
+
+    Args:
+        tolerance: Allowed relative change of every metric but the tail latencies
+        tail_tolerance: Allowed relative change of TAIL_METRICS
+    """
+    regressions = []
+    for name, higher_is_better in METRICS.items():
+        value, expected = metrics.get(name), baseline.get(name)
+        if value is None or expected is None:
+            continue
+        if name.endswith("_ms") and abs(value - expected) < MIN_DELTA_MS:
+            continue
+        allowed = tail_tolerance if name in TAIL_METRICS else tolerance
+        if higher_is_better:
+            worse = value < expected * (1 - allowed)
+        else:
+            worse = value > expected * (1 + allowed)
+        if worse:
+            change = (value - expected) / expected if expected else float("inf")
+            regressions.append({"metric": name, "baseline": expected, "value": value, "change": round(change, 3)})
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=200, help="synthetic resumes to ingest")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8, help="queries in flight")
+    parser.add_argument("--index-latency", type=float, default=0.005, help="seconds injected into every index call")
+    parser.add_argument("--token-delay", type=float, default=0.001, help="seconds per streamed LLM chunk")
+    parser.add_argument("--startup-runs", type=int, default=3, help="fresh interpreters for the startup timings")
+    parser.add_argument("--repeats", type=int, default=3, help="ingest and query runs; metrics are their medians")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative change per metric")
+    parser.add_argument(
+        "--tail-tolerance", type=float, default=1.0, help="allowed relative change of the p95 and p99 latencies"
+    )
+    parser.add_argument("--output", help="also write the results JSON here")
+    parser.add_argument("--update-baseline", action="store_true", help="store these results as the new baseline")
+    args = parser.parse_args()
+
+    config = {
+        "docs": args.docs,
+        "queries": args.queries,
+        "concurrency": args.concurrency,
+        "index_latency": args.index_latency,
+        "token_delay": args.token_delay,
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        env = offline_env(tmp, args)
+        os.environ.update(env)
+        # Settings are read at import, so nothing from src is imported before this point
+        from src.rag.engine import RagEngine
+
+        write_corpus(env["DATA_DIR"], args.docs)
+        startup = bench_startup(env, args.startup_runs)
+        engine = RagEngine(recreate_index=False, lazy=False)
+        ingests, queries = [], []
+        for repeat in range(args.repeats):
+            if repeat:
+                # Start every ingest from an empty index
+                with contextlib.redirect_stdout(io.StringIO()):
+                    engine.clear_vectorstore()
+            ingests.append(bench_ingest(engine, env["DATA_DIR"], args.docs))
+            queries.append(bench_queries(engine, args.queries, args.concurrency))
+        ingest, query = median_runs(ingests), median_runs(queries)
+
+    metrics = {
+        **{k: v for k, v in ingest.items() if k in METRICS},
+        **{k: v for k, v in query.items() if k in METRICS},
+        **startup,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+    results = {"config": config, "repeats": args.repeats, "metrics": metrics, "ingest": ingest, "query": query}
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump({"config": config, "metrics": metrics}, f, indent=2)
+            f.write("\n")
+        print(f"Baseline written to {args.baseline}", file=sys.stderr)
+    elif os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get("config") != config:
+            print(
+                f"Baseline {args.baseline} was recorded with {baseline.get('config')}; "
+                "not comparing a run with a different configuration",
+                file=sys.stderr,
+            )
+        else:
+            results["regressions"] = compare(metrics, baseline["metrics"], args.tolerance, args.tail_tolerance)
+
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if results.get("regressions"):
+        print(
+            f"\nPERFORMANCE REGRESSION (tolerance {args.tolerance:.0%}, tails {args.tail_tolerance:.0%}):",
+            file=sys.stderr,
+        )
+        for r in results["regressions"]:
+            print(
+                f"  {r['metric']}: {r['value']} vs baseline {r['baseline']} ({r['change']:+.1%})",
+                file=sys.stderr,
+            )
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
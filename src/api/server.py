@@ -0,0 +1,278 @@
+# @ IMPORT THE NECESSARY LIBRARIES
+import asyncio
+import json
+import logging
+import time
+import uuid
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
+
+from src.config.settings import API_HOST, API_PORT, MATCH_TOP_K
+from src.data_processing.document_loader import validate_file_pattern
+from src.data_processing.ingest import ingest_incremental
+from src.monitoring.metrics import metrics, observe_stage, stage_timer, QUERIES
+from src.rag.engine import RagEngine
+from src.rag.reindex import reindex, rollback
+
+logger = logging.getLogger(__name__)
+
+
+class QueryRequest(BaseModel):
+    question: str
+    user_id: str | None = None
+    namespaces: list[str] | None = None
+
+
+class IngestRequest(BaseModel):
+    file_pattern: str = "**/*.pdf"
+    namespace: str | None = None
+
+
+class MatchRequest(BaseModel):
+    jobs: list[str]
+    k: int = MATCH_TOP_K
+    filter: dict | None = None
+    namespaces: list[str] | None = None
+
+
+class ReindexRequest(BaseModel):
+    file_pattern: str = "**/*.pdf"
+    switch: bool = True
+
+
+class FeedbackRequest(BaseModel):
+    run_id: str
+    score: float
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One warm engine per process, shared by every request. Loading the
+    # embedding model is blocking, so it happens off the event loop.
+    logger.info("Warming up RAG engine...")
+    app.state.engine = await run_in_threadpool(RagEngine, recreate_index=False)
+    app.state.ingest_task = None
+    app.state.ingest_result = None
+    app.state.reindex_task = None
+    app.state.reindex_result = None
+    yield
+
+
+app = FastAPI(title="Job Portal RAG API", lifespan=lifespan)
+
+
+def _sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+@app.get("/health")
+async def health():
+    vectors = await run_in_threadpool(app.state.engine.vector_count)
+    return {
+        "status": "ok",
+        "vectors": vectors,
+        "answer_cache": app.state.engine.answer_cache.stats(),
+    }
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """Per-stage latency histograms and ingest counters in Prometheus text format."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
+@app.post("/query")
+async def query(request: QueryRequest):
+    """Answer a question, streaming LLM tokens as server-sent events.
+
+    Events: ``sources`` (once), ``token`` (per chunk), then ``done`` with the
+    run ID and context token counts, or ``error`` if generation fails
+    mid-stream. Only the requested namespaces are searched.
+    """
+    engine = app.state.engine
+    run_id = str(uuid.uuid4())
+    start = time.perf_counter()
+    filter = engine.query_filter(request.question)
+    scope = engine.cache_scope(request.namespaces, filter)
+    if engine.index_alias.changed():
+        # Switching versions reloads the index files; keep that off the event loop
+        await run_in_threadpool(engine.follow_alias)
+    # Query embedding is CPU-bound; keep it off the event loop
+    with stage_timer("embed"):
+        embedding = await run_in_threadpool(engine.embeddings.embed_query, request.question)
+    with stage_timer("cache"):
+        cached = engine.answer_cache.lookup(embedding, scope)
+    context, packing = None, None
+    if cached is not None:
+        docs = cached["docs"]
+    else:
+        docs = await run_in_threadpool(
+            engine.retriever, request.question, embedding, filter=filter, namespaces=request.namespaces
+        )
+        context, packing = await run_in_threadpool(engine.build_context, request.question, docs)
+
+    async def events():
+        yield _sse(
+            "sources",
+            [{"metadata": doc.metadata, "content": doc.page_content} for doc in docs],
+        )
+        if cached is not None:
+            yield _sse("token", {"text": cached["answer"]})
+            yield _sse("done", {"run_id": run_id, "cached": True})
+            QUERIES.inc(outcome="cached")
+            observe_stage("total", time.perf_counter() - start)
+            return
+
+        tokens = []
+        try:
+            async for token in engine.astream_answer(
+                request.question, docs, request.user_id, context=context
+            ):
+                tokens.append(token)
+                yield _sse("token", {"text": token})
+        except Exception as e:
+            logger.error(f"Error streaming answer: {e}")
+            yield _sse("error", {"detail": str(e)})
+            QUERIES.inc(outcome="error")
+            return
+        elapsed = time.perf_counter() - start
+        engine.answer_cache.store(request.question, embedding, "".join(tokens), docs, elapsed, scope)
+        yield _sse("done", {"run_id": run_id, "cached": False, "context": packing})
+        QUERIES.inc(outcome="answered")
+        observe_stage("total", elapsed)
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+@app.post("/ingest", status_code=202)
+async def ingest(request: IngestRequest):
+    """Start an incremental ingest in the background; poll GET /ingest for the result.
+
+    With a ``namespace``, the matched files are written to that partition and
+    only its files are diffed and deleted.
+    """
+    if _running(app.state.ingest_task) or _running(app.state.reindex_task):
+        raise HTTPException(status_code=409, detail="An ingest or reindex is already running")
+    _check_pattern(request.file_pattern)
+
+    async def run():
+        try:
+            app.state.ingest_result = await run_in_threadpool(
+                ingest_incremental, app.state.engine, request.file_pattern, namespace=request.namespace
+            )
+        except Exception as e:
+            logger.error(f"Ingest failed: {e}")
+            app.state.ingest_result = {"error": str(e)}
+
+    app.state.ingest_task = asyncio.create_task(run())
+    return {"status": "started"}
+
+
+def _running(task) -> bool:
+    return task is not None and not task.done()
+
+
+def _check_pattern(file_pattern: str):
+    """Refuse patterns that would read files outside the data directory."""
+    try:
+        validate_file_pattern(file_pattern)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.post("/reindex", status_code=202)
+async def start_reindex(request: ReindexRequest):
+    """Build a new index version in the background and switch to it once verified."""
+    if _running(app.state.ingest_task) or _running(app.state.reindex_task):
+        raise HTTPException(status_code=409, detail="An ingest or reindex is already running")
+    _check_pattern(request.file_pattern)
+
+    async def run():
+        try:
+            app.state.reindex_result = await run_in_threadpool(
+                reindex, app.state.engine, request.file_pattern, switch=request.switch
+            )
+        except Exception as e:
+            logger.error(f"Reindex failed: {e}")
+            app.state.reindex_result = {"error": str(e)}
+
+    app.state.reindex_task = asyncio.create_task(run())
+    return {"status": "started"}
+
+
+@app.get("/reindex")
+async def reindex_status():
+    engine = app.state.engine
+    task = app.state.reindex_task
+    status = "idle" if task is None else "running" if not task.done() else "finished"
+    return {
+        "status": status,
+        "active_index": engine.active_index,
+        "result": app.state.reindex_result if status == "finished" else None,
+    }
+
+
+@app.post("/reindex/rollback")
+async def rollback_index():
+    if _running(app.state.reindex_task):
+        raise HTTPException(status_code=409, detail="A reindex is running")
+    try:
+        name = await run_in_threadpool(rollback, app.state.engine)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return {"active_index": name}
+
+
+@app.get("/ingest")
+async def ingest_status():
+    task = app.state.ingest_task
+    if task is None:
+        return {"status": "idle"}
+    if not task.done():
+        return {"status": "running"}
+    return {"status": "finished", "result": app.state.ingest_result}
+
+
+@app.post("/match")
+async def match(request: MatchRequest):
+    """Rank ingested resumes for each job description, without the LLM."""
+    engine = app.state.engine
+    if engine.matcher is None:
+        raise HTTPException(status_code=404, detail="Bulk matching is disabled")
+    results = await run_in_threadpool(
+        engine.match_jobs, request.jobs, request.k, request.filter, request.namespaces
+    )
+    return {"matches": [{"job": i, "candidates": candidates} for i, candidates in enumerate(results)]}
+
+
+@app.get("/namespaces")
+async def namespaces():
+    """Namespaces that hold vectors or ingested files, besides the default one."""
+    return {"namespaces": await run_in_threadpool(app.state.engine.namespaces)}
+
+
+@app.delete("/namespaces/{namespace}")
+async def clear_namespace(namespace: str):
+    """Delete every document of one namespace; other namespaces are untouched."""
+    if _running(app.state.ingest_task) or _running(app.state.reindex_task):
+        raise HTTPException(status_code=409, detail="An ingest or reindex is running")
+    await run_in_threadpool(app.state.engine.clear_vectorstore, namespace)
+    return {"status": "cleared", "namespace": namespace}
+
+
+@app.post("/feedback")
+async def feedback(request: FeedbackRequest):
+    # Only enqueues; the feedback sink sends it in the background
+    app.state.engine.log_feedback(request.run_id, request.score)
+    return {"status": "queued"}
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    # A single worker keeps one warm engine; concurrency comes from the event loop
+    uvicorn.run("src.api.server:app", host=API_HOST, port=API_PORT, workers=1)
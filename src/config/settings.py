@@ -4,6 +4,9 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+# @ STARTUP SETTINGS
+LAZY_INIT = os.getenv("LAZY_INIT", "true").lower() == "true"  # load models/clients on first use
+
 # @ PINECONE SETTINGS
 
 PINECONE_API_KEY = os.getenv("PINECONE_API_KEY")
@@ -15,19 +18,161 @@ PINECONE_ENVIRONMENT = os.getenv("PINECONE_ENVIRONMENT")
 MISTRAL_API_KEY = os.getenv("MISTRAL_API_KEY")
 TEMPERATURE = float(os.getenv("TEMPERATURE", 0.7))
 MODEL_NAME = os.getenv("MODEL_NAME", "mistral-tiny")
+LLM_BACKEND = os.getenv("LLM_BACKEND", "mistral")  # mistral | fake
+FAKE_LLM_RESPONSE = os.getenv("FAKE_LLM_RESPONSE", "This is a canned answer used for load testing.")
+FAKE_LLM_TOKEN_DELAY = float(os.getenv("FAKE_LLM_TOKEN_DELAY", 0.01))  # seconds per streamed chunk
 
 # @ EMBEDDING MODEL SETTINGS
 EMBEDDING_MODEL = "sentence-transformers/all-mpnet-base-v2"  # 768-dimension model
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "huggingface")  # huggingface | hash (offline)
+EMBEDDING_DIMENSION = int(os.getenv("EMBEDDING_DIMENSION", 0)) or None  # overrides model lookup
+EMBED_BATCHING = os.getenv("EMBED_BATCHING", "true").lower() == "true"  # micro-batch concurrent queries
+EMBED_MAX_BATCH = int(os.getenv("EMBED_MAX_BATCH", 32))
+EMBED_MAX_WAIT_MS = float(os.getenv("EMBED_MAX_WAIT_MS", 2))
 
 
 # @ DATA SETTINGS
 Base_DIR = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
-DATA_DIR = os.path.join(Base_DIR, "data", "tmp")
+DATA_DIR = os.getenv("DATA_DIR", os.path.join(Base_DIR, "data", "tmp"))
+CACHE_DIR = os.getenv("CACHE_DIR", os.path.join(Base_DIR, "data", "cache"))
+INGEST_MANIFEST_PATH = os.path.join(CACHE_DIR, "ingest_manifest.json")
+INDEX_DESCRIPTOR_PATH = os.path.join(CACHE_DIR, "index_descriptors.json")
+INDEX_ALIAS_PATH = os.path.join(CACHE_DIR, "index_alias.json")  # live version of each index
+
+
+# @ CHUNKING SETTINGS
+CHUNK_STRATEGY = os.getenv("CHUNK_STRATEGY", "structure")  # structure | tokens | none
+CHUNK_SIZE = int(os.getenv("CHUNK_SIZE", 200))  # whitespace tokens, below mpnet's 384 limit
+CHUNK_OVERLAP = int(os.getenv("CHUNK_OVERLAP", 30))
+
+
+# @ RETRIEVAL SETTINGS
+RETRIEVAL_K = int(os.getenv("RETRIEVAL_K", 7))
+CHILD_FETCH_MULTIPLIER = int(os.getenv("CHILD_FETCH_MULTIPLIER", 4))  # children fetched per parent
+INDEX_STATS_TTL = float(os.getenv("INDEX_STATS_TTL", 60))  # seconds
+PARTITION_FANOUT_WORKERS = int(os.getenv("PARTITION_FANOUT_WORKERS", 8))  # namespaces searched in parallel
+
+
+# @ METADATA SETTINGS
+METADATA_EXTRACTION = os.getenv("METADATA_EXTRACTION", "true").lower() == "true"  # resume fields at ingest
+METADATA_FILTERING = os.getenv("METADATA_FILTERING", "true").lower() == "true"  # query constraints -> filter
+
+
+# @ CONTEXT PACKING SETTINGS
+CONTEXT_PACKING = os.getenv("CONTEXT_PACKING", "true").lower() == "true"
+CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", 1500))  # approximate prompt tokens
+CONTEXT_MMR_LAMBDA = float(os.getenv("CONTEXT_MMR_LAMBDA", 0.7))  # relevance vs. novelty
+CONTEXT_DEDUP_THRESHOLD = float(os.getenv("CONTEXT_DEDUP_THRESHOLD", 0.95))  # cosine
+
+
+# @ HYBRID SEARCH SETTINGS
+HYBRID_SEARCH = os.getenv("HYBRID_SEARCH", "true").lower() == "true"  # BM25 + dense with RRF
+LEXICAL_INDEX_DIR = os.getenv("LEXICAL_INDEX_DIR", os.path.join(Base_DIR, "data", "lexical"))
+BM25_K1 = float(os.getenv("BM25_K1", 1.5))
+BM25_B = float(os.getenv("BM25_B", 0.75))
+# Deleted documents are purged from disk on save once they exceed this fraction of rows
+BM25_COMPACT_DEAD_FRACTION = float(os.getenv("BM25_COMPACT_DEAD_FRACTION", 0.25))
+
+
+# @ RERANK SETTINGS
+RERANK_ENABLED = os.getenv("RERANK_ENABLED", "false").lower() == "true"
+RERANK_MODEL = os.getenv("RERANK_MODEL", "cross-encoder/ms-marco-MiniLM-L-6-v2")
+RERANK_CANDIDATES = int(os.getenv("RERANK_CANDIDATES", 30))  # passages scored per query
+RERANK_TOP_N = int(os.getenv("RERANK_TOP_N", 4))  # passages kept for the prompt
+RERANK_BUDGET_MS = float(os.getenv("RERANK_BUDGET_MS", 300))
+RERANK_BATCH_SIZE = int(os.getenv("RERANK_BATCH_SIZE", 32))
+RERANK_WORKERS = int(os.getenv("RERANK_WORKERS", 2))  # concurrent scoring jobs; more queue
+
+
+# @ ANSWER CACHE SETTINGS
+ANSWER_CACHE_ENABLED = os.getenv("ANSWER_CACHE_ENABLED", "true").lower() == "true"
+ANSWER_CACHE_THRESHOLD = float(os.getenv("ANSWER_CACHE_THRESHOLD", 0.92))  # cosine similarity
+ANSWER_CACHE_TTL = float(os.getenv("ANSWER_CACHE_TTL", 3600))  # seconds
+ANSWER_CACHE_SIZE = int(os.getenv("ANSWER_CACHE_SIZE", 1000))
+
+
+# @ INGEST SETTINGS
+LOADER_WORKERS = int(os.getenv("LOADER_WORKERS", os.cpu_count() or 1))
+LOADER_FILE_TIMEOUT = int(os.getenv("LOADER_FILE_TIMEOUT", 120))  # seconds per file
+INGEST_BATCH_SIZE = int(os.getenv("INGEST_BATCH_SIZE", 256))  # chunks per upsert call
+INGEST_QUEUE_SIZE = int(os.getenv("INGEST_QUEUE_SIZE", 64))  # parsed files waiting for embedding
+
+
+# @ BATCH QUESTION SETTINGS
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", 4))  # questions in flight
+BATCH_RATE_LIMIT = float(os.getenv("BATCH_RATE_LIMIT", 2.0))  # LLM calls per second, 0 = unlimited
+BATCH_MAX_RETRIES = int(os.getenv("BATCH_MAX_RETRIES", 4))  # retries after a 429
+BATCH_BACKOFF = float(os.getenv("BATCH_BACKOFF", 1.0))  # seconds, doubled per retry
+
+
+# @ UPSERT SETTINGS
+UPSERT_BATCH_SIZE = int(os.getenv("UPSERT_BATCH_SIZE", 100))  # vectors per request
+UPSERT_MAX_BATCH_BYTES = int(os.getenv("UPSERT_MAX_BATCH_BYTES", 1_800_000))  # Pinecone caps requests at 2MB
+UPSERT_WORKERS = int(os.getenv("UPSERT_WORKERS", 4))
+UPSERT_MAX_RETRIES = int(os.getenv("UPSERT_MAX_RETRIES", 3))
+UPSERT_BACKOFF = float(os.getenv("UPSERT_BACKOFF", 0.5))  # seconds, doubled per retry
+
+
+# @ REINDEX SETTINGS
+REINDEX_SAMPLE_QUERIES = int(os.getenv("REINDEX_SAMPLE_QUERIES", 20))  # chunks re-queried to verify a new version
+REINDEX_MIN_RECALL = float(os.getenv("REINDEX_MIN_RECALL", 0.9))  # share that must retrieve themselves in the top 5
+REINDEX_VERIFY_TIMEOUT = float(os.getenv("REINDEX_VERIFY_TIMEOUT", 120))  # seconds to wait for vector counts to settle
+
+
+# @ VECTOR STORE SETTINGS
+VECTORSTORE_BACKEND = os.getenv("VECTORSTORE_BACKEND", "pinecone")  # pinecone | local | memory
+MEMORY_INDEX_LATENCY = float(os.getenv("MEMORY_INDEX_LATENCY", 0))  # seconds added to every memory-backend call
+LOCAL_INDEX_DIR = os.getenv("LOCAL_INDEX_DIR", os.path.join(Base_DIR, "data", "index"))
+LOCAL_IVF_MIN_VECTORS = int(os.getenv("LOCAL_IVF_MIN_VECTORS", 50000))  # exact search below this
+LOCAL_IVF_NPROBE = int(os.getenv("LOCAL_IVF_NPROBE", 8))
+# Deleted and overwritten rows are compacted away once they exceed this fraction of the files
+LOCAL_COMPACT_DEAD_FRACTION = float(os.getenv("LOCAL_COMPACT_DEAD_FRACTION", 0.25))
+LOCAL_QUANTIZATION = os.getenv("LOCAL_QUANTIZATION", "none")  # none | float16 | int8 | binary
+LOCAL_RESCORE_FACTOR = int(os.getenv("LOCAL_RESCORE_FACTOR", 0))  # float32 rescoring candidates per result; 0 = per-format default
+
+
+# @ MATCHING SETTINGS
+MATCHING_ENABLED = os.getenv("MATCHING_ENABLED", "true").lower() == "true"  # keep a resume embedding matrix
+MATCH_MATRIX_DIR = os.getenv("MATCH_MATRIX_DIR", os.path.join(Base_DIR, "data", "resumes"))
+MATCH_TOP_K = int(os.getenv("MATCH_TOP_K", 20))
+MATCH_ROW_BLOCK = int(os.getenv("MATCH_ROW_BLOCK", 16384))  # resumes scored per matmul block
+MATCH_QUERY_BLOCK = int(os.getenv("MATCH_QUERY_BLOCK", 256))  # job descriptions per matmul block
+
+
+# @ EMBEDDING CACHE SETTINGS
+EMBEDDING_CACHE_ENABLED = os.getenv("EMBEDDING_CACHE_ENABLED", "true").lower() == "true"
+EMBEDDING_CACHE_DIR = os.path.join(CACHE_DIR, "embeddings")
+EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", 10000))  # in-memory entries
+
+
+# @ API SETTINGS
+API_HOST = os.getenv("API_HOST", "0.0.0.0")
+API_PORT = int(os.getenv("API_PORT", 8000))
 
 
 # @ LANGSMITH API KEY
 LANGCHAIN_API_KEY = os.getenv("LANGCHAIN_API_KEY")
-os.environ["LANGCHAIN_TRACING_V2"] = "true"
+# Tracing is on only when a key is configured, unless explicitly overridden
+LANGSMITH_TRACING = os.getenv("LANGCHAIN_TRACING_V2", "true" if LANGCHAIN_API_KEY else "false").lower() == "true"
+os.environ["LANGCHAIN_TRACING_V2"] = "true" if LANGSMITH_TRACING else "false"
+REPORT_CACHE_PATH = os.path.join(CACHE_DIR, "langsmith_report_cache.json")  # aggregates of completed days
+# Days this recent are always re-fetched: late runs and feedback still arrive for them
+REPORT_CACHE_GRACE_DAYS = int(os.getenv("REPORT_CACHE_GRACE_DAYS", 2))
+
+
+# @ FEEDBACK SETTINGS
+FEEDBACK_SPILL_PATH = os.path.join(CACHE_DIR, "feedback_spill.jsonl")  # replayed on next start
+FEEDBACK_QUEUE_SIZE = int(os.getenv("FEEDBACK_QUEUE_SIZE", 10000))
+FEEDBACK_BATCH_SIZE = int(os.getenv("FEEDBACK_BATCH_SIZE", 50))
+FEEDBACK_FLUSH_INTERVAL = float(os.getenv("FEEDBACK_FLUSH_INTERVAL", 1.0))  # seconds
+FEEDBACK_MAX_RETRIES = int(os.getenv("FEEDBACK_MAX_RETRIES", 3))
+FEEDBACK_BACKOFF = float(os.getenv("FEEDBACK_BACKOFF", 0.5))  # seconds, doubled per retry
+
+
+# @ METRICS SETTINGS
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+METRICS_FILE = os.getenv("METRICS_FILE", os.path.join(CACHE_DIR, "metrics.prom"))  # empty disables file export
+METRICS_EXPORT_INTERVAL = float(os.getenv("METRICS_EXPORT_INTERVAL", 15))  # seconds
 
 
 if __name__ == "__main__":
@@ -2,6 +2,31 @@
 Data processing module for the Job Portal RAG application.
 """
 
-from .document_loader import load_documents, load_cv_documents
+from .document_loader import (
+    load_documents,
+    load_cv_documents,
+    list_document_files,
+    load_file,
+    iter_documents,
+    validate_file_pattern,
+)
+from .chunking import chunk_documents, collapse_to_parents, split_text
+from .manifest import IngestManifest
+from .metadata import extract_resume_metadata, parse_query_constraints
+from .ingest import ingest_incremental
 
-__all__ = ["load_documents", "load_cv_documents"]
+__all__ = [
+    "load_documents",
+    "load_cv_documents",
+    "list_document_files",
+    "load_file",
+    "iter_documents",
+    "validate_file_pattern",
+    "chunk_documents",
+    "collapse_to_parents",
+    "split_text",
+    "IngestManifest",
+    "extract_resume_metadata",
+    "parse_query_constraints",
+    "ingest_incremental",
+]
@@ -0,0 +1,177 @@
+# @ IMPORTING NECESSARY LIBRARIES
+import hashlib
+import logging
+import re
+
+from langchain_core.documents import Document
+
+from src.config.settings import CHUNK_STRATEGY, CHUNK_SIZE, CHUNK_OVERLAP
+
+logger = logging.getLogger(__name__)
+
+CHUNK_STRATEGIES = ("none", "structure", "tokens")
+
+# Common resume section names; all-caps short lines are treated as headings too
+_SECTION_NAMES = re.compile(
+    r"^\s*(summary|profile|objective|about me|experience|work experience|"
+    r"professional experience|employment history|education|skills|"
+    r"technical skills|core competencies|certifications?|projects|languages|"
+    r"awards|publications|references|interests)\s*:?\s*$",
+    re.IGNORECASE,
+)
+
+# Metadata keys that only make sense on a child chunk
+CHILD_KEYS = ("chunk_index", "chunk_count")
+
+
+def parent_id_for(source: str) -> str:
+    """Stable parent-document ID derived from a source path."""
+    return hashlib.sha1(source.encode("utf-8")).hexdigest()[:16]
+
+
+def _is_heading(line: str) -> bool:
+    stripped = line.strip()
+    if not stripped:
+        return False
+    if _SECTION_NAMES.match(stripped):
+        return True
+    return stripped.isupper() and len(stripped.split()) <= 5
+
+
+def _split_sections(text: str) -> list[str]:
+    """Split text at section headings, keeping each heading with its body."""
+    sections, current = [], []
+    for line in text.splitlines():
+        if _is_heading(line) and any(l.strip() for l in current):
+            sections.append("\n".join(current).strip())
+            current = []
+        current.append(line)
+    if current:
+        sections.append("\n".join(current).strip())
+    return [s for s in sections if s]
+
+
+def _windows(words: list[str], size: int, overlap: int):
+    step = max(size - overlap, 1)
+    for start in range(0, len(words), step):
+        yield words[start:start + size]
+        if start + size >= len(words):
+            break
+
+
+def split_text(
+    text: str,
+    strategy: str = CHUNK_STRATEGY,
+    chunk_size: int = CHUNK_SIZE,
+    chunk_overlap: int = CHUNK_OVERLAP,
+) -> list[str]:
+    """
+    Split text into chunks of at most chunk_size whitespace tokens.
+
+    Args:
+        text: The text to split
+        strategy: "structure" splits at resume section headings and merges
+            small sections; "tokens" uses a sliding window; "none" keeps the
+            text whole
+        chunk_size: Maximum tokens per chunk
+        chunk_overlap: Tokens shared between consecutive windows
+    """
+    if strategy not in CHUNK_STRATEGIES:
+        raise ValueError(f"Unknown chunk strategy '{strategy}', expected one of {CHUNK_STRATEGIES}")
+    if strategy == "none":
+        return [text]
+    if strategy == "tokens":
+        return [" ".join(w) for w in _windows(text.split(), chunk_size, chunk_overlap)]
+
+    chunks, buffer, buffer_len = [], [], 0
+
+    def flush():
+        nonlocal buffer, buffer_len
+        if buffer:
+            chunks.append("\n\n".join(buffer))
+        buffer, buffer_len = [], 0
+
+    for section in _split_sections(text):
+        words = section.split()
+        if len(words) > chunk_size:
+            flush()
+            chunks.extend(" ".join(w) for w in _windows(words, chunk_size, chunk_overlap))
+            continue
+        if buffer_len + len(words) > chunk_size:
+            flush()
+        buffer.append(section)
+        buffer_len += len(words)
+    flush()
+    return chunks
+
+
+def chunk_documents(
+    docs,
+    strategy: str = CHUNK_STRATEGY,
+    chunk_size: int = CHUNK_SIZE,
+    chunk_overlap: int = CHUNK_OVERLAP,
+):
+    """
+    Split whole documents into child chunks that carry parent metadata.
+
+    Each child keeps the parent's metadata plus ``parent_id``, ``chunk_index``
+    and ``chunk_count``, so retrieval can collapse hits back to the parent.
+    A document's existing ``parent_id`` metadata is kept; otherwise it is
+    derived from its ``source``.
+    """
+    if strategy == "none":
+        return list(docs)
+
+    children = []
+    for doc in docs:
+        parent_id = doc.metadata.get("parent_id") or parent_id_for(
+            doc.metadata.get("source", doc.page_content[:200])
+        )
+        pieces = split_text(doc.page_content, strategy, chunk_size, chunk_overlap) or [""]
+        for i, piece in enumerate(pieces):
+            metadata = dict(doc.metadata)
+            metadata.update(
+                parent_id=parent_id,
+                chunk_index=i,
+                chunk_count=len(pieces),
+                is_whole_document=False,
+            )
+            children.append(Document(page_content=piece, metadata=metadata))
+
+    logger.info(f"Split {len(docs)} documents into {len(children)} chunks ({strategy})")
+    return children
+
+
+def collapse_to_parents(docs, k: int):
+    """
+    Collapse ranked child hits into at most k parent documents.
+
+    Parents are ordered by their best-ranked child. Each parent's matched
+    chunks are joined in document order, so the prompt gets the relevant
+    parts of a resume rather than the whole file. Documents without a
+    ``parent_id`` (whole-document vectors) pass through unchanged.
+    """
+    groups: dict[str, list] = {}
+    for doc in docs:
+        key = doc.metadata.get("parent_id") or doc.metadata.get("source") or id(doc)
+        if key not in groups:
+            if len(groups) >= k:
+                continue
+            groups[key] = []
+        groups[key].append(doc)
+
+    parents = []
+    for chunks in groups.values():
+        if len(chunks) == 1 and "parent_id" not in chunks[0].metadata:
+            parents.append(chunks[0])
+            continue
+        chunks = sorted(chunks, key=lambda d: d.metadata.get("chunk_index", 0))
+        metadata = {k_: v for k_, v in chunks[0].metadata.items() if k_ not in CHILD_KEYS}
+        metadata["matched_chunks"] = [d.metadata.get("chunk_index", 0) for d in chunks]
+        parents.append(
+            Document(
+                page_content="\n...\n".join(d.page_content for d in chunks),
+                metadata=metadata,
+            )
+        )
+    return parents
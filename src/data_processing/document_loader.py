@@ -1,12 +1,215 @@
 # @ IMPORTING NECESSARY LIBRARIES
-from langchain_community.document_loaders import DirectoryLoader
-from src.config.settings import DATA_DIR
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from langchain_community.document_loaders import TextLoader, UnstructuredFileLoader
+from langchain_core.documents import Document
+from src.config.settings import DATA_DIR, LOADER_WORKERS, LOADER_FILE_TIMEOUT
+from pathlib import Path
 import logging
+import os
+import queue
+import re
+import signal
+import threading
+import time
 
 # @ SET LOGGING LEVEL
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
+# Loaders by file extension; anything else goes through unstructured.
+# Plain text needs no parsing, so it does not depend on unstructured.
+LOADERS = {
+    ".txt": lambda path: TextLoader(path, encoding="utf-8"),
+}
+
+
+def _raise_timeout(signum, frame):
+    raise TimeoutError("file parsing timed out")
+
+
+def _parse_file(path, timeout):
+    """
+    Parse one file inside a worker process.
+
+    Returns plain (page_content, metadata) tuples and an error string instead
+    of raising, so one bad file never takes down the pool. Where SIGALRM is
+    available the timeout is enforced inside the worker, which keeps the
+    worker reusable.
+    """
+    use_alarm = timeout and hasattr(signal, "SIGALRM")
+    if use_alarm:
+        signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.alarm(int(timeout))
+    try:
+        loader = LOADERS.get(os.path.splitext(path)[1].lower(), UnstructuredFileLoader)
+        documents = loader(path).load()
+        return [(doc.page_content, doc.metadata) for doc in documents], None
+    except BaseException as e:  # isolate every failure, including the alarm
+        return [], f"{type(e).__name__}: {e}"
+    finally:
+        if use_alarm:
+            signal.alarm(0)
+
+
+def _to_documents(parsed):
+    documents = []
+    for page_content, metadata in parsed:
+        metadata["is_whole_document"] = True
+        documents.append(Document(page_content=page_content, metadata=metadata))
+    return documents
+
+
+def _shutdown_pool(executor, kill=False):
+    """Shut a pool down without waiting; ``kill`` also terminates workers that are still parsing."""
+    # The executor forgets its processes on shutdown, so take them first
+    processes = list((getattr(executor, "_processes", None) or {}).values())
+    executor.shutdown(wait=False, cancel_futures=True)
+    if kill:
+        for process in processes:
+            process.terminate()
+
+
+def iter_documents(
+    paths=None,
+    file_pattern="**/*.pdf",
+    workers=LOADER_WORKERS,
+    timeout=LOADER_FILE_TIMEOUT,
+    max_pending=None,
+):
+    """
+    Parse files in a process pool and yield them as they finish.
+
+    At most ``max_pending`` files are in flight at once, so memory stays flat
+    regardless of corpus size. Files that fail or exceed ``timeout`` seconds
+    are yielded with an error instead of aborting the run.
+
+    Where SIGALRM is unavailable (Windows) the timeout cannot interrupt a
+    running parse, and a running future cannot be cancelled. Files still
+    running after twice the timeout are therefore failed by the parent, and
+    the pool is killed and restarted to free their workers; the other files
+    in flight are resubmitted. Closing the generator early kills the pool.
+
+    Args:
+        paths: Files to parse; defaults to everything under DATA_DIR matching file_pattern
+        file_pattern: Glob pattern used when paths is not given
+        workers: Number of worker processes
+        timeout: Per-file parse timeout in seconds
+        max_pending: Maximum files in flight; defaults to twice the worker count
+
+    Yields:
+        (path, documents, error) tuples in completion order.
+    """
+    paths = iter(list_document_files(file_pattern) if paths is None else paths)
+    max_pending = max_pending or workers * 2
+    # Parent-side deadline in case a worker cannot be interrupted (no SIGALRM)
+    deadline_slack = timeout * 2 if timeout else None
+
+    executor = ProcessPoolExecutor(max_workers=workers)
+    pending = {}  # future -> (path, submitted_at)
+    try:
+        exhausted = False
+        while True:
+            while not exhausted and len(pending) < max_pending:
+                path = next(paths, None)
+                if path is None:
+                    exhausted = True
+                    break
+                future = executor.submit(_parse_file, str(path), timeout)
+                pending[future] = (str(path), time.monotonic())
+            if not pending:
+                break
+
+            done, _ = wait(pending, timeout=1.0, return_when=FIRST_COMPLETED)
+            broken = False
+            for future in done:
+                path, _ = pending.pop(future)
+                try:
+                    parsed, error = future.result()
+                except BrokenProcessPool as e:
+                    parsed, error, broken = [], f"worker crashed: {e}", True
+                yield path, _to_documents(parsed), error
+
+            if broken:
+                # A crashed worker breaks the whole pool; fail what was in flight and restart
+                for path, _ in pending.values():
+                    yield path, [], "worker pool restarted after a crash"
+                pending.clear()
+                executor.shutdown(wait=False, cancel_futures=True)
+                executor = ProcessPoolExecutor(max_workers=workers)
+                continue
+
+            if deadline_slack:
+                now = time.monotonic()
+                overdue = [f for f, (_, submitted_at) in pending.items() if now - submitted_at > deadline_slack]
+                timed_out = [pending.pop(future)[0] for future in overdue]
+                # cancel() fails for a parse that is already running
+                if not all([future.cancel() for future in overdue]):
+                    _shutdown_pool(executor, kill=True)
+                    executor = ProcessPoolExecutor(max_workers=workers)
+                    in_flight = [path for path, _ in pending.values()]
+                    pending.clear()
+                    for path in in_flight:
+                        pending[executor.submit(_parse_file, path, timeout)] = (path, time.monotonic())
+                for path in timed_out:
+                    yield path, [], f"timed out after {deadline_slack}s"
+    finally:
+        # Parses still in flight when the consumer stops early are not waited for
+        _shutdown_pool(executor, kill=bool(pending))
+
+
+def prefetch(iterable, maxsize, put_timeout=0.5):
+    """
+    Drain an iterator on a background thread into a bounded queue.
+
+    The producer keeps running while the consumer is busy (e.g. embedding),
+    and blocks once ``maxsize`` items are waiting, which gives backpressure.
+    If the consumer stops early (an exception, or the generator is closed),
+    the producer notices within ``put_timeout`` seconds, stops and closes
+    ``iterable``, so a generator such as :func:`iter_documents` can shut its
+    process pool down.
+    """
+    buffer = queue.Queue(maxsize=maxsize)
+    sentinel = object()
+    failure = []
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=put_timeout)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in iterable:
+                if not put(item):
+                    break
+        except BaseException as e:
+            failure.append(e)
+        finally:
+            close = getattr(iterable, "close", None)
+            if close is not None:
+                close()
+            put(sentinel)
+
+    threading.Thread(target=produce, daemon=True).start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is sentinel:
+                break
+            yield item
+    finally:
+        stop.set()
+    if failure:
+        raise failure[0]
+
+
 def load_documents(file_pattern="**/*.pdf"):
     """
     Load documents as single chunks (no splitting).
@@ -14,20 +217,61 @@ def load_documents(file_pattern="**/*.pdf"):
     """
     try:
         logger.info(f"Loading documents from {DATA_DIR}")
-        loader = DirectoryLoader(DATA_DIR, glob=file_pattern)
-        documents = loader.load()
-        
-        # Add metadata to identify document type
-        for doc in documents:
-            doc.metadata["is_whole_document"] = True
-            
+        documents = []
+        for path, docs, error in iter_documents(file_pattern=file_pattern):
+            if error:
+                logger.error(f"Skipping {path}: {error}")
+                continue
+            documents.extend(docs)
+
         logger.info(f"Loaded {len(documents)} documents as single chunks")
         return documents
-        
+
     except Exception as e:
         logger.error(f"Error loading documents: {e}")
         raise
 
+def validate_file_pattern(file_pattern: str) -> str:
+    """
+    Reject glob patterns that could reach outside the data directory.
+
+    Raises:
+        ValueError: If the pattern is absolute or contains a ``..`` segment.
+    """
+    if not file_pattern or os.path.isabs(file_pattern) or file_pattern.startswith(("/", "\\")):
+        raise ValueError(f"File pattern must be relative to the data directory: {file_pattern!r}")
+    if ".." in re.split(r"[\\/]", file_pattern):
+        raise ValueError(f"File pattern must not contain '..': {file_pattern!r}")
+    return file_pattern
+
+
+def list_document_files(file_pattern="**/*.pdf", data_dir=DATA_DIR):
+    """
+    List the files under data_dir matching file_pattern, sorted by path.
+
+    Matches that resolve outside data_dir (e.g. through a symlink) are dropped.
+
+    Raises:
+        ValueError: If the pattern is absolute or contains ``..``.
+    """
+    validate_file_pattern(file_pattern)
+    root = Path(data_dir).resolve()
+    return sorted(
+        str(p) for p in Path(data_dir).glob(file_pattern)
+        if p.is_file() and p.resolve().is_relative_to(root)
+    )
+
+
+def load_file(path):
+    """
+    Load a single file as one document chunk, with the same metadata
+    load_documents attaches.
+    """
+    parsed, error = _parse_file(str(path), timeout=None)
+    if error:
+        raise ValueError(f"Could not load {path}: {error}")
+    return _to_documents(parsed)
+
 # Alias for backward compatibility
 load_cv_documents = load_documents
 
@@ -0,0 +1,138 @@
+# @ IMPORTING NECESSARY LIBRARIES
+import logging
+import time
+
+from src.config.settings import DATA_DIR, INGEST_BATCH_SIZE, INGEST_QUEUE_SIZE, METADATA_EXTRACTION
+from src.monitoring.metrics import INGEST_FILES
+from .chunking import chunk_documents, parent_id_for
+from .document_loader import iter_documents, list_document_files, prefetch
+from .manifest import vector_ids_for
+from .metadata import extract_resume_metadata
+
+logger = logging.getLogger(__name__)
+
+
+def ingest_incremental(
+    engine,
+    file_pattern="**/*.pdf",
+    data_dir=DATA_DIR,
+    batch_size=INGEST_BATCH_SIZE,
+    queue_size=INGEST_QUEUE_SIZE,
+    namespace: str | None = None,
+):
+    """
+    Ingest only the files that changed since the last run.
+
+    Unchanged files are skipped. New and changed files are parsed in a
+    process pool and streamed through a bounded queue, so embedding and
+    upsert start while parsing is still running. Structured resume fields
+    (skills, years of experience, location, education, last title) are
+    added to every chunk's metadata for filtered search. Their chunks are upserted
+    in batches under deterministic IDs, and vectors belonging to removed
+    files or to chunks a changed file no longer produces are deleted.
+
+    Args:
+        engine: The RagEngine to ingest into; its manifest is updated in place
+        file_pattern: Glob pattern of files to ingest, relative to data_dir
+        data_dir: Root directory of the documents
+        batch_size: Chunks accumulated across files before each upsert
+        queue_size: Parsed files allowed to wait for embedding
+        namespace: Partition (client, job posting or batch) the files are
+            written to; only that partition's files are diffed and deleted.
+            Files ingested earlier under another pattern or directory are
+            kept until they are deleted from disk
+
+    Returns:
+        A summary dict with per-category file counts and the vectors written.
+    """
+    start = time.perf_counter()
+    manifest = engine.manifest
+    paths = list_document_files(file_pattern, data_dir)
+    changed, unchanged, removed = manifest.diff(paths, namespace)
+    manifest.record_source(namespace, file_pattern, data_dir)
+    scope = f" for namespace '{namespace}'" if namespace else ""
+    logger.info(
+        f"Ingest plan{scope}: {len(changed)} changed, {len(unchanged)} unchanged, "
+        f"{len(removed)} removed"
+    )
+
+    summary = {
+        "added": 0,
+        "updated": 0,
+        "removed": 0,
+        "skipped": len(unchanged),
+        "failed": 0,
+        "vectors": 0,
+    }
+    file_info = {path: (size, mtime, sha256) for path, size, mtime, sha256 in changed}
+    batch = []  # (path, key, docs, ids) per file
+
+    def flush():
+        docs = [doc for _, _, file_docs, _ in batch for doc in file_docs]
+        ids = [i for _, _, _, file_ids in batch for i in file_ids]
+        failed_ids = (
+            set(engine.process_documents(docs, ids=ids, namespace=namespace)["failed_ids"]) if docs else set()
+        )
+
+        for path, key, _, file_ids in batch:
+            # A file is recorded only when all of its chunks were written,
+            # so a partially failed file is retried on the next run
+            if failed_ids.intersection(file_ids):
+                summary["failed"] += 1
+                continue
+
+            old_ids = manifest.ids(key)
+            new_ids = set(file_ids)
+            stale = [i for i in old_ids if i not in new_ids]
+            if stale:
+                engine.delete_documents(stale, namespace=namespace)
+
+            manifest.record(path, *file_info[path], file_ids, namespace=namespace, data_dir=data_dir)
+            summary["updated" if old_ids else "added"] += 1
+            summary["vectors"] += len(file_ids)
+        batch.clear()
+        # Checkpoint, so an interrupted run resumes after the last written batch.
+        # The side indexes are journaled first: a manifest entry must never
+        # point at chunks that only exist in an unsaved lexical index. The
+        # full rewrite happens once, when the ingest finishes.
+        engine.checkpoint_indexes()
+        manifest.save()
+
+    try:
+        parsed = iter_documents([path for path, *_ in changed])
+        for path, docs, error in prefetch(parsed, queue_size):
+            if error:
+                logger.error(f"Error loading {path}: {error}")
+                summary["failed"] += 1
+                continue
+
+            key = manifest.key(path, namespace)
+            fields = (
+                extract_resume_metadata("\n".join(doc.page_content for doc in docs))
+                if METADATA_EXTRACTION else {}
+            )
+            for doc in docs:
+                doc.metadata["parent_id"] = parent_id_for(key)
+                doc.metadata.update(fields)
+            docs = chunk_documents(docs)
+            batch.append((path, key, docs, vector_ids_for(key, len(docs))))
+
+            if sum(len(file_docs) for _, _, file_docs, _ in batch) >= batch_size:
+                flush()
+        flush()
+
+        for key in removed:
+            ids = manifest.ids(key)
+            if ids:
+                engine.delete_documents(ids, parent_ids=[parent_id_for(key)], namespace=namespace)
+            manifest.forget(key)
+            summary["removed"] += 1
+    finally:
+        engine.save_indexes()
+        manifest.save()
+
+    for result in ("added", "updated", "removed", "skipped", "failed"):
+        INGEST_FILES.inc(summary[result], result=result)
+    summary["seconds"] = round(time.perf_counter() - start, 3)
+    logger.info(f"Incremental ingest finished: {summary}")
+    return summary
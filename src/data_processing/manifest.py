@@ -0,0 +1,201 @@
+# @ IMPORTING NECESSARY LIBRARIES
+import hashlib
+import json
+import logging
+import os
+import threading
+
+from src.config.settings import DATA_DIR, INGEST_MANIFEST_PATH
+from .chunking import parent_id_for
+
+logger = logging.getLogger(__name__)
+
+
+def file_sha256(path: str, block_size: int = 1 << 20) -> str:
+    """Hash a file's contents without reading it into memory at once."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def vector_ids_for(source: str, count: int) -> list[str]:
+    """
+    Deterministic vector IDs for the chunks of one source file.
+
+    The same file path always maps to the same IDs, so re-ingesting a file
+    overwrites its vectors instead of duplicating them.
+    """
+    prefix = parent_id_for(source)
+    return [f"{prefix}-{i}" for i in range(count)]
+
+
+class IngestManifest:
+    """
+    Local record of what has been ingested.
+
+    Maps each file (keyed by its path relative to the data directory) to its
+    size, mtime, content hash, the vector IDs it produced and the absolute
+    path and data directory it was ingested from.
+
+    Files ingested into a namespace are keyed ``<namespace>:<relpath>`` and
+    carry their namespace, so the same file can belong to several
+    partitions and every diff, delete or clear stays inside one of them.
+    Every directory and pattern a namespace was ingested from is kept under
+    ``sources`` so a reindex can replay every partition.
+    """
+
+    def __init__(self, path: str = INGEST_MANIFEST_PATH, data_dir: str = DATA_DIR):
+        self.path = path
+        self.data_dir = data_dir
+        self.entries: dict[str, dict] = {}
+        self.sources: dict[str, list[dict]] = {}
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        if os.path.exists(self.path):
+            with open(self.path) as f:
+                state = json.load(f)
+            self.entries = state.get("files", {})
+            self.sources = {
+                # Older manifests kept a single source per namespace
+                name: [source] if isinstance(source, dict) else source
+                for name, source in state.get("sources", {}).items()
+            }
+            logger.info(f"Loaded ingest manifest with {len(self.entries)} files")
+
+    def save(self):
+        """Write the manifest atomically."""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with self._lock:
+            with open(tmp_path, "w") as f:
+                json.dump({"files": self.entries, "sources": self.sources}, f)
+            os.replace(tmp_path, self.path)
+
+    def clear(self):
+        """Forget every file, e.g. after the vector store was wiped."""
+        with self._lock:
+            self.entries = {}
+            self.sources = {}
+        self.save()
+
+    def clear_namespace(self, namespace: str | None = None) -> list[str]:
+        """
+        Forget every file of one namespace.
+
+        Returns:
+            The vector IDs those files produced.
+        """
+        with self._lock:
+            keys = [key for key, entry in self.entries.items() if entry.get("namespace") == (namespace or None)]
+            ids = [i for key in keys for i in self.entries.pop(key)["ids"]]
+            self.sources.pop(namespace or "", None)
+        self.save()
+        return ids
+
+    def relpath(self, path: str) -> str:
+        return os.path.relpath(os.path.abspath(path), self.data_dir)
+
+    def key(self, path: str, namespace: str | None = None) -> str:
+        """Manifest key of a file, prefixed with its namespace outside the default one."""
+        relpath = self.relpath(path)
+        return f"{namespace}:{relpath}" if namespace else relpath
+
+    def namespaces(self) -> list[str]:
+        """Non-default namespaces with ingested files or a recorded source."""
+        names = {entry["namespace"] for entry in self.entries.values() if entry.get("namespace")}
+        return sorted(names | {name for name in self.sources if name})
+
+    def record_source(self, namespace: str | None, file_pattern: str, data_dir: str):
+        """Remember a directory and pattern a namespace is ingested from."""
+        source = {"file_pattern": file_pattern, "data_dir": os.path.abspath(data_dir)}
+        with self._lock:
+            sources = self.sources.setdefault(namespace or "", [])
+            if source not in sources:
+                sources.append(source)
+
+    def source_path(self, key: str) -> str:
+        """Absolute path of the file a manifest entry was ingested from."""
+        entry = self.entries[key]
+        if "path" in entry:
+            return entry["path"]
+        # Entries written before paths were recorded are relative to the default data directory
+        namespace = entry.get("namespace")
+        relpath = key[len(namespace) + 1:] if namespace else key
+        return os.path.join(self.data_dir, relpath)
+
+    def diff(self, paths, namespace: str | None = None):
+        """
+        Compare files on disk against the manifest entries of one namespace.
+
+        Files whose size and mtime are unchanged are skipped without hashing;
+        files that were only touched (same hash) are skipped too. An entry
+        missing from ``paths`` is only reported as removed once its file is
+        gone from disk: files ingested with another pattern or from another
+        directory into the same namespace are left alone.
+
+        Returns:
+            (changed, unchanged, removed): changed is a list of
+            (path, size, mtime, sha256) tuples, unchanged a list of paths and
+            removed a list of the namespace's manifest keys whose files no
+            longer exist.
+        """
+        changed, unchanged = [], []
+        seen = set()
+        for path in paths:
+            key = self.key(path, namespace)
+            seen.add(key)
+            stat = os.stat(path)
+            entry = self.entries.get(key)
+            if entry and entry["size"] == stat.st_size and entry["mtime"] == stat.st_mtime:
+                unchanged.append(path)
+                continue
+
+            sha256 = file_sha256(path)
+            if entry and entry["sha256"] == sha256:
+                entry["mtime"] = stat.st_mtime
+                unchanged.append(path)
+                continue
+            changed.append((path, stat.st_size, stat.st_mtime, sha256))
+
+        removed = [
+            key for key, entry in self.entries.items()
+            if entry.get("namespace") == (namespace or None)
+            and key not in seen
+            and not os.path.exists(self.source_path(key))
+        ]
+        return changed, unchanged, removed
+
+    def ids(self, key: str) -> list[str]:
+        entry = self.entries.get(key)
+        return list(entry["ids"]) if entry else []
+
+    def record(
+        self,
+        path: str,
+        size: int,
+        mtime: float,
+        sha256: str,
+        ids: list[str],
+        namespace: str | None = None,
+        data_dir: str | None = None,
+    ):
+        entry = {
+            "size": size,
+            "mtime": mtime,
+            "sha256": sha256,
+            "ids": list(ids),
+            "path": os.path.abspath(path),
+            "data_dir": os.path.abspath(data_dir or self.data_dir),
+        }
+        if namespace:
+            entry["namespace"] = namespace
+        with self._lock:
+            self.entries[self.key(path, namespace)] = entry
+
+    def forget(self, key: str):
+        with self._lock:
+            self.entries.pop(key, None)
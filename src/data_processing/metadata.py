@@ -0,0 +1,354 @@
+# @ IMPORTING NECESSARY LIBRARIES
+import logging
+import re
+from datetime import date
+
+logger = logging.getLogger(__name__)
+
+# Canonical skill name -> aliases as they appear in resumes and queries
+SKILL_ALIASES = {
+    "python": ["python"],
+    "java": ["java"],
+    "javascript": ["javascript", "js", "ecmascript"],
+    "typescript": ["typescript"],
+    "c++": ["c++", "cpp"],
+    "c#": ["c#", "csharp", ".net", "dotnet"],
+    "go": ["golang"],
+    "rust": ["rust"],
+    "ruby": ["ruby", "rails", "ruby on rails"],
+    "php": ["php", "laravel"],
+    "scala": ["scala"],
+    "kotlin": ["kotlin"],
+    "swift": ["swift"],
+    "r": ["r programming", "rstudio"],  # bare "R" is matched case-sensitively below
+    "sql": ["sql", "mysql", "postgresql", "postgres", "t-sql", "pl/sql"],
+    "nosql": ["nosql", "mongodb", "cassandra", "dynamodb"],
+    "react": ["react", "react.js", "reactjs"],
+    "angular": ["angular", "angularjs"],
+    "vue": ["vue", "vue.js", "vuejs"],
+    "node.js": ["node.js", "nodejs"],
+    "django": ["django"],
+    "flask": ["flask"],
+    "fastapi": ["fastapi"],
+    "spring": ["spring boot", "spring framework"],
+    "aws": ["aws", "amazon web services"],
+    "azure": ["azure"],
+    "gcp": ["gcp", "google cloud"],
+    "docker": ["docker"],
+    "kubernetes": ["kubernetes", "k8s"],
+    "terraform": ["terraform"],
+    "ci/cd": ["ci/cd", "jenkins", "github actions", "gitlab ci"],
+    "linux": ["linux", "unix"],
+    "git": ["git"],
+    "spark": ["spark", "pyspark"],
+    "hadoop": ["hadoop"],
+    "kafka": ["kafka"],
+    "airflow": ["airflow"],
+    "machine learning": ["machine learning"],
+    "deep learning": ["deep learning"],
+    "nlp": ["nlp", "natural language processing"],
+    "computer vision": ["computer vision"],
+    "tensorflow": ["tensorflow"],
+    "pytorch": ["pytorch"],
+    "scikit-learn": ["scikit-learn", "sklearn"],
+    "pandas": ["pandas"],
+    "tableau": ["tableau"],
+    "power bi": ["power bi", "powerbi"],
+    "excel": ["excel"],
+    "agile": ["agile", "scrum", "kanban"],
+    "project management": ["project management", "pmp"],
+    "salesforce": ["salesforce"],
+    "sap": ["sap"],
+    "figma": ["figma"],
+    "photoshop": ["photoshop"],
+    "nursing": ["nursing", "registered nurse"],
+    "patient care": ["patient care"],
+    "medical billing": ["medical billing", "medical coding", "icd-10"],
+    "accounting": ["accounting", "bookkeeping", "gaap"],
+}
+
+# Case-sensitive aliases that would be ambiguous in lowercase text
+_CASED_ALIASES = {"Go": "go", "R": "r", "RN": "nursing", "ML": "machine learning"}
+
+# Canonical city -> other spellings; the vocabulary shared by resume
+# extraction and query parsing, so both sides agree on what a location is
+CITY_ALIASES = {
+    # North America
+    "new york": ["new york city", "nyc", "manhattan", "brooklyn"],
+    "los angeles": ["la"],
+    "san francisco": ["sf"],
+    "san jose": [], "san diego": [], "seattle": [], "portland": [], "denver": [], "boulder": [],
+    "austin": [], "dallas": [], "houston": [], "san antonio": [], "phoenix": [], "las vegas": [],
+    "salt lake city": [], "chicago": [], "minneapolis": [], "detroit": [], "columbus": [],
+    "cleveland": [], "pittsburgh": [], "philadelphia": [], "boston": [], "cambridge": [],
+    "washington": ["washington dc", "washington d.c.", "dc"], "baltimore": [], "atlanta": [],
+    "miami": [], "orlando": [], "tampa": [], "charlotte": [], "raleigh": [], "durham": [],
+    "nashville": [], "st. louis": ["saint louis", "st louis"], "kansas city": [], "indianapolis": [],
+    "milwaukee": [], "sacramento": [], "oakland": [], "palo alto": [], "mountain view": [],
+    "sunnyvale": [], "irvine": [], "new orleans": [], "honolulu": [], "anchorage": [],
+    "toronto": [], "vancouver": [], "montreal": ["montréal"], "ottawa": [], "calgary": [],
+    "edmonton": [], "waterloo": [], "mexico city": ["ciudad de mexico"], "guadalajara": [],
+    "monterrey": [],
+    # Europe
+    "london": [], "manchester": [], "birmingham": [], "edinburgh": [], "glasgow": [], "bristol": [],
+    "leeds": [], "oxford": [], "dublin": [], "cork": [], "paris": [], "lyon": [], "berlin": [],
+    "munich": ["münchen"], "hamburg": [], "frankfurt": [], "cologne": ["köln"], "stuttgart": [],
+    "amsterdam": [], "rotterdam": [], "the hague": [], "eindhoven": [], "brussels": [], "antwerp": [],
+    "zurich": ["zürich"], "geneva": [], "vienna": ["wien"], "prague": [], "warsaw": [], "krakow": ["kraków"],
+    "budapest": [], "bucharest": [], "sofia": [], "athens": [], "madrid": [], "barcelona": [],
+    "valencia": [], "lisbon": [], "porto": [], "milan": [], "rome": [], "turin": [], "copenhagen": [],
+    "stockholm": [], "oslo": [], "helsinki": [], "tallinn": [], "riga": [], "vilnius": [], "kyiv": ["kiev"],
+    "istanbul": [],
+    # Asia and Oceania
+    "bangalore": ["bengaluru"], "mumbai": ["bombay"], "delhi": ["new delhi"], "gurgaon": ["gurugram"],
+    "noida": [], "hyderabad": [], "chennai": [], "pune": [], "kolkata": [], "ahmedabad": [],
+    "karachi": [], "lahore": [], "dhaka": [], "colombo": [], "singapore": [], "kuala lumpur": [],
+    "jakarta": [], "bangkok": [], "manila": [], "ho chi minh city": ["saigon"], "hanoi": [],
+    "hong kong": [], "shanghai": [], "beijing": [], "shenzhen": [], "taipei": [], "seoul": [],
+    "tokyo": [], "osaka": [], "sydney": [], "melbourne": [], "brisbane": [], "perth": [],
+    "auckland": [], "wellington": [], "dubai": [], "abu dhabi": [], "doha": [], "riyadh": [],
+    "tel aviv": [],
+    # Africa and South America
+    "lagos": [], "abuja": [], "nairobi": [], "accra": [], "cairo": [], "casablanca": [],
+    "johannesburg": [], "cape town": [], "sao paulo": ["são paulo"], "rio de janeiro": ["rio"],
+    "buenos aires": [], "santiago": [], "bogota": ["bogotá"], "medellin": ["medellín"], "lima": [],
+}
+_CITY_NAMES = {alias: city for city, aliases in CITY_ALIASES.items() for alias in [city, *aliases]}
+
+EDUCATION_LEVELS = {
+    "high_school": 1,
+    "associate": 2,
+    "bachelors": 3,
+    "masters": 4,
+    "phd": 5,
+}
+
+_EDUCATION_PATTERNS = [
+    ("phd", r"\b(ph\.?\s?d|doctorate|doctoral)\b"),
+    ("masters", r"\b(master'?s?|m\.?sc|m\.?s\.|mba|m\.?eng|m\.?a\.)(?![a-z])"),
+    ("bachelors", r"\b(bachelor'?s?|b\.?sc|b\.?s\.|b\.?a\.|b\.?eng|b\.?tech|undergraduate degree)(?![a-z])"),
+    ("associate", r"\bassociate'?s? degree\b"),
+    ("high_school", r"\b(high school|ged|secondary school)\b"),
+]
+
+_TITLE_WORDS = (
+    r"engineer|developer|manager|analyst|scientist|architect|designer|consultant|"
+    r"administrator|specialist|coordinator|director|lead|nurse|technician|accountant|"
+    r"officer|assistant|intern|programmer|tester|recruiter|representative"
+)
+_TITLE_LINE = re.compile(rf"^[A-Za-z/&,\-. ]{{0,60}}\b({_TITLE_WORDS})s?\b[A-Za-z/&,\-. ]{{0,40}}$", re.IGNORECASE)
+_EXPERIENCE_HEADING = re.compile(r"^\s*(work |professional )?experience|employment history\s*:?\s*$", re.IGNORECASE)
+
+_YEARS_STATED = re.compile(r"(\d{1,2}(?:\.\d)?)\s*\+?\s*(?:years?|yrs?)(?:\s+of)?(?:\s+\w+){0,3}\s+experience", re.IGNORECASE)
+_DATE_RANGE = re.compile(
+    r"\b((?:19|20)\d{2})\s*(?:-|–|—|to)\s*((?:19|20)\d{2}|present|current|now|today)\b", re.IGNORECASE
+)
+_LOCATION_LINE = re.compile(r"^\s*(?:location|address|based in|city)\s*[:\-]\s*(.+)$", re.IGNORECASE | re.MULTILINE)
+_STATED_LOCATION = re.compile(r"\b(?:based in|located in|living in)\s+([\w.\- ]+)", re.IGNORECASE)
+_CITY_REGION = re.compile(r"^\s*([A-Z][a-zA-Z.]+(?:[ \-][A-Z][a-zA-Z.]+){0,2}),\s*([A-Z]{2}|[A-Z][a-zA-Z]+(?: [A-Z][a-zA-Z]+)?)\s*$")
+
+
+def _alias_pattern(alias: str) -> re.Pattern:
+    # Word boundaries that also work for aliases ending in symbols (c++, c#, .net)
+    return re.compile(rf"(?<![\w+#.]){re.escape(alias)}(?![\w+#])", re.IGNORECASE)
+
+
+_SKILL_PATTERNS = [
+    (skill, _alias_pattern(alias)) for skill, aliases in SKILL_ALIASES.items() for alias in aliases
+]
+_CASED_PATTERNS = [(skill, re.compile(rf"(?<![\w+#.]){re.escape(alias)}(?![\w+#])")) for alias, skill in _CASED_ALIASES.items()]
+
+
+def extract_skills(text: str) -> list[str]:
+    """Canonical skill names mentioned in the text, sorted."""
+    found = {skill for skill, pattern in _SKILL_PATTERNS if pattern.search(text)}
+    found.update(skill for skill, pattern in _CASED_PATTERNS if pattern.search(text))
+    return sorted(found)
+
+
+def extract_years_experience(text: str, today: date | None = None) -> float | None:
+    """
+    Years of experience: the largest stated "N years of experience", else the
+    total span covered by date ranges such as "2016 - Present" (overlaps merged).
+    """
+    stated = [float(m.group(1)) for m in _YEARS_STATED.finditer(text)]
+    if stated:
+        return max(stated)
+
+    current_year = (today or date.today()).year
+    spans = []
+    for start, end in _DATE_RANGE.findall(text):
+        end_year = current_year if not end[0].isdigit() else int(end)
+        if int(start) <= end_year <= current_year:
+            spans.append((int(start), end_year))
+    if not spans:
+        return None
+    total, covered_until = 0, None
+    for start, end in sorted(spans):
+        if covered_until is None or start > covered_until:
+            total += end - start
+            covered_until = end
+        elif end > covered_until:
+            total += end - covered_until
+            covered_until = end
+    return float(total)
+
+
+def _leading_city(text: str) -> str | None:
+    """Known city at the start of ``text``, trying the longest name first."""
+    words = text.split()[:4]
+    for n in range(len(words), 0, -1):
+        name = " ".join(words[:n]).lower().rstrip(".,?!")
+        if name in _CITY_NAMES:
+            return _CITY_NAMES[name]
+    return None
+
+
+def extract_location(text: str) -> str | None:
+    """
+    Lowercased city from a "Location:" line, or else from the header lines:
+    a "City, Region" line or a "based in / located in / living in <City>"
+    phrase, as long as it names a city in CITY_ALIASES (so "Jane Doe, MBA"
+    is not taken for a place). Questions are parsed the same way, so a
+    resume and a question stating the same city agree.
+    """
+    match = _LOCATION_LINE.search(text)
+    if match:
+        return normalize_location(match.group(1)) or None
+    header = text.splitlines()[:15]
+    for line in header:
+        if _CITY_REGION.match(line) and normalize_location(line) in CITY_ALIASES:
+            return normalize_location(line)
+    for match in _STATED_LOCATION.finditer("\n".join(header)):
+        city = _leading_city(match.group(1))
+        if city:
+            return city
+    return None
+
+
+def normalize_location(value: str) -> str:
+    """Reduce a location to its lowercased city, e.g. "Austin, TX" -> "austin", "NYC" -> "new york"."""
+    city = value.split(",")[0].strip().lower()
+    return _CITY_NAMES.get(city, city)
+
+
+def extract_education_level(text: str) -> str | None:
+    """Highest education level mentioned, one of EDUCATION_LEVELS."""
+    for level, pattern in _EDUCATION_PATTERNS:
+        if re.search(pattern, text, re.IGNORECASE):
+            return level
+    return None
+
+
+def extract_last_title(text: str) -> str | None:
+    """First job-title-like line after the experience heading (resumes list newest first)."""
+    lines = text.splitlines()
+    start = next((i + 1 for i, line in enumerate(lines) if _EXPERIENCE_HEADING.match(line)), 0)
+    for line in lines[start:start + 40]:
+        stripped = line.strip(" \t-•*|")
+        # Drop a trailing date range or company after a separator
+        stripped = re.split(r"\s+(?:\||@|at|–|—|-)\s+|\s{2,}|\t", stripped)[0].strip()
+        if stripped and _TITLE_LINE.match(stripped):
+            return stripped.lower()
+    return None
+
+
+def extract_resume_metadata(text: str) -> dict:
+    """
+    Structured fields of a resume as Pinecone-compatible metadata.
+
+    Only fields that were found are returned, since Pinecone rejects null
+    values. ``education_rank`` mirrors ``education_level`` as a number so it
+    can be filtered with $gte.
+    """
+    metadata = {"skills": extract_skills(text)}
+    years = extract_years_experience(text)
+    if years is not None:
+        metadata["years_experience"] = years
+    location = extract_location(text)
+    if location:
+        metadata["location"] = location
+    education = extract_education_level(text)
+    if education:
+        metadata["education_level"] = education
+        metadata["education_rank"] = EDUCATION_LEVELS[education]
+    title = extract_last_title(text)
+    if title:
+        metadata["last_title"] = title
+    return metadata
+
+
+# @ QUERY CONSTRAINTS
+
+# Qualifier before "N years" -> filter operator; a bare "N years" or "N+ years" means at least N
+_YEAR_BOUNDS = {
+    "at least": "$gte", "minimum": "$gte", "minimum of": "$gte", "no less than": "$gte", ">=": "$gte",
+    "more than": "$gt", "over": "$gt", "above": "$gt", ">": "$gt",
+    "less than": "$lt", "fewer than": "$lt", "under": "$lt", "below": "$lt", "<": "$lt",
+    "at most": "$lte", "up to": "$lte", "no more than": "$lte", "maximum": "$lte", "maximum of": "$lte",
+    "<=": "$lte",
+}
+# Qualifier after "N years (of experience)"
+_YEAR_SUFFIX_BOUNDS = {"more": "$gte", "above": "$gte", "less": "$lte", "fewer": "$lte", "below": "$lte"}
+_YEAR_QUALIFIERS = "|".join(re.escape(q) for q in sorted(_YEAR_BOUNDS, key=len, reverse=True))
+_QUERY_YEARS = re.compile(
+    rf"(?:(?<![\w<>=])(?P<op>{_YEAR_QUALIFIERS}|between)\s*)?"
+    r"(?P<low>\d{1,2})(?:\s*(?:-|–|to|and)\s*(?P<high>\d{1,2}))?\s*(?P<plus>\+)?\s*(?:years?|yrs?)\b"
+    r"(?:\s+of(?:\s+\w+)?\s+experience)?(?:\s+or\s+(?P<suffix>more|above|less|fewer|below)\b)?",
+    re.IGNORECASE,
+)
+_QUERY_LOCATION = re.compile(r"\b(?:based in|located in|living in|in|from|near)\s+([\w.\- ]+)", re.IGNORECASE)
+
+
+def _years_condition(match: re.Match) -> dict:
+    low, high = float(match.group("low")), match.group("high")
+    if high is not None:
+        return {"$gte": low, "$lte": float(high)}
+    op = (match.group("op") or "").lower()
+    if match.group("suffix"):
+        return {_YEAR_SUFFIX_BOUNDS[match.group("suffix").lower()]: low}
+    return {_YEAR_BOUNDS.get(op, "$gte"): low}
+
+
+def _soft(field: str, condition: dict) -> dict:
+    """A condition that also passes resumes where ``field`` was not found."""
+    return {"$or": [{field: condition}, {field: {"$exists": False}}]}
+
+
+def parse_query_constraints(question: str) -> dict | None:
+    """
+    Translate constraints stated in a question into a metadata filter.
+
+    Recognizes skills from SKILL_ALIASES (all must match, or any when the
+    question joins them with "or"), years of experience with their bound
+    ("5+ years", "at least 5", "more than 5", "under 3", "at most 3",
+    "3-5 years", "3 years or less"), degree levels ("master's or higher"
+    style: the mentioned level or above) and "in <City>" for cities in
+    CITY_ALIASES. Years of experience and location are soft constraints:
+    they are often missing from a resume, and a resume that does not state
+    them is kept rather than filtered out. Returns None when the question
+    states no constraint.
+    """
+    skills = extract_skills(question)
+    if len(skills) > 1 and re.search(r"\bor\b", question, re.IGNORECASE):
+        clauses = [{"skills": {"$in": skills}}]
+    else:
+        clauses = [{"skills": {"$eq": skill}} for skill in skills]
+
+    years = _QUERY_YEARS.search(question)
+    if years:
+        clauses.append(_soft("years_experience", _years_condition(years)))
+
+    education = extract_education_level(question)
+    if education:
+        clauses.append({"education_rank": {"$gte": EDUCATION_LEVELS[education]}})
+
+    for match in _QUERY_LOCATION.finditer(question):
+        city = _leading_city(match.group(1))
+        if city:
+            clauses.append(_soft("location", {"$eq": city}))
+            break
+
+    if not clauses:
+        return None
+    return clauses[0] if len(clauses) == 1 else {"$and": clauses}
@@ -0,0 +1,433 @@
+# @ IMPORTING NECESSARY LIBRARIES
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from src.config.settings import (
+    EMBEDDING_BACKEND,
+    EMBEDDING_MODEL,
+    EMBEDDING_DIMENSION,
+    EMBEDDING_CACHE_ENABLED,
+    EMBEDDING_CACHE_DIR,
+    EMBEDDING_CACHE_SIZE,
+    EMBED_BATCHING,
+    LAZY_INIT,
+)
+from src.embeddings.scheduler import MicroBatchEmbedder
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Output sizes of common models, so the dimension is known without loading them
+KNOWN_DIMENSIONS = {
+    "sentence-transformers/all-mpnet-base-v2": 768,
+    "sentence-transformers/all-MiniLM-L6-v2": 384,
+    "sentence-transformers/all-MiniLM-L12-v2": 384,
+    "sentence-transformers/multi-qa-mpnet-base-dot-v1": 768,
+    "BAAI/bge-small-en-v1.5": 384,
+    "BAAI/bge-base-en-v1.5": 768,
+}
+
+
+def embedding_dimension(model_name: str = EMBEDDING_MODEL) -> int | None:
+    """
+    Look up a model's embedding dimension without running inference.
+
+    Checks EMBEDDING_DIMENSION, then the known-model table, then the model's
+    config.json in the local HuggingFace cache. Returns None if unknown.
+    """
+    if EMBEDDING_DIMENSION:
+        return EMBEDDING_DIMENSION
+    if model_name in KNOWN_DIMENSIONS:
+        return KNOWN_DIMENSIONS[model_name]
+    try:
+        from huggingface_hub import try_to_load_from_cache
+
+        path = try_to_load_from_cache(model_name, "config.json")
+        if isinstance(path, str):
+            with open(path) as f:
+                config = json.load(f)
+            return config.get("hidden_size") or config.get("d_model") or config.get("dim")
+    except Exception as e:
+        logger.debug(f"Could not read config for {model_name}: {e}")
+    return None
+
+
+def embedding_key(model_name: str, normalize: bool, text: str) -> str:
+    """Content address of an embedding: (model name, normalize flag, text hash)."""
+    text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    return f"{model_name}|{int(bool(normalize))}|{text_hash}"
+
+
+class LazyEmbeddings(Embeddings):
+    """
+    Defer building an embeddings model until the first embed call.
+
+    ``dimension`` is available before the model loads, so index setup does
+    not need an inference call.
+    """
+
+    def __init__(self, factory, dimension: int | None = None):
+        """
+        Args:
+            factory: Zero-argument callable returning the real embeddings model
+            dimension: Known output dimension of the model, if any
+        """
+        self._factory = factory
+        self._dimension = dimension
+        self._model = None
+        self._lock = threading.Lock()
+
+    @property
+    def model(self):
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    logger.info("Loading embedding model...")
+                    self._model = self._factory()
+        return self._model
+
+    @property
+    def dimension(self) -> int | None:
+        return self._dimension
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return self.model.embed_documents(texts)
+
+    def embed_query(self, text: str) -> list[float]:
+        return self.model.embed_query(text)
+
+
+class HashEmbeddings(Embeddings):
+    """
+    Deterministic, dependency-free embedder for offline development and CI.
+
+    Hashes word tokens into a fixed number of signed buckets and
+    L2-normalizes the result, so texts sharing words are similar. It has no
+    semantic understanding; use it only where the real model is unavailable.
+    """
+
+    def __init__(self, dimension: int = 768):
+        self.dimension = dimension
+
+    def _embed(self, text: str) -> list[float]:
+        vector = np.zeros(self.dimension, dtype=np.float32)
+        for token in re.findall(r"\w+", text.lower()):
+            digest = int.from_bytes(hashlib.md5(token.encode("utf-8")).digest()[:8], "little")
+            vector[digest % self.dimension] += 1.0 if (digest >> 63) & 1 else -1.0
+        norm = np.linalg.norm(vector)
+        return (vector / norm if norm else vector).tolist()
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> list[float]:
+        return self._embed(text)
+
+
+class DiskEmbeddingStore:
+    """
+    Append-only on-disk embedding store.
+
+    Vectors live in a raw float32 matrix (``vectors.f32``) that is read through
+    ``np.memmap``; ``offsets.tsv`` maps each key to its row. Both files are only
+    ever appended to, so a crash can at worst leave a torn or unindexed
+    trailing row, which the next write truncates or skips. API workers, the
+    CLI and the benchmarks may share one cache directory, so writes hold an
+    exclusive lock on ``lock`` (where ``fcntl`` is available) and first pick
+    up the rows other processes appended.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.matrix_path = os.path.join(directory, "vectors.f32")
+        self.offsets_path = os.path.join(directory, "offsets.tsv")
+        self.lock_path = os.path.join(directory, "lock")
+        self.dimension: int | None = None
+        self._offsets: dict[str, int] = {}
+        self._offsets_read = 0  # bytes of offsets.tsv already parsed
+        self._rows = 0
+        self._matrix = None
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._load()
+
+    @contextmanager
+    def _file_lock(self):
+        """Exclusive lock across processes sharing the directory."""
+        with open(self.lock_path, "a") as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _load(self):
+        dim_path = os.path.join(self.directory, "dimension")
+        if os.path.exists(dim_path):
+            with open(dim_path) as f:
+                self.dimension = int(f.read().strip() or 0) or None
+        if self.dimension is None or not os.path.exists(self.matrix_path):
+            return
+        self._refresh()
+        logger.info(f"Loaded {len(self._offsets)} cached embeddings from {self.directory}")
+
+    def _refresh(self):
+        """Pick up complete rows and offset lines appended since the last read."""
+        self._rows = os.path.getsize(self.matrix_path) // (self.dimension * 4)
+        if not os.path.exists(self.offsets_path):
+            return
+        with open(self.offsets_path, "rb") as f:
+            f.seek(self._offsets_read)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # torn final line, re-read once it is complete
+                self._offsets_read += len(line)
+                key, _, row = line.decode("utf-8").rstrip("\n").partition("\t")
+                if row.isdigit() and int(row) < self._rows:
+                    self._offsets[key] = int(row)
+
+    def _set_dimension(self, dimension: int):
+        self.dimension = dimension
+        with open(os.path.join(self.directory, "dimension"), "w") as f:
+            f.write(str(dimension))
+
+    def _map(self):
+        if self._matrix is None or self._matrix.shape[0] < self._rows:
+            self._matrix = np.memmap(
+                self.matrix_path, dtype=np.float32, mode="r",
+                shape=(self._rows, self.dimension),
+            )
+        return self._matrix
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def get(self, key: str):
+        """Return the cached vector for ``key`` or None."""
+        row = self._offsets.get(key)
+        if row is None:
+            return None
+        with self._lock:
+            return np.array(self._map()[row])
+
+    def put_many(self, keys, vectors):
+        """Append vectors for keys that are not stored yet."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        with self._lock, self._file_lock():
+            if self.dimension is None:
+                # Another process may have created the store since we loaded it
+                self._load()
+            if self.dimension is None:
+                self._set_dimension(vectors.shape[1])
+            elif vectors.shape[1] != self.dimension:
+                raise ValueError(
+                    f"Embedding dimension {vectors.shape[1]} does not match "
+                    f"cache dimension {self.dimension}"
+                )
+            if os.path.exists(self.matrix_path):
+                self._refresh()
+
+            new = [(k, v) for k, v in zip(keys, vectors) if k not in self._offsets]
+            if not new:
+                return
+            row_bytes = self.dimension * 4
+            # Writers hold the lock, so torn tails are left by crashed writers:
+            # drop them, so new rows land on row boundaries and new lines start
+            # on a line boundary
+            with open(self.matrix_path, "ab") as f:
+                f.truncate(self._rows * row_bytes)
+                f.write(np.stack([v for _, v in new]).tobytes())
+            with open(self.offsets_path, "ab") as f:
+                f.truncate(self._offsets_read)
+                f.write("".join(f"{key}\t{self._rows + i}\n" for i, (key, _) in enumerate(new)).encode("utf-8"))
+                self._offsets_read = f.tell()
+            for i, (key, _) in enumerate(new):
+                self._offsets[key] = self._rows + i
+            self._rows += len(new)
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Content-addressed caching wrapper around a LangChain embeddings model.
+
+    Lookups go through a bounded in-memory LRU first, then the on-disk store;
+    only texts missing from both are sent to the wrapped model.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        model_name: str,
+        normalize: bool = False,
+        cache_dir: str | None = EMBEDDING_CACHE_DIR,
+        max_memory_items: int = EMBEDDING_CACHE_SIZE,
+    ):
+        """
+        Args:
+            embeddings: The embedding model to wrap
+            model_name: Model identifier, part of the cache key
+            normalize: Whether the model normalizes embeddings, part of the cache key
+            cache_dir: Directory for the on-disk tier; None keeps the cache in memory only
+            max_memory_items: Capacity of the in-memory LRU tier
+        """
+        self.embeddings = embeddings
+        self.model_name = model_name
+        self.normalize = normalize
+        self.max_memory_items = max_memory_items
+        self._memory: OrderedDict[str, list[float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.disk = None
+        if cache_dir:
+            namespace = hashlib.sha1(
+                f"{model_name}|{int(bool(normalize))}".encode("utf-8")
+            ).hexdigest()[:12]
+            self.disk = DiskEmbeddingStore(os.path.join(cache_dir, namespace))
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @property
+    def dimension(self) -> int | None:
+        return getattr(self.embeddings, "dimension", None)
+
+    def _key(self, text: str) -> str:
+        return embedding_key(self.model_name, self.normalize, text)
+
+    def _remember(self, key: str, vector: list[float]):
+        with self._lock:
+            self._memory[key] = vector
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_memory_items:
+                self._memory.popitem(last=False)
+
+    def _lookup(self, key: str):
+        with self._lock:
+            vector = self._memory.get(key)
+            if vector is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return vector
+
+        if self.disk is not None:
+            row = self.disk.get(key)
+            if row is not None:
+                vector = row.tolist()
+                self._remember(key, vector)
+                with self._lock:
+                    self.disk_hits += 1
+                return vector
+        return None
+
+    def _store(self, keys, vectors):
+        for key, vector in zip(keys, vectors):
+            self._remember(key, list(vector))
+        if self.disk is not None and keys:
+            self.disk.put_many(keys, vectors)
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        keys = [self._key(text) for text in texts]
+        results: list = [None] * len(texts)
+
+        # Group positions by key so duplicate texts are encoded only once
+        missing: dict[str, list[int]] = {}
+        for i, key in enumerate(keys):
+            vector = self._lookup(key)
+            if vector is None:
+                missing.setdefault(key, []).append(i)
+            else:
+                results[i] = vector
+
+        if missing:
+            missing_keys = list(missing)
+            with self._lock:
+                self.misses += len(missing_keys)
+            vectors = self.embeddings.embed_documents(
+                [texts[missing[key][0]] for key in missing_keys]
+            )
+            self._store(missing_keys, vectors)
+            for key, vector in zip(missing_keys, vectors):
+                for i in missing[key]:
+                    results[i] = list(vector)
+
+        return results
+
+    def embed_query(self, text: str) -> list[float]:
+        key = self._key(text)
+        vector = self._lookup(key)
+        if vector is not None:
+            return vector
+
+        with self._lock:
+            self.misses += 1
+        vector = list(self.embeddings.embed_query(text))
+        self._store([key], [vector])
+        return vector
+
+    def stats(self) -> dict:
+        """Hit/miss counters for both cache tiers."""
+        hits = self.memory_hits + self.disk_hits
+        total = hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": hits / total if total else 0.0,
+            "memory_items": len(self._memory),
+            "disk_items": len(self.disk) if self.disk is not None else 0,
+        }
+
+
+def create_embeddings(backend: str = EMBEDDING_BACKEND, model_name: str = EMBEDDING_MODEL, lazy: bool = LAZY_INIT):
+    """
+    Build the engine's embedder: model, then micro-batching, then the cache.
+
+    Args:
+        backend: "huggingface" for the sentence-transformers model, "hash" for
+            the offline HashEmbeddings
+        model_name: HuggingFace model to load
+        lazy: Load the model on first use instead of now
+    """
+    # Unit vectors make cosine a plain dot product for every local consumer
+    normalize = True
+    if backend == "hash":
+        embeddings = HashEmbeddings(dimension=embedding_dimension(model_name) or 768)
+        cache_name = f"hash-{embeddings.dimension}"
+    elif backend == "huggingface":
+        def build():
+            from langchain_huggingface import HuggingFaceEmbeddings
+
+            return HuggingFaceEmbeddings(
+                model_name=model_name,
+                model_kwargs={"device": "cpu"},
+                encode_kwargs={"normalize_embeddings": normalize},
+            )
+
+        embeddings = LazyEmbeddings(build, dimension=embedding_dimension(model_name))
+        if not lazy:
+            embeddings.model
+        cache_name = model_name
+    else:
+        raise ValueError(f"Unknown embedding backend '{backend}', expected 'huggingface' or 'hash'")
+
+    if EMBED_BATCHING:
+        embeddings = MicroBatchEmbedder(embeddings)
+    if EMBEDDING_CACHE_ENABLED:
+        embeddings = CachedEmbeddings(embeddings, model_name=cache_name, normalize=normalize)
+    return embeddings
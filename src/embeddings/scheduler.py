@@ -0,0 +1,143 @@
+# @ IMPORTING NECESSARY LIBRARIES
+import logging
+import queue
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future
+
+from langchain_core.embeddings import Embeddings
+
+from src.config.settings import EMBED_MAX_BATCH, EMBED_MAX_WAIT_MS
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+def _bucket(value: int) -> int:
+    """Smallest power of two >= value, used as a histogram bucket bound."""
+    bound = 1
+    while bound < value:
+        bound *= 2
+    return bound
+
+
+class MicroBatchEmbedder(Embeddings):
+    """
+    Coalesce concurrent ``embed_query`` calls into batched model calls.
+
+    Callers enqueue their text and block on a future. A single scheduler
+    thread takes the first waiting request, collects more for up to
+    ``max_wait_ms`` or until ``max_batch_size`` is reached, encodes them with
+    one ``embed_documents`` call and resolves each caller's future. Under
+    load this replaces many single-sentence forward passes with a few full
+    batches; an isolated caller waits at most ``max_wait_ms`` extra.
+
+    Only use it for models whose query and document encodings are the same,
+    such as all-mpnet-base-v2 through HuggingFaceEmbeddings.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        max_batch_size: int = EMBED_MAX_BATCH,
+        max_wait_ms: float = EMBED_MAX_WAIT_MS,
+    ):
+        self.embeddings = embeddings
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue: queue.Queue = queue.Queue()
+        self._lock = threading.Lock()
+
+        self.requests = 0
+        self.batches = 0
+        self.batch_sizes: Counter = Counter()
+        self.queue_depths: Counter = Counter()
+
+        self._thread = threading.Thread(target=self._run, name="embed-batcher", daemon=True)
+        self._thread.start()
+
+    @property
+    def dimension(self) -> int | None:
+        return getattr(self.embeddings, "dimension", None)
+
+    def _collect(self, first):
+        batch = [first]
+        # Whatever is already queued joins without waiting
+        while len(batch) < self.max_batch_size:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                self._queue.put(_STOP)
+                return batch
+            batch.append(item)
+
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is _STOP:
+                self._queue.put(_STOP)
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                return
+            with self._lock:
+                self.queue_depths[_bucket(self._queue.qsize() + 1)] += 1
+            batch = self._collect(first)
+            with self._lock:
+                self.batches += 1
+                self.batch_sizes[_bucket(len(batch))] += 1
+
+            try:
+                vectors = self.embeddings.embed_documents([text for text, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            for (_, future), vector in zip(batch, vectors):
+                future.set_result(list(vector))
+
+    def embed_query(self, text: str) -> list[float]:
+        future: Future = Future()
+        with self._lock:
+            self.requests += 1
+        self._queue.put((text, future))
+        return future.result()
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        # Document batches are already batched; send them straight through
+        return self.embeddings.embed_documents(texts)
+
+    def close(self):
+        """Stop the scheduler thread once queued requests are served."""
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def stats(self) -> dict:
+        """Request/batch counters plus batch-size and queue-depth histograms.
+
+        Histogram keys are power-of-two upper bounds, e.g. ``{4: 10}`` means
+        ten batches held 3-4 requests.
+        """
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "batches": self.batches,
+                "mean_batch_size": self.requests / self.batches if self.batches else 0.0,
+                "batch_size_histogram": dict(sorted(self.batch_sizes.items())),
+                "queue_depth_histogram": dict(sorted(self.queue_depths.items())),
+            }
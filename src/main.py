@@ -1,26 +1,32 @@
+import argparse
 import os
 from src.rag.engine import RagEngine
-from src.monitoring.langsmith_monitor import LangSmithMonitor
-from src.data_processing.document_loader import load_documents
-from src.config.settings import DATA_DIR
+from src.rag.batch import run_batch
+from src.rag.reindex import reindex, rollback
+from src.data_processing.ingest import ingest_incremental
+from src.config.settings import DATA_DIR, BATCH_CONCURRENCY, BATCH_RATE_LIMIT, LLM_BACKEND, VECTORSTORE_BACKEND
+
+
+def required_env_vars(vectorstore_backend=VECTORSTORE_BACKEND, llm_backend=LLM_BACKEND):
+    """Environment variables the configured backends need; local and fake backends need none."""
+    required = []
+    if vectorstore_backend == "pinecone":
+        required += ['PINECONE_API_KEY', 'PINECONE_INDEX_NAME', 'PINECONE_ENVIRONMENT']
+    if llm_backend == "mistral":
+        required.append('MISTRAL_API_KEY')
+    return required
 
 
 class HealthCareBot:
     def __init__(self):
         print("Initializing Health Care Bot...")
         self.engine: RagEngine | None = None
-        self.monitor: LangSmithMonitor | None = None
+        self._monitor = None
         self.documents_ingested: bool = False
         
-        # Check required environment variables
-        required_vars = [
-            'OPENAI_API_KEY',
-            'PINECONE_API_KEY',
-            'PINECONE_INDEX_NAME',
-            'PINECONE_ENVIRONMENT',
-            'EMBEDDING_MODEL'
-        ]
-        
+        # Check the environment variables the configured backends need
+        required_vars = required_env_vars()
+
         missing_vars = [var for var in required_vars if not os.getenv(var)]
         if missing_vars:
             print(f"Error: Missing required environment variables: {', '.join(missing_vars)}")
@@ -29,14 +35,11 @@ class HealthCareBot:
             
         # Initialize components
         try:
+            # Models and service clients load on first use; see RagEngine(lazy=...)
             print("Initializing RAG engine...")
             self.engine = RagEngine()
             print("RAG engine initialized successfully.")
             
-            print("Initializing LangSmith monitor...")
-            self.monitor = LangSmithMonitor()
-            print("LangSmith monitor initialized successfully.")
-            
         except ImportError as e:
             print(f"Import error: {e}")
             print("Please make sure all required packages are installed.")
@@ -45,6 +48,16 @@ class HealthCareBot:
             import traceback
             traceback.print_exc()
 
+    @property
+    def monitor(self):
+        """LangSmith monitor, created the first time monitoring is run."""
+        if self._monitor is None:
+            from src.monitoring.langsmith_monitor import LangSmithMonitor
+
+            print("Initializing LangSmith monitor...")
+            self._monitor = LangSmithMonitor()
+        return self._monitor
+
     def run_interactive(self):
         print("Starting interactive session...")
         try:
@@ -68,32 +81,34 @@ class HealthCareBot:
         except Exception as e:
             print(f"An error occurred while generating the report: {e}")
 
-    def ingest_documents(self):
+    def ingest_documents(self, file_pattern="**/*.pdf", data_dir=DATA_DIR, namespace=None):
         if self.engine is None:
             print("Error: Engine is not properly initialized. Cannot ingest documents.")
             print("Please check the initialization errors above and fix them.")
             return
             
-        print("Ingesting documents...")
+        print(f"Ingesting documents{f' into namespace {namespace!r}' if namespace else ''}...")
         try:
             # Check if data directory exists
-            data_dir = os.path.join(os.path.dirname(__file__), '..', 'data')
             if not os.path.exists(data_dir) or not os.listdir(data_dir):
                 print(f"Error: No documents found in {data_dir}")
                 print("Please place your PDF files in the 'data' directory and try again.")
                 return
                 
-            # Load documents as single chunks
-            print("Loading documents...")
-            docs = load_documents()
-            if not docs:
+            # Only files that changed since the last ingest are loaded
+            print("Checking for new or changed documents...")
+            summary = ingest_incremental(self.engine, file_pattern, data_dir, namespace=namespace)
+            if not (summary["added"] or summary["updated"] or summary["skipped"]):
                 print("No documents found or no PDF files in the data directory.")
                 return
-                
-            print(f"Processing {len(docs)} document chunks...")
-            self.engine.process_documents(docs)
+
             self.documents_ingested = True
-            print(f"Successfully ingested {len(docs)} document chunks.")
+            print(
+                f"Ingest complete: {summary['added']} added, {summary['updated']} updated, "
+                f"{summary['removed']} removed, {summary['skipped']} unchanged, "
+                f"{summary['failed']} failed ({summary['vectors']} vectors written "
+                f"in {summary['seconds']}s)."
+            )
             
         except FileNotFoundError as e:
             print(f"Error: Directory not found - {e}")
@@ -104,30 +119,117 @@ class HealthCareBot:
             import traceback
             traceback.print_exc()
 
-    def clear_data(self):
+    def run_batch_questions(self, input_path, output_path, concurrency=BATCH_CONCURRENCY, rate_limit=BATCH_RATE_LIMIT):
+        if self.engine is None:
+            print("Error: Engine is not properly initialized. Cannot run batch questions.")
+            return
+        if not os.path.exists(input_path):
+            print(f"Error: Question file not found: {input_path}")
+            return
+
+        print(f"Answering questions from {input_path} (up to {concurrency} at a time)...")
+        try:
+            summary = run_batch(
+                self.engine, input_path, output_path,
+                concurrency=concurrency, rate_limit=rate_limit,
+            )
+            print(
+                f"Batch complete: {summary['answered']} answered, {summary['failed']} failed, "
+                f"{summary['skipped']} already done ({summary['seconds']}s). Results in {output_path}"
+            )
+        except Exception as e:
+            print(f"An error occurred during the batch run: {e}")
+            import traceback
+            traceback.print_exc()
+
+    def reindex_documents(self, file_pattern="**/*.pdf", switch=True):
+        if self.engine is None:
+            print("Error: Engine is not properly initialized. Cannot reindex.")
+            return
+        try:
+            result = reindex(self.engine, file_pattern, switch=switch)
+            print(f"Reindex {result['status']}: version '{result['version']}' (live before: '{result['previous']}').")
+        except Exception as e:
+            print(f"An error occurred during reindexing: {e}")
+            import traceback
+            traceback.print_exc()
+
+    def rollback_index(self):
+        if self.engine is None:
+            print("Error: Engine is not properly initialized. Cannot roll back.")
+            return
+        try:
+            rollback(self.engine)
+        except ValueError as e:
+            print(f"Error: {e}")
+
+    def clear_data(self, namespace=None):
+        if self.engine is None:
+            print("Error: Engine is not properly initialized. Cannot clear data.")
+            return
+        target = f"all data in namespace '{namespace}'" if namespace else "all data"
         confirmation = input(
-            "Are you sure you want to clear all data? This cannot be undone. (y/n): "
+            f"Are you sure you want to clear {target}? This cannot be undone. (y/n): "
         )
         if confirmation.lower() == "y":
-            self.engine.clear_vectorstore()
-            print("All data has been cleared.")
+            self.engine.clear_vectorstore(namespace)
+            print(f"{target[0].upper()}{target[1:]} has been cleared.")
         else:
             print("Operation cancelled.")
 
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Health Care Bot")
+    subparsers = parser.add_subparsers(dest="command")
+    batch = subparsers.add_parser("batch", help="answer questions from a JSONL file")
+    batch.add_argument("input", help="JSONL file of {\"id\", \"question\"} records")
+    batch.add_argument("output", help="JSONL file answers are appended to; re-run to resume")
+    batch.add_argument("--concurrency", type=int, default=BATCH_CONCURRENCY, help="questions in flight")
+    batch.add_argument("--rate-limit", type=float, default=BATCH_RATE_LIMIT, help="LLM calls per second, 0 = unlimited")
+    reindex_parser = subparsers.add_parser("reindex", help="rebuild into a new index version, then switch to it")
+    reindex_parser.add_argument("--pattern", default="**/*.pdf", help="glob of source files under the data directory")
+    reindex_parser.add_argument("--no-switch", action="store_true", help="build and verify only; leave the live index alone")
+    subparsers.add_parser("rollback", help="switch back to the previous index version")
+    ingest = subparsers.add_parser("ingest", help="ingest new or changed files, optionally into a namespace")
+    ingest.add_argument("--pattern", default="**/*.pdf", help="glob of source files under the data directory")
+    ingest.add_argument("--data-dir", default=DATA_DIR, help="directory the pattern is matched against")
+    ingest.add_argument("--namespace", help="partition (client, job posting or batch) to write to")
+    clear = subparsers.add_parser("clear", help="delete all documents, or only those of one namespace")
+    clear.add_argument("--namespace", help="partition to clear; every other one is kept")
+    return parser.parse_args()
+
+
 def main():
+    args = parse_args()
     print("Starting Health Care Bot...")
 
     bot = HealthCareBot()
+    if args.command == "batch":
+        bot.run_batch_questions(args.input, args.output, args.concurrency, args.rate_limit)
+        return
+    if args.command == "reindex":
+        bot.reindex_documents(args.pattern, switch=not args.no_switch)
+        return
+    if args.command == "rollback":
+        bot.rollback_index()
+        return
+    if args.command == "ingest":
+        bot.ingest_documents(args.pattern, args.data_dir, args.namespace)
+        return
+    if args.command == "clear":
+        bot.clear_data(args.namespace)
+        return
+
     while True:
         print("\nMain Menu:")
         print("1. Ingest documents")
         print("2. Run interactive session")
         print("3. Run monitoring")
         print("4. Clear data")
-        print("5. Exit")
+        print("5. Run batch questions")
+        print("6. Exit")
         
-        choice = input("\nChoose an option (1-5): ").strip()
+        choice = input("\nChoose an option (1-6): ").strip()
         
         if choice == "1":
             bot.ingest_documents()
@@ -146,10 +248,14 @@ def main():
         elif choice == "4":
             bot.clear_data()
         elif choice == "5":
+            input_path = input("Question file (JSONL): ").strip()
+            output_path = input("Output file (JSONL): ").strip() or "answers.jsonl"
+            bot.run_batch_questions(input_path, output_path)
+        elif choice == "6":
             print("Exiting...")
             break
         else:
-            print("❌ Invalid choice. Please enter a number between 1-5.")
+            print("❌ Invalid choice. Please enter a number between 1-6.")
 
 
 if __name__ == "__main__":
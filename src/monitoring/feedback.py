@@ -0,0 +1,208 @@
+# @ IMPORT THE NECESSARY LIBRARIES
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+import uuid
+
+from src.config.settings import (
+    LANGCHAIN_API_KEY,
+    FEEDBACK_SPILL_PATH,
+    FEEDBACK_QUEUE_SIZE,
+    FEEDBACK_BATCH_SIZE,
+    FEEDBACK_FLUSH_INTERVAL,
+    FEEDBACK_MAX_RETRIES,
+    FEEDBACK_BACKOFF,
+)
+from src.monitoring.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+FEEDBACK_RECORDS = metrics.counter(
+    "rag_feedback_records_total", "Feedback records by outcome", labelnames=("outcome",)
+)
+
+_STOP = object()
+
+
+def _default_client():
+    from langsmith import Client
+
+    return Client(api_key=LANGCHAIN_API_KEY)
+
+
+class FeedbackSink:
+    """
+    Non-blocking feedback logger.
+
+    :meth:`submit` only enqueues a record. A background worker sends queued
+    records in batches through one reused LangSmith client, retrying each
+    with exponential backoff. Records that still fail, or that arrive while
+    the queue is full, are appended to ``spill_path`` and replayed when the
+    next sink starts. Each record carries a fixed feedback ID, so a replayed
+    record that had in fact reached LangSmith is not counted twice.
+    """
+
+    def __init__(
+        self,
+        client_factory=_default_client,
+        spill_path: str = FEEDBACK_SPILL_PATH,
+        queue_size: int = FEEDBACK_QUEUE_SIZE,
+        batch_size: int = FEEDBACK_BATCH_SIZE,
+        flush_interval: float = FEEDBACK_FLUSH_INTERVAL,
+        max_retries: int = FEEDBACK_MAX_RETRIES,
+        backoff: float = FEEDBACK_BACKOFF,
+    ):
+        """
+        Args:
+            client_factory: Zero-argument callable returning an object with
+                ``create_feedback``; called once, on the worker thread
+            spill_path: Append-only JSONL file for records that could not be sent
+            queue_size: Records held in memory before new ones are spilled
+            batch_size: Maximum records sent per worker wake-up
+            flush_interval: Seconds the worker waits to fill a batch
+            max_retries: Retries per record after the first attempt
+            backoff: Base delay in seconds, doubled on each retry
+        """
+        self.client_factory = client_factory
+        self.spill_path = spill_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self._client = None
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._spill_lock = threading.Lock()
+
+        self._replay()
+        self._thread = threading.Thread(target=self._run, name="feedback-sink", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, run_id, score, key: str = "user_score", comment: str | None = None):
+        """Queue one feedback record and return immediately."""
+        record = {
+            "feedback_id": str(uuid.uuid4()),
+            "run_id": str(run_id),
+            "key": key,
+            "score": score,
+            "comment": comment,
+        }
+        try:
+            self._queue.put_nowait(record)
+            FEEDBACK_RECORDS.inc(outcome="queued")
+        except queue.Full:
+            self._spill([record])
+
+    # @ SPILL FILE
+
+    def _spill(self, records):
+        with self._spill_lock:
+            os.makedirs(os.path.dirname(self.spill_path) or ".", exist_ok=True)
+            with open(self.spill_path, "a", encoding="utf-8") as f:
+                for record in records:
+                    f.write(json.dumps(record) + "\n")
+        FEEDBACK_RECORDS.inc(len(records), outcome="spilled")
+        logger.warning(f"Spilled {len(records)} feedback records to {self.spill_path}")
+
+    def _replay(self):
+        """Queue records spilled by an earlier run; they are re-spilled if sending fails again."""
+        with self._spill_lock:
+            if not os.path.exists(self.spill_path):
+                return
+            replay_path = f"{self.spill_path}.replay"
+            os.replace(self.spill_path, replay_path)
+            records = []
+            with open(replay_path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        continue  # torn final line from a crash
+
+        overflow = []
+        for record in records:
+            try:
+                self._queue.put_nowait(record)
+            except queue.Full:
+                overflow.append(record)
+        if overflow:
+            self._spill(overflow)
+        os.remove(replay_path)
+        logger.info(f"Replaying {len(records) - len(overflow)} spilled feedback records")
+
+    # @ WORKER
+
+    def _collect(self, first):
+        batch = [first]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                self._queue.put(_STOP)
+                break
+            batch.append(item)
+        return batch
+
+    def _send(self, record) -> bool:
+        """Send one record with retries; False if it could not be delivered."""
+        for attempt in range(self.max_retries + 1):
+            try:
+                if self._client is None:
+                    self._client = self.client_factory()
+                self._client.create_feedback(
+                    run_id=record["run_id"],
+                    key=record["key"],
+                    score=record["score"],
+                    comment=record["comment"],
+                    feedback_id=record["feedback_id"],
+                )
+                return True
+            except Exception as e:
+                if attempt == self.max_retries:
+                    logger.error(f"Feedback for run {record['run_id']} failed after {attempt + 1} attempts: {e}")
+                    return False
+                delay = self.backoff * (2 ** attempt) * (1 + random.random() * 0.1)
+                logger.warning(f"Feedback send failed ({e}), retrying in {delay:.2f}s")
+                time.sleep(delay)
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                return
+            batch = self._collect(first)
+            for i, record in enumerate(batch):
+                if not self._send(record):
+                    # The backend is unavailable; keep the rest for the next start
+                    self._spill(batch[i:])
+                    break
+                FEEDBACK_RECORDS.inc(outcome="sent")
+
+    def close(self, timeout: float = 5.0):
+        """Flush queued records, spilling whatever cannot be sent within ``timeout``."""
+        if not self._thread.is_alive():
+            return
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+            self._thread.join(timeout)
+        except queue.Full:
+            pass
+        leftover = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                leftover.append(item)
+        if leftover:
+            self._spill(leftover)
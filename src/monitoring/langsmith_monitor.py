@@ -1,14 +1,49 @@
-from langsmith import Client
-from src.config.settings import LANGCHAIN_API_KEY
-from datetime import datetime
+import json
+import os
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from src.config.settings import LANGCHAIN_API_KEY, REPORT_CACHE_PATH, REPORT_CACHE_GRACE_DAYS
+from src.monitoring.report import RunStats, aggregate_runs, utc_today
+
+# Only the fields the report aggregates are requested from LangSmith
+RUN_FIELDS = [
+    "start_time",
+    "end_time",
+    "run_type",
+    "error",
+    "prompt_tokens",
+    "completion_tokens",
+    "total_tokens",
+    "feedback_stats",
+]
 
 
 class LangSmithMonitor:
-    def __init__(self, api_key=None):
-        self.client = Client(api_key=LANGCHAIN_API_KEY if api_key is None else api_key)
+    def __init__(self, api_key=None, client=None, cache_path=REPORT_CACHE_PATH, grace_days=REPORT_CACHE_GRACE_DAYS):
+        """
+        Args:
+            api_key: LangSmith API key; defaults to LANGCHAIN_API_KEY
+            client: Client-like object exposing list_projects, create_project
+                and list_runs; a langsmith.Client is created if omitted
+            cache_path: JSON file holding aggregates of completed days
+            grace_days: Days before today that are re-fetched on every report
+                instead of being cached, since their runs can still change
+        """
+        if client is None:
+            from langsmith import Client
+
+            client = Client(api_key=LANGCHAIN_API_KEY if api_key is None else api_key)
+        self.client = client
         self.project_name = "engine"
+        self.cache_path = cache_path
+        self.grace_days = grace_days
+        self._project_checked = False
 
     def ensure_project_exists(self):
+        """Create the project if needed; the check runs once per monitor."""
+        if self._project_checked:
+            return
         projects = self.client.list_projects()
         if self.project_name not in [p.name for p in projects]:
             print(f"Project '{self.project_name}' does not exist. Creating it now...")
@@ -16,29 +51,134 @@ class LangSmithMonitor:
             print(f"Project '{self.project_name}' created successfully.")
         else:
             print(f"Project '{self.project_name}' already exists.")
+        self._project_checked = True
+
+    # @ AGGREGATE CACHE
+
+    def _load_cache(self) -> dict:
+        try:
+            with open(self.cache_path) as f:
+                return json.load(f).get(self.project_name, {})
+        except (OSError, ValueError):
+            return {}
+
+    def _save_cache(self, days: dict):
+        try:
+            with open(self.cache_path) as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            cache = {}
+        cache[self.project_name] = days
+        os.makedirs(os.path.dirname(self.cache_path) or ".", exist_ok=True)
+        tmp_path = f"{self.cache_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(cache, f)
+        os.replace(tmp_path, self.cache_path)
+
+    # @ REPORTING
+
+    def _fetch(self, first_day, last_day):
+        """Stream and aggregate the runs started between two days, inclusive."""
+        runs = self.client.list_runs(
+            project_name=self.project_name,
+            start_time=datetime.combine(first_day, datetime.min.time()),
+            end_time=datetime.combine(last_day + timedelta(days=1), datetime.min.time()),
+            select=RUN_FIELDS,
+        )
+        return aggregate_runs(runs)
+
+    def aggregate(self, start_time: str, end_time: str) -> dict:
+        """
+        Aggregate runs per day and run type between two dates (inclusive).
+
+        Runs are consumed as a stream, so memory does not grow with the
+        number of runs. Days older than ``grace_days`` are cached, so repeated
+        reports only fetch days that are new or may still receive runs and
+        feedback.
+
+        Args:
+            start_time: First day, YYYY-MM-DD
+            end_time: Last day, YYYY-MM-DD
+
+        Returns:
+            {day: {run_type: RunStats}} for every day in the range.
+        """
+        first = datetime.strptime(start_time, "%Y-%m-%d").date()
+        last = datetime.strptime(end_time, "%Y-%m-%d").date()
+        if last < first:
+            raise ValueError(f"End date {end_time} is before start date {start_time}")
+        days = [first + timedelta(days=i) for i in range((last - first).days + 1)]
+
+        # Days from the cutoff on are re-fetched, even if an older version cached them
+        cutoff = utc_today() - timedelta(days=self.grace_days)
+        cache = self._load_cache()
+        result = {
+            day: {run_type: RunStats.from_dict(s) for run_type, s in cache[str(day)].items()}
+            for day in days if day < cutoff and str(day) in cache
+        }
+
+        # One list_runs call per contiguous range of days missing from the cache
+        missing = [day for day in days if day not in result]
+        ranges = []
+        for day in missing:
+            if ranges and day - ranges[-1][1] == timedelta(days=1):
+                ranges[-1][1] = day
+            else:
+                ranges.append([day, day])
+
+        for range_first, range_last in ranges:
+            fetched = self._fetch(range_first, range_last)
+            day = range_first
+            while day <= range_last:
+                by_type = dict(fetched.get(day, {}))
+                result[day] = by_type
+                if day < cutoff:
+                    cache[str(day)] = {run_type: s.to_dict() for run_type, s in by_type.items()}
+                else:
+                    cache.pop(str(day), None)
+                day += timedelta(days=1)
+
+        if ranges:
+            self._save_cache(cache)
+        return dict(sorted(result.items()))
 
     def generate_report(self, start_time, end_time):
         self.ensure_project_exists()
 
         try:
-            print(
-                f"type of start_time: {type(start_time)} and type of end_time: {type(end_time)}"
-            )
-            # Convert string dates to datetime objects
-            start_datetime = datetime.strptime(start_time, "%Y-%m-%d")
-            end_datetime = datetime.strptime(end_time, "%Y-%m-%d")
-
-            runs = self.client.list_runs(
-                start_time=start_datetime,
-                end_time=end_datetime,
-                project_name=self.project_name,
-            )
-
-            total_runs = len(list(runs))
-            return f"Total runs between {start_time} and {end_time}: {total_runs}"
+            days = self.aggregate(start_time, end_time)
         except Exception as e:
             return f"Error generating report: {e}"
 
+        overall = RunStats()
+        by_type = defaultdict(RunStats)
+        lines = []
+        for day, stats_by_type in days.items():
+            for run_type, stats in sorted(stats_by_type.items()):
+                overall.merge(stats)
+                by_type[run_type].merge(stats)
+                lines.append(f"  {day} {run_type:<10} {_format_stats(stats.summary())}")
+
+        report = [
+            f"LangSmith report for '{self.project_name}', {start_time} to {end_time}",
+            f"Total: {_format_stats(overall.summary())}",
+            "By run type:",
+        ]
+        report += [f"  {run_type:<10} {_format_stats(s.summary())}" for run_type, s in sorted(by_type.items())]
+        report += ["By day:"] + (lines or ["  no runs"])
+        return "\n".join(report)
+
     def list_available_projects(self):
         projects = self.client.list_projects()
         return [p.name for p in projects]
+
+
+def _format_stats(summary: dict) -> str:
+    latency = summary["latency_ms"]
+    feedback = ", ".join(f"{key} {f['avg']} (n={f['n']})" for key, f in summary["feedback"].items())
+    return (
+        f"runs={summary['runs']} errors={summary['error_rate']:.1%} "
+        f"p50={latency['p50']}ms p95={latency['p95']}ms p99={latency['p99']}ms "
+        f"tokens={summary['tokens']['total']}"
+        + (f" feedback: {feedback}" if feedback else "")
+    )
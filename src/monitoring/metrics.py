@@ -0,0 +1,219 @@
+# @ IMPORT THE NECESSARY LIBRARIES
+import atexit
+import bisect
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from src.config.settings import METRICS_ENABLED, METRICS_FILE, METRICS_EXPORT_INTERVAL
+
+logger = logging.getLogger(__name__)
+
+# Seconds; spans a cached embed (~1ms) to a slow LLM answer (~30s)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _labels(names, values) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{value}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class Counter:
+    """Monotonic counter, optionally split by label values."""
+
+    type = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: tuple = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = tuple(labels.get(name, "") for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(tuple(labels.get(name, "") for name in self.labelnames), 0.0)
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_labels(self.labelnames, key)} {value:g}" for key, value in items]
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram with Prometheus semantics.
+
+    ``observe`` is a bisect and three additions under a lock, cheap enough
+    to call on every query stage.
+    """
+
+    type = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: tuple = (), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts (+Inf last), sum, count]
+        self._series: dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(labels.get(name, "") for name in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def count(self, **labels) -> int:
+        series = self._series.get(tuple(labels.get(name, "") for name in self.labelnames))
+        return series[2] if series else 0
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = sorted((key, ([*s[0]], s[1], s[2])) for key, s in self._series.items())
+        lines = []
+        names = (*self.labelnames, "le")
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += bucket_count
+                lines.append(f"{self.name}_bucket{_labels(names, (*key, bound))} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {total:.6f}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Process-local metrics rendered in the Prometheus text exposition format.
+
+    Serve :meth:`render` from an HTTP endpoint, or let
+    :meth:`start_file_export` write it to a file periodically for a
+    node-exporter textfile collector.
+    """
+
+    def __init__(self, enabled: bool = METRICS_ENABLED):
+        self.enabled = enabled
+        self._metrics: dict[str, Counter | Histogram] = {}
+        self._lock = threading.Lock()
+        self._exporter: threading.Thread | None = None
+
+    def _register(self, cls, name, help, labelnames, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help, labelnames, **kwargs)
+            return metric
+
+    def counter(self, name: str, help: str, labelnames: tuple = ()) -> Counter:
+        return self._register(Counter, name, help, labelnames)
+
+    def histogram(self, name: str, help: str, labelnames: tuple = (), buckets=LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram, name, help, labelnames, buckets=buckets)
+
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str = METRICS_FILE):
+        """Write the current metrics to ``path`` atomically."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(self.render())
+        os.replace(tmp_path, path)
+
+    def start_file_export(self, path: str = METRICS_FILE, interval: float = METRICS_EXPORT_INTERVAL):
+        """Rewrite the metrics file every ``interval`` seconds and at exit."""
+        if not (self.enabled and path) or self._exporter is not None:
+            return
+
+        def run():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.write(path)
+                except OSError as e:
+                    logger.warning(f"Could not write metrics to {path}: {e}")
+
+        self._exporter = threading.Thread(target=run, name="metrics-export", daemon=True)
+        self._exporter.start()
+        atexit.register(self.write, path)
+
+    @contextmanager
+    def timer(self, histogram: Histogram, **labels):
+        """Observe the duration of the ``with`` block, including when it raises."""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            histogram.observe(time.perf_counter() - start, **labels)
+
+
+# @ DEFAULT REGISTRY AND RAG METRICS
+metrics = MetricsRegistry()
+
+QUERY_STAGE_SECONDS = metrics.histogram(
+    "rag_query_stage_seconds",
+    "Time spent in each stage of answering a query",
+    labelnames=("stage",),
+)
+QUERIES = metrics.counter(
+    "rag_queries_total", "Queries answered, by outcome", labelnames=("outcome",)
+)
+CONTEXT_TOKENS = metrics.histogram(
+    "rag_context_tokens",
+    "Approximate prompt tokens of the packed context",
+    buckets=(100, 250, 500, 1000, 1500, 2000, 3000, 4000, 8000, 16000),
+)
+CONTEXT_TOKENS_SAVED = metrics.counter(
+    "rag_context_tokens_saved_total", "Prompt tokens removed by context packing"
+)
+INGEST_DOCUMENTS = metrics.counter(
+    "rag_ingest_documents_total", "Document chunks submitted for upsert"
+)
+INGEST_VECTORS = metrics.counter(
+    "rag_ingest_vectors_total", "Vectors written to the index, by result", labelnames=("result",)
+)
+INGEST_FILES = metrics.counter(
+    "rag_ingest_files_total", "Files processed by incremental ingest, by result", labelnames=("result",)
+)
+INGEST_SECONDS = metrics.histogram(
+    "rag_ingest_batch_seconds",
+    "Time to embed and upsert one ingest batch",
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0),
+)
+
+
+def stage_timer(stage: str):
+    """Time one query stage: embed, cache, retrieve, rerank, collapse, pack, llm_ttft, llm, total or match."""
+    return metrics.timer(QUERY_STAGE_SECONDS, stage=stage)
+
+
+def observe_stage(stage: str, seconds: float):
+    """Record a stage duration measured by the caller."""
+    if metrics.enabled:
+        QUERY_STAGE_SECONDS.observe(seconds, stage=stage)
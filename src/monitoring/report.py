@@ -0,0 +1,145 @@
+# @ IMPORT THE NECESSARY LIBRARIES
+import math
+from collections import defaultdict
+from datetime import date, datetime, timezone
+
+# Latency buckets grow by 5%, so percentiles are exact to within ~5%
+_GROWTH = 1.05
+_LOG_GROWTH = math.log(_GROWTH)
+
+
+class LatencyHistogram:
+    """
+    Sparse log-bucketed latency histogram.
+
+    Memory depends on the spread of latencies, not on the number of runs,
+    and two histograms merge by adding counts, so per-day results can be
+    cached and combined later.
+    """
+
+    def __init__(self, counts: dict[int, int] | None = None):
+        self.counts: dict[int, int] = defaultdict(int, counts or {})
+
+    def add(self, ms: float):
+        self.counts[math.ceil(math.log(max(ms, 1.0)) / _LOG_GROWTH)] += 1
+
+    def merge(self, other: "LatencyHistogram"):
+        for bucket, count in other.counts.items():
+            self.counts[bucket] += count
+
+    def percentile(self, q: float) -> float | None:
+        """Upper bound of the bucket holding the q-th percentile, in ms."""
+        total = sum(self.counts.values())
+        if not total:
+            return None
+        rank = math.ceil(q / 100 * total)
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= rank:
+                return round(_GROWTH ** bucket, 1)
+        return None
+
+
+class RunStats:
+    """Constant-memory aggregate of runs: counts, latency, tokens and feedback."""
+
+    def __init__(self):
+        self.runs = 0
+        self.errors = 0
+        self.latency = LatencyHistogram()
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.total_tokens = 0
+        # feedback key -> [number of scores, sum of scores]
+        self.feedback: dict[str, list[float]] = defaultdict(lambda: [0, 0.0])
+
+    def add(self, run):
+        self.runs += 1
+        if getattr(run, "error", None):
+            self.errors += 1
+        start, end = getattr(run, "start_time", None), getattr(run, "end_time", None)
+        if start and end:
+            self.latency.add((end - start).total_seconds() * 1000)
+        self.prompt_tokens += getattr(run, "prompt_tokens", 0) or 0
+        self.completion_tokens += getattr(run, "completion_tokens", 0) or 0
+        self.total_tokens += getattr(run, "total_tokens", 0) or 0
+        for key, stats in (getattr(run, "feedback_stats", None) or {}).items():
+            n = stats.get("n", 0) or 0
+            avg = stats.get("avg")
+            if n and avg is not None:
+                self.feedback[key][0] += n
+                self.feedback[key][1] += avg * n
+
+    def merge(self, other: "RunStats"):
+        self.runs += other.runs
+        self.errors += other.errors
+        self.latency.merge(other.latency)
+        self.prompt_tokens += other.prompt_tokens
+        self.completion_tokens += other.completion_tokens
+        self.total_tokens += other.total_tokens
+        for key, (n, total) in other.feedback.items():
+            self.feedback[key][0] += n
+            self.feedback[key][1] += total
+
+    def summary(self) -> dict:
+        return {
+            "runs": self.runs,
+            "error_rate": round(self.errors / self.runs, 4) if self.runs else 0.0,
+            "latency_ms": {f"p{q}": self.latency.percentile(q) for q in (50, 95, 99)},
+            "tokens": {
+                "prompt": self.prompt_tokens,
+                "completion": self.completion_tokens,
+                "total": self.total_tokens,
+            },
+            "feedback": {
+                key: {"n": int(n), "avg": round(total / n, 3)}
+                for key, (n, total) in sorted(self.feedback.items()) if n
+            },
+        }
+
+    def to_dict(self) -> dict:
+        return {
+            "runs": self.runs,
+            "errors": self.errors,
+            "latency": {str(k): v for k, v in self.latency.counts.items()},
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "total_tokens": self.total_tokens,
+            "feedback": {k: list(v) for k, v in self.feedback.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "RunStats":
+        stats = cls()
+        stats.runs = data["runs"]
+        stats.errors = data["errors"]
+        stats.latency = LatencyHistogram({int(k): v for k, v in data["latency"].items()})
+        stats.prompt_tokens = data["prompt_tokens"]
+        stats.completion_tokens = data["completion_tokens"]
+        stats.total_tokens = data["total_tokens"]
+        for key, value in data["feedback"].items():
+            stats.feedback[key] = list(value)
+        return stats
+
+
+def run_day(run) -> date:
+    """UTC calendar day a run started on."""
+    start = run.start_time
+    if start.tzinfo is not None:
+        start = start.astimezone(timezone.utc)
+    return start.date()
+
+
+def aggregate_runs(runs) -> dict[date, dict[str, RunStats]]:
+    """Stream runs into per-day, per-run-type RunStats without keeping the runs."""
+    days: dict[date, dict[str, RunStats]] = defaultdict(lambda: defaultdict(RunStats))
+    for run in runs:
+        if getattr(run, "start_time", None) is None:
+            continue
+        days[run_day(run)][run.run_type or "unknown"].add(run)
+    return days
+
+
+def utc_today() -> date:
+    return datetime.now(timezone.utc).date()
@@ -0,0 +1,20 @@
+# @ IMPORT THE NECESSARY LIBRARIES
+from src.config.settings import LANGSMITH_TRACING
+
+
+def traceable(*args, **kwargs):
+    """
+    ``langsmith.traceable`` when LangSmith tracing is enabled, else a no-op.
+
+    Supports both ``@traceable`` and ``@traceable(run_type=...)``. With
+    tracing off, functions are returned unchanged and langsmith is never
+    imported, so the query path pays nothing for it.
+    """
+    if LANGSMITH_TRACING:
+        from langsmith import traceable as langsmith_traceable
+
+        return langsmith_traceable(*args, **kwargs)
+
+    if len(args) == 1 and callable(args[0]) and not kwargs:
+        return args[0]
+    return lambda func: func
@@ -0,0 +1,148 @@
+# @ IMPORT THE NECESSARY LIBRARIES
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from src.config.settings import (
+    ANSWER_CACHE_ENABLED,
+    ANSWER_CACHE_THRESHOLD,
+    ANSWER_CACHE_TTL,
+    ANSWER_CACHE_SIZE,
+)
+
+
+class SemanticAnswerCache:
+    """
+    Cache of generated answers keyed by question embedding.
+
+    A lookup returns the stored answer of the most similar cached question
+    when its cosine similarity reaches ``threshold``, so rephrasings such as
+    "python devs with 5 years" and "5+ yrs python developers" share one
+    generation. Entries expire after ``ttl`` seconds, the least recently used
+    entry is evicted past ``max_entries``, and the whole cache is dropped
+    whenever the index changes. Entries are scoped to the partitions and
+    metadata filter they were answered with and only served to questions
+    with exactly the same scope, so one tenant never receives an answer
+    built from another's documents and "python devs with under 3 years" is
+    never answered with the cached "python devs with over 3 years".
+    """
+
+    def __init__(
+        self,
+        threshold: float = ANSWER_CACHE_THRESHOLD,
+        ttl: float = ANSWER_CACHE_TTL,
+        max_entries: int = ANSWER_CACHE_SIZE,
+        enabled: bool = ANSWER_CACHE_ENABLED,
+    ):
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self._entries: OrderedDict[int, dict] = OrderedDict()
+        self._next_key = 0
+        self._keys: list[int] = []
+        self._scopes = None
+        self._matrix = None  # normalized embeddings, rebuilt lazily after changes
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+        self.invalidations = 0
+
+    @staticmethod
+    def _normalize(embedding) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _purge_expired(self, now: float):
+        expired = [k for k, e in self._entries.items() if now - e["created_at"] > self.ttl]
+        for key in expired:
+            del self._entries[key]
+        if expired:
+            self._matrix = None
+
+    def lookup(self, embedding, scope: str = ""):
+        """
+        Return the cached entry closest to ``embedding`` above the threshold.
+
+        Args:
+            embedding: Question embedding
+            scope: Partitions and filter the question searches with; only
+                entries stored under an identical scope can match
+
+        Returns:
+            A dict with ``question``, ``answer``, ``docs``, ``similarity`` and
+            ``latency`` (seconds the original answer took), or None.
+        """
+        if not self.enabled:
+            return None
+        query = self._normalize(embedding)
+        with self._lock:
+            self._purge_expired(time.monotonic())
+            if not self._entries:
+                self.misses += 1
+                return None
+            if self._matrix is None:
+                self._keys = list(self._entries)
+                self._matrix = np.stack([self._entries[k]["vector"] for k in self._keys])
+                self._scopes = np.array([self._entries[k]["scope"] for k in self._keys], dtype=object)
+
+            scores = np.where(self._scopes == scope, self._matrix @ query, -np.inf)
+            best = int(np.argmax(scores))
+            if scores[best] < self.threshold:
+                self.misses += 1
+                return None
+
+            key = self._keys[best]
+            entry = self._entries[key]
+            self._entries.move_to_end(key)
+            self.hits += 1
+            self.saved_seconds += entry["latency"]
+            return {
+                "question": entry["question"],
+                "answer": entry["answer"],
+                "docs": entry["docs"],
+                "similarity": float(scores[best]),
+                "latency": entry["latency"],
+            }
+
+    def store(self, question: str, embedding, answer: str, docs, latency: float, scope: str = ""):
+        """Cache an answer generated for ``question`` in ``latency`` seconds under ``scope``."""
+        if not self.enabled or self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[self._next_key] = {
+                "question": question,
+                "vector": self._normalize(embedding),
+                "answer": answer,
+                "docs": list(docs),
+                "latency": latency,
+                "scope": scope,
+                "created_at": time.monotonic(),
+            }
+            self._next_key += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._matrix = None
+
+    def invalidate(self):
+        """Drop every entry, e.g. after the index changed."""
+        with self._lock:
+            self._entries.clear()
+            self._matrix = None
+            self.invalidations += 1
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "saved_seconds": round(self.saved_seconds, 3),
+            "invalidations": self.invalidations,
+        }
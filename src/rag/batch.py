@@ -0,0 +1,205 @@
+# @ IMPORT THE NECESSARY LIBRARIES
+import json
+import logging
+import os
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from src.config.settings import (
+    BATCH_CONCURRENCY,
+    BATCH_RATE_LIMIT,
+    BATCH_MAX_RETRIES,
+    BATCH_BACKOFF,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimiter:
+    """
+    Shared pacing for LLM calls across batch workers.
+
+    Calls are spaced at least ``1 / rate`` seconds apart. After a 429 any
+    worker can :meth:`pause` everyone, so the whole batch backs off instead
+    of each worker hammering the API on its own schedule.
+    """
+
+    def __init__(self, rate: float = BATCH_RATE_LIMIT):
+        """
+        Args:
+            rate: Maximum calls per second; 0 disables pacing
+        """
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(self._next, now)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+    def pause(self, seconds: float):
+        with self._lock:
+            self._next = max(self._next, time.monotonic() + seconds)
+
+
+def is_rate_limited(error: Exception) -> bool:
+    """Whether an LLM client error is an HTTP 429 / rate-limit response."""
+    status = getattr(error, "status_code", None) or getattr(getattr(error, "response", None), "status_code", None)
+    if status == 429:
+        return True
+    message = str(error).lower()
+    return "429" in message or "rate limit" in message or "too many requests" in message
+
+
+def read_questions(path: str):
+    """Yield (id, question, user_id) from a JSONL file; IDs default to the line number."""
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            item = json.loads(line)
+            if isinstance(item, str):
+                item = {"question": item}
+            yield str(item.get("id", line_number)), item["question"], item.get("user_id")
+
+
+def completed_ids(path: str) -> set[str]:
+    """IDs already answered successfully in an earlier, possibly interrupted, run."""
+    done = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # torn final line from an interruption
+            if record.get("status") == "ok":
+                done.add(str(record["id"]))
+    return done
+
+
+def _answer_with_retry(engine, item_id, question, user_id, limiter, max_retries, backoff):
+    start = time.perf_counter()
+    for attempt in range(max_retries + 1):
+        try:
+            result = engine.answer(question, user_id, before_generate=limiter.acquire)
+            break
+        except Exception as e:
+            rate_limited = is_rate_limited(e)
+            if attempt == max_retries or not rate_limited:
+                return {
+                    "id": item_id,
+                    "question": question,
+                    "status": "error",
+                    "error": str(e),
+                    "attempts": attempt + 1,
+                    "seconds": round(time.perf_counter() - start, 3),
+                }
+            delay = backoff * (2 ** attempt) * (1 + random.random() * 0.1)
+            logger.warning(f"Rate limited on question {item_id}, backing off {delay:.2f}s")
+            limiter.pause(delay)
+
+    return {
+        "id": item_id,
+        "question": question,
+        "status": "ok",
+        "answer": result["answer"],
+        "sources": [
+            {"source": doc.metadata.get("source"), "parent_id": doc.metadata.get("parent_id")}
+            for doc in result["docs"]
+        ],
+        "run_id": result["run_id"],
+        "cached": result["cached"],
+        "context": result["context"],
+        "timings_ms": result["timings"],
+        "attempts": attempt + 1,
+        "seconds": round(time.perf_counter() - start, 3),
+    }
+
+
+def run_batch(
+    engine,
+    input_path: str,
+    output_path: str,
+    concurrency: int = BATCH_CONCURRENCY,
+    rate_limit: float = BATCH_RATE_LIMIT,
+    max_retries: int = BATCH_MAX_RETRIES,
+    backoff: float = BATCH_BACKOFF,
+):
+    """
+    Answer every question in a JSONL file concurrently.
+
+    Each input line is ``{"id": ..., "question": ..., "user_id": ...}`` (or
+    a bare JSON string). At most ``concurrency`` questions are in flight;
+    LLM calls are paced by a shared RateLimiter and 429 responses are
+    retried with exponential backoff. Results are appended to
+    ``output_path`` as they complete, so an interrupted run can simply be
+    restarted: IDs already answered successfully are skipped.
+
+    Args:
+        engine: The RagEngine to answer with
+        input_path: JSONL file of questions
+        output_path: JSONL file results are appended to
+        concurrency: Maximum questions in flight
+        rate_limit: Maximum LLM calls per second; 0 disables pacing
+        max_retries: Retries per question after a rate-limit error
+        backoff: Base delay in seconds, doubled on each retry
+
+    Returns:
+        A summary dict with answered, failed, skipped counts and seconds.
+    """
+    start = time.perf_counter()
+    done = completed_ids(output_path)
+    limiter = RateLimiter(rate_limit)
+    summary = {"answered": 0, "failed": 0, "skipped": 0}
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+
+    pending = set()
+    with open(output_path, "a", encoding="utf-8") as out, \
+            ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="batch") as pool:
+
+        def drain(block_until):
+            nonlocal pending
+            finished, pending = wait(pending, return_when=block_until)
+            for future in finished:
+                record = future.result()
+                out.write(json.dumps(record, default=str) + "\n")
+                out.flush()
+                summary["answered" if record["status"] == "ok" else "failed"] += 1
+                print(
+                    f"[{record['status']}] {record['id']} ({record['seconds']}s): "
+                    f"{record['question'][:60]}"
+                )
+
+        try:
+            for item_id, question, user_id in read_questions(input_path):
+                if item_id in done:
+                    summary["skipped"] += 1
+                    continue
+                if len(pending) >= concurrency:
+                    drain(FIRST_COMPLETED)
+                pending.add(pool.submit(
+                    _answer_with_retry, engine, item_id, question, user_id,
+                    limiter, max_retries, backoff,
+                ))
+            while pending:
+                drain(FIRST_COMPLETED)
+        except KeyboardInterrupt:
+            print("\nInterrupted; finishing in-flight questions. Re-run to resume.")
+            for future in pending:
+                future.cancel()
+            pending = {f for f in pending if not f.cancelled()}
+            while pending:
+                drain(FIRST_COMPLETED)
+
+    summary["seconds"] = round(time.perf_counter() - start, 3)
+    logger.info(f"Batch finished: {summary}")
+    return summary
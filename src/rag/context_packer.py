@@ -0,0 +1,208 @@
+# @ IMPORT THE NECESSARY LIBRARIES
+import logging
+import os
+import re
+
+import numpy as np
+
+from src.config.settings import (
+    CONTEXT_TOKEN_BUDGET,
+    CONTEXT_MMR_LAMBDA,
+    CONTEXT_DEDUP_THRESHOLD,
+)
+
+logger = logging.getLogger(__name__)
+
+# Words and punctuation marks; close to subword-token counts for English prose
+_TOKEN = re.compile(r"\w+|[^\w\s]")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+_WORD = re.compile(r"[a-z0-9][a-z0-9+#]*")
+_STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "have", "i", "in", "is", "it",
+    "of", "on", "or", "that", "the", "their", "this", "to", "was", "were", "which", "who", "with",
+}
+# Relevance given to a sentence of the first document with no query term, decaying
+# with retrieval rank, so leftover budget goes to the best-ranked passages
+_RANK_PRIOR = 0.01
+
+
+def count_tokens(text: str) -> int:
+    """Approximate prompt tokens of ``text`` without loading a tokenizer."""
+    return len(_TOKEN.findall(text))
+
+
+def split_sentences(text: str) -> list[str]:
+    """Split a passage into sentences and bullet lines."""
+    sentences = []
+    for line in text.splitlines():
+        for sentence in _SENTENCE_END.split(line.strip()):
+            sentence = sentence.strip(" \t-•*")
+            if len(sentence) > 2 and sentence != "...":
+                sentences.append(sentence)
+    return sentences
+
+
+def _source_label(doc, number: int) -> str:
+    source = doc.metadata.get("source")
+    return f"[{number}] {os.path.basename(source) if source else 'unknown source'}"
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return matrix / np.where(norms == 0, 1, norms)
+
+
+def _terms(text: str) -> list[str]:
+    return [w for w in _WORD.findall(text.lower()) if w not in _STOPWORDS]
+
+
+def tfidf_vectors(query: str, sentences: list[str]):
+    """
+    Unit TF-IDF vectors of the query and the sentences over the sentences' vocabulary.
+
+    Returns:
+        (query_vector, sentence_matrix), numpy float32 arrays.
+    """
+    vocab: dict[str, int] = {}
+    rows = []
+    for sentence in sentences:
+        counts: dict[int, int] = {}
+        for term in _terms(sentence):
+            term_id = vocab.setdefault(term, len(vocab))
+            counts[term_id] = counts.get(term_id, 0) + 1
+        rows.append(counts)
+
+    matrix = np.zeros((len(sentences), max(len(vocab), 1)), dtype=np.float32)
+    for row, counts in enumerate(rows):
+        for term_id, tf in counts.items():
+            matrix[row, term_id] = 1 + np.log(tf)
+    idf = np.log(1 + len(sentences) / np.maximum((matrix > 0).sum(axis=0), 1)).astype(np.float32)
+
+    query_vector = np.zeros(matrix.shape[1], dtype=np.float32)
+    for term in set(_terms(query)):
+        if term in vocab:
+            query_vector[vocab[term]] = 1.0
+    return _normalize(query_vector * idf), _normalize(matrix * idf)
+
+
+class ContextPacker:
+    """
+    Assemble the ``{context}`` of the stuff prompt within a token budget.
+
+    Exact duplicate passages are dropped. If what is left fits the budget it
+    is used whole; otherwise the passages are split into sentences, the
+    sentences are picked by maximal marginal relevance to the query (which
+    also skips near-duplicates of sentences already picked) until the budget
+    is full, and each document's picks are emitted in their original order
+    under a numbered source label.
+
+    Sentences are scored with TF-IDF vectors built per call rather than with
+    the embedding model: the passages were already ranked semantically by
+    retrieval, and embedding every sentence of every query would cost a
+    model pass per sentence and fill the embedding cache with one-off text.
+    """
+
+    def __init__(
+        self,
+        token_budget: int = CONTEXT_TOKEN_BUDGET,
+        mmr_lambda: float = CONTEXT_MMR_LAMBDA,
+        dedup_threshold: float = CONTEXT_DEDUP_THRESHOLD,
+    ):
+        """
+        Args:
+            token_budget: Maximum approximate tokens of the packed context
+            mmr_lambda: Relevance weight in MMR; 1.0 ignores redundancy
+            dedup_threshold: Cosine similarity above which a sentence counts
+                as a duplicate of one already picked
+        """
+        self.token_budget = token_budget
+        self.mmr_lambda = mmr_lambda
+        self.dedup_threshold = dedup_threshold
+
+    @staticmethod
+    def _render(groups) -> str:
+        return "\n\n".join(f"{label}\n" + "\n".join(parts) for label, parts in groups)
+
+    def pack(self, query: str, docs):
+        """
+        Build the context string for ``docs``.
+
+        Returns:
+            (context, report), where report holds ``tokens_before`` (all
+            passages stuffed whole), ``tokens_after``, ``tokens_saved``,
+            ``passages`` and ``sentences`` kept.
+        """
+        unique, seen = [], set()
+        for doc in docs:
+            if doc.page_content not in seen:
+                seen.add(doc.page_content)
+                unique.append(doc)
+
+        tokens_before = count_tokens("\n\n".join(doc.page_content for doc in docs))
+        whole = self._render(
+            (_source_label(doc, i + 1), [doc.page_content]) for i, doc in enumerate(unique)
+        )
+        if count_tokens(whole) <= self.token_budget:
+            context, sentences = whole, None
+        else:
+            context, sentences = self._select(query, unique)
+
+        tokens_after = count_tokens(context)
+        report = {
+            "tokens_before": tokens_before,
+            "tokens_after": tokens_after,
+            "tokens_saved": max(tokens_before - tokens_after, 0),
+            "passages": len(unique),
+            "sentences": sentences,
+        }
+        return context, report
+
+    def _select(self, query: str, docs):
+        candidates = [
+            (doc_index, position, sentence)
+            for doc_index, doc in enumerate(docs)
+            for position, sentence in enumerate(split_sentences(doc.page_content))
+        ]
+        if not candidates:
+            return "", 0
+
+        query_vector, vectors = tfidf_vectors(query, [sentence for _, _, sentence in candidates])
+        prior = np.array([_RANK_PRIOR / (doc_index + 1) for doc_index, _, _ in candidates], dtype=np.float32)
+        relevance = vectors @ query_vector + prior
+        lengths = np.array([count_tokens(sentence) for _, _, sentence in candidates])
+
+        # Each document label costs a few tokens the first time it is used
+        label_cost = {i: count_tokens(_source_label(doc, i + 1)) for i, doc in enumerate(docs)}
+        budget = self.token_budget
+        picked: list[int] = []
+        redundancy = np.zeros(len(candidates), dtype=np.float32)
+        available = np.ones(len(candidates), dtype=bool)
+        used_docs: set[int] = set()
+
+        while available.any():
+            scores = self.mmr_lambda * relevance - (1 - self.mmr_lambda) * redundancy
+            scores[~available] = -np.inf
+            best = int(np.argmax(scores))
+            available[best] = False
+
+            doc_index = candidates[best][0]
+            cost = lengths[best] + (0 if doc_index in used_docs else label_cost[doc_index])
+            if redundancy[best] >= self.dedup_threshold or cost > budget:
+                continue
+            budget -= cost
+            used_docs.add(doc_index)
+            picked.append(best)
+            redundancy = np.maximum(redundancy, vectors @ vectors[best])
+            if budget < lengths[available].min(initial=budget + 1):
+                break
+
+        by_doc: dict[int, list[tuple[int, str]]] = {}
+        for index in picked:
+            doc_index, position, sentence = candidates[index]
+            by_doc.setdefault(doc_index, []).append((position, sentence))
+        # Documents keep their retrieval order, sentences their document order
+        groups = [
+            (_source_label(docs[doc_index], doc_index + 1), [s for _, s in sorted(by_doc[doc_index])])
+            for doc_index in sorted(by_doc)
+        ]
+        return self._render(groups), len(picked)
@@ -1,129 +1,728 @@
 # @ IMPORT THE NECESSARY LIBRARIES
+import heapq
+import json
+import logging
+import threading
+import time
 import uuid
-from langchain_mistralai import ChatMistralAI
-from langchain_pinecone import Pinecone as LangChainPinecone
-from langchain.prompts import PromptTemplate
-from langchain_huggingface import HuggingFaceEmbeddings
-from langchain.chains import RetrievalQA
-from langsmith import traceable
+from concurrent.futures import ThreadPoolExecutor
 from src.config.settings import (
     MISTRAL_API_KEY,
-    EMBEDDING_MODEL,
     TEMPERATURE,
     MODEL_NAME,
-   
+    RETRIEVAL_K,
+    CHILD_FETCH_MULTIPLIER,
+    CHUNK_STRATEGY,
+    INDEX_STATS_TTL,
+    PARTITION_FANOUT_WORKERS,
+    VECTORSTORE_BACKEND,
+    MEMORY_INDEX_LATENCY,
+    LLM_BACKEND,
+    LAZY_INIT,
+    HYBRID_SEARCH,
+    RERANK_ENABLED,
+    RERANK_CANDIDATES,
+    CONTEXT_PACKING,
+    METADATA_FILTERING,
+    MATCHING_ENABLED,
+    MATCH_TOP_K,
+    FAKE_LLM_RESPONSE,
+    FAKE_LLM_TOKEN_DELAY,
+    EMBEDDING_BACKEND,
+    EMBEDDING_MODEL,
+    INGEST_MANIFEST_PATH,
+    LEXICAL_INDEX_DIR,
+    LOCAL_INDEX_DIR,
+    MATCH_MATRIX_DIR,
+    PINECONE_INDEX_NAME,
+    PINECONE_ENVIRONMENT,
+)
+from src.embeddings.embeddings import create_embeddings
+from src.data_processing.manifest import IngestManifest
+from src.data_processing.chunking import collapse_to_parents
+from src.data_processing.metadata import parse_query_constraints
+from src.rag.answer_cache import SemanticAnswerCache
+from src.rag.lexical_index import PartitionedBM25Index, reciprocal_rank_fusion
+from src.rag.reranker import CrossEncoderReranker
+from src.rag.context_packer import ContextPacker, count_tokens
+from src.rag.matching import ResumeMatcher
+from src.monitoring.metrics import (
+    metrics,
+    stage_timer,
+    observe_stage,
+    QUERIES,
+    CONTEXT_TOKENS,
+    CONTEXT_TOKENS_SAVED,
+    INGEST_DOCUMENTS,
+    INGEST_VECTORS,
+    INGEST_SECONDS,
 )
-from src.storage.pinecone_utils import init_pinecone, get_or_create_index
+from src.monitoring.tracing import traceable
+from src.monitoring.feedback import FeedbackSink
+from src.storage.bulk_upsert import BulkUpserter
+from src.storage.index_alias import IndexAlias, version_path
+from src.storage.local_index import LocalIndex, LocalVectorStore
+from src.storage.memory_index import InMemoryIndex, match_filter
+
+# Heavy libraries (langchain_mistralai, pinecone, langchain_pinecone and the
+# langchain_core prompt/LLM modules, which pull in transformers) are imported
+# inside the functions that need them so importing this module and opening
+# the CLI menu stay fast.
+
+logger = logging.getLogger(__name__)
 
-# Helper to wrap Pinecone Index with LangChain Pinecone vectorstore
-def get_langchain_pinecone_vectorstore(embeddings, index_name, environment, recreate=True):
+def get_vectorstore(
+    embeddings, index_name, environment, recreate=False, backend=VECTORSTORE_BACKEND, local_dir=LOCAL_INDEX_DIR
+):
     """
-    Get or create a Pinecone vector store with the specified parameters.
-    
+    Build the raw index and the LangChain vector store for the configured backend.
+
     Args:
         embeddings: The embedding model to use
-        index_name: Name of the index
-        environment: Cloud environment/region
-        recreate: If True, will recreate the index if dimensions don't match
+        index_name: Name of the Pinecone index (ignored by the local backend)
+        environment: Cloud environment/region (ignored by the local backend)
+        recreate: If True, will recreate the Pinecone index if dimensions don't match
+        backend: "pinecone", "local", or "memory" (an in-process fake that
+            adds MEMORY_INDEX_LATENCY seconds to every call, for benchmarks)
+        local_dir: Directory of the local backend's index
+
+    Returns:
+        (index, vectorstore), where index exposes the pc.Index API.
     """
-    index = get_or_create_index(embeddings, index_name, environment, recreate=recreate)
-    return LangChainPinecone(index, embedding=embeddings, text_key="page_content")
+    if backend == "local":
+        index = LocalIndex(local_dir)
+        return index, LocalVectorStore(index, embeddings, text_key="page_content")
+    if backend == "memory":
+        index = InMemoryIndex(latency=MEMORY_INDEX_LATENCY)
+        return index, LocalVectorStore(index, embeddings, text_key="page_content")
+    if backend == "pinecone":
+        from langchain_pinecone import Pinecone as LangChainPinecone
+        from src.storage.pinecone_utils import get_or_create_index
 
-# @ INITIATE THE MISTRAL CLIENT
-client = ChatMistralAI(api_key=MISTRAL_API_KEY, model=MODEL_NAME, temperature=TEMPERATURE)
+        index = get_or_create_index(embeddings, index_name, environment, recreate=recreate)
+        return index, LangChainPinecone(index, embedding=embeddings, text_key="page_content")
+    raise ValueError(f"Unknown vector store backend '{backend}', expected 'pinecone', 'local' or 'memory'")
 
+def get_llm(backend=LLM_BACKEND):
+    """
+    Build the chat model for the configured backend.
 
-class RagEngine:
-    def __init__(self, recreate_index: bool = True):
-        """Initialize the RAG engine.
-        
-        Args:
-            recreate_index: If True, will recreate the Pinecone index if dimensions don't match
-        """
-        import logging
-        logging.basicConfig(level=logging.INFO)
-        logger = logging.getLogger(__name__)
-        
-        logger.info("Initializing embeddings...")
-        model_kwargs = {"device": "cpu"}
-        encode_kwargs = {"normalize_embeddings": False}
-        self.embeddings = HuggingFaceEmbeddings(
-            model_name=EMBEDDING_MODEL,
-            model_kwargs=model_kwargs,
-            encode_kwargs=encode_kwargs,
-        )
-        
-        logger.info("Initializing Pinecone...")
-        from src.config.settings import PINECONE_INDEX_NAME, PINECONE_ENVIRONMENT
-        
-        try:
-            self.vectorstore = get_langchain_pinecone_vectorstore(
-                self.embeddings, 
-                index_name=PINECONE_INDEX_NAME, 
-                environment=PINECONE_ENVIRONMENT,
-                recreate=recreate_index
-            )
-            logger.info("Pinecone vector store initialized successfully")
-        except Exception as e:
-            logger.error(f"Error initializing Pinecone: {str(e)}")
-            raise
+    "fake" returns a scripted streaming model so the query path can be
+    load-tested without calling Mistral.
+    """
+    if backend == "fake":
+        from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+        return FakeListChatModel(responses=[FAKE_LLM_RESPONSE], sleep=FAKE_LLM_TOKEN_DELAY)
+    if backend == "mistral":
+        from langchain_mistralai import ChatMistralAI
 
         print(f"Using Mistral API Key: {MISTRAL_API_KEY[:5]}...")
-        self.llm = ChatMistralAI(
+        return ChatMistralAI(
             temperature=TEMPERATURE,
             model=MODEL_NAME,
             mistral_api_key=MISTRAL_API_KEY,
             streaming=True,
         )
-        template = """You are a Health Care Insurance Data Intrepretor bot. Use the following pieces of context to interpret the user's query. If the information can not be found in the context, just say "I don't know.
+    raise ValueError(f"Unknown LLM backend '{backend}', expected 'mistral' or 'fake'")
+
+
+def _total_vector_count(stats) -> int:
+    """Read the vector count from a describe_index_stats() response."""
+    if isinstance(stats, dict):
+        return stats.get("total_vector_count", 0) or 0
+    return getattr(stats, "total_vector_count", 0) or 0
+
+
+def open_side_indexes(embeddings, version: str | None = None):
+    """
+    Open the local state that belongs to one index version.
+
+    Args:
+        embeddings: Embeddings of the resume matcher
+        version: Index version name; None is the original, unversioned index
+
+    Returns:
+        (manifest, lexical_index, matcher); the last two are None when disabled.
+    """
+    manifest = IngestManifest(version_path(INGEST_MANIFEST_PATH, version))
+    lexical_index = PartitionedBM25Index(version_path(LEXICAL_INDEX_DIR, version)) if HYBRID_SEARCH else None
+    matcher = (
+        ResumeMatcher(embeddings, version_path(MATCH_MATRIX_DIR, version)) if MATCHING_ENABLED else None
+    )
+    return manifest, lexical_index, matcher
+
+
+def write_documents(index, embeddings, docs, ids, lexical_index=None, matcher=None, namespace=None) -> dict:
+    """
+    Embed and upsert documents, then add the written ones to the side indexes.
+
+    With a ``namespace``, documents are tagged with it and written to that
+    partition of the vector index, the lexical index and the matcher.
+
+    Returns:
+        The BulkUpserter report: upserted count, failed_ids and throughput.
+    """
+    INGEST_DOCUMENTS.inc(len(docs))
+    if namespace:
+        for doc in docs:
+            doc.metadata["namespace"] = namespace
+    vectors = {}
+
+    def keep_vectors(batch_ids, batch_vectors):
+        vectors.update(zip(batch_ids, batch_vectors))
+
+    with metrics.timer(INGEST_SECONDS):
+        report = BulkUpserter(index, embeddings, namespace=namespace).upsert_documents(
+            docs, ids, on_embedded=keep_vectors if matcher is not None else None
+        )
+    INGEST_VECTORS.inc(report["upserted"], result="upserted")
+    INGEST_VECTORS.inc(len(report["failed_ids"]), result="failed")
+    failed = set(report["failed_ids"])
+    written = [(d, i) for d, i in zip(docs, ids) if i not in failed]
+    if lexical_index is not None:
+        lexical_index.add_documents([d for d, _ in written], [i for _, i in written], namespace)
+    if matcher is not None:
+        matcher.add_resumes([d for d, _ in written], [vectors[i] for _, i in written], namespace)
+    return report
+
+
+class RagEngine:
+    def __init__(self, recreate_index: bool = False, lazy: bool = LAZY_INIT):
+        """Initialize the RAG engine.
+
+        With ``lazy`` on, the embedding model, vector store connection and LLM
+        client are created on first use instead of here, so the CLI menu is
+        usable immediately.
+
+        Args:
+            recreate_index: If True, delete and recreate the Pinecone index in
+                place when dimensions don't match. Off by default: build a new
+                version with src.rag.reindex instead, which keeps search up
+            lazy: Defer loading models and connecting to services until first use
+        """
+        logging.basicConfig(level=logging.INFO)
+
+        logger.info("Initializing embeddings...")
+        self.embeddings = create_embeddings(lazy=lazy)
+        self.recreate_index = recreate_index
+        self.embedding_model = f"{EMBEDDING_BACKEND}:{EMBEDDING_MODEL}"
+
+        # The alias names the live version of the index; a reindex moves it
+        self.index_name = PINECONE_INDEX_NAME or "local"
+        self.index_alias = IndexAlias()
+        self.active_index = self.index_alias.resolve(self.index_name)
+
+        self.template = """You are a Health Care Insurance Data Intrepretor bot. Use the following pieces of context to interpret the user's query. If the information can not be found in the context, just say "I don't know.
         Context: {context}
         Question: {question}
         Answer: """
-        prompt = PromptTemplate(
-            template=template, input_variables=["context", "question"]
-        )
 
-        self.qa_chain = RetrievalQA.from_chain_type(
-            llm=self.llm,
-            chain_type="stuff",
-            retriever=self.vectorstore.as_retriever(search_kwargs={"k": 7}),
-            return_source_documents=True,
-            chain_type_kwargs={"prompt": prompt},
+        self._index = None
+        self._vectorstore = None
+        self._llm = None
+        self._qa_chain = None
+        self._init_lock = threading.Lock()
+
+        self._index_stats = None
+        self._index_stats_at = 0.0
+        self.manifest, self.lexical_index, self.matcher = open_side_indexes(
+            self.embeddings, self._version(self.active_index)
         )
-        print(f"Debug: QA Chain input keys: {self.qa_chain.input_keys}")
+        self.answer_cache = SemanticAnswerCache()
+        # Shared by every query that searches several namespaces
+        self._fanout = ThreadPoolExecutor(PARTITION_FANOUT_WORKERS, thread_name_prefix="partition")
+        self.feedback = FeedbackSink()
+        self.reranker = CrossEncoderReranker() if RERANK_ENABLED else None
+        if self.reranker is not None:
+            self.reranker.warmup()
+        self.context_packer = ContextPacker() if CONTEXT_PACKING else None
+        metrics.start_file_export()
+
+        if not lazy:
+            self._ensure_vectorstore()
+            self.qa_chain
+
+    # @ LAZY COMPONENTS
+
+    def _ensure_vectorstore(self):
+        with self._init_lock:
+            if self._vectorstore is not None:
+                return
+            logger.info(f"Initializing {VECTORSTORE_BACKEND} vector store '{self.active_index}'...")
 
-    def process_documents(self, docs):
-        """Process and store new documents from the vector stores."""
+            try:
+                self._index, self._vectorstore = get_vectorstore(
+                    self.embeddings,
+                    index_name=self.active_index,
+                    environment=PINECONE_ENVIRONMENT,
+                    recreate=self.recreate_index,
+                    local_dir=version_path(LOCAL_INDEX_DIR, self._version(self.active_index)),
+                )
+                logger.info(f"{VECTORSTORE_BACKEND} vector store initialized successfully")
+            except Exception as e:
+                logger.error(f"Error initializing {VECTORSTORE_BACKEND} vector store: {str(e)}")
+                raise
+
+    @property
+    def index(self):
+        self.follow_alias()
+        self._ensure_vectorstore()
+        return self._index
+
+    @property
+    def vectorstore(self):
+        self.follow_alias()
+        self._ensure_vectorstore()
+        return self._vectorstore
+
+    # @ INDEX VERSIONS
+
+    def _version(self, name: str) -> str | None:
+        return None if name == self.index_name else name
+
+    def follow_alias(self):
+        """Move to the index version the alias points at, if it changed.
+
+        Costs one stat call when nothing changed, so it runs on every query.
+        A version built with a different embedding model is not followed;
+        processes configured for that model pick it up when they start.
+        """
+        if not self.index_alias.changed():
+            return
+        name = self.index_alias.resolve(self.index_name)
+        if name == self.active_index:
+            return
+        model = self.index_alias.version_info(self.index_name, name).get("embedding_model")
+        if model and model != self.embedding_model:
+            logger.warning(
+                f"Index alias moved to '{name}' built with {model}; this process embeds with "
+                f"{self.embedding_model} and keeps serving '{self.active_index}' until restarted"
+            )
+            return
+        self.activate(name)
+
+    def activate(self, name: str):
+        """Serve index version ``name`` and its side indexes from now on."""
+        manifest, lexical_index, matcher = open_side_indexes(self.embeddings, self._version(name))
+        with self._init_lock:
+            # In-flight queries keep the objects they already hold
+            self.active_index = name
+            self._index = self._vectorstore = None
+            self.manifest, self.lexical_index, self.matcher = manifest, lexical_index, matcher
+        self._index_changed()
+        logger.info(f"Now serving index version '{name}'")
+
+    @property
+    def llm(self):
+        with self._init_lock:
+            if self._llm is None:
+                self._llm = get_llm()
+        return self._llm
+
+    @property
+    def qa_chain(self):
+        # The chain only formats and generates; retrieval happens once in
+        # interpret_query so the documents we fetched are the ones in the prompt.
+        if self._qa_chain is None:
+            from langchain_core.output_parsers import StrOutputParser
+            from langchain_core.prompts import PromptTemplate
+
+            self.prompt = PromptTemplate(
+                template=self.template, input_variables=["context", "question"]
+            )
+            self._qa_chain = self.prompt | self.llm | StrOutputParser()
+        return self._qa_chain
+
+    def process_documents(self, docs, ids=None, namespace=None):
+        """Process and store new documents from the vector stores.
+
+        Documents are embedded and upserted in bounded, concurrent, retried
+        batches.
+
+        Args:
+            docs: Documents to embed and upsert
+            ids: Optional vector IDs; passing the same IDs again overwrites
+                the existing vectors instead of duplicating them
+            namespace: Partition to write to (a client, job posting or
+                ingestion batch); the default namespace if omitted
+
+        Returns:
+            The upsert report: upserted count, failed_ids and throughput.
+        """
+        if ids is None:
+            ids = [str(uuid.uuid4()) for _ in docs]
         try:
-            self.vectorstore.add_documents(docs)
-            print(f"Successfully added {len(docs)} documents to the vector store.")
-        except Exception as e:
-            print(f"Error adding documents to vector store: {e}")
+            report = write_documents(
+                self.index, self.embeddings, docs, ids, self.lexical_index, self.matcher, namespace
+            )
+        finally:
+            self._index_changed()
+
+        if report["failed_ids"]:
+            print(
+                f"Error adding documents to vector store: {len(report['failed_ids'])} "
+                f"of {len(docs)} vectors failed."
+            )
+        else:
+            print(
+                f"Successfully added {len(docs)} documents to the vector store "
+                f"({report['vectors_per_second']} vectors/s)."
+            )
+        return report
+
+    def delete_documents(self, ids, parent_ids=None, namespace=None):
+        """Delete vectors by ID from the vector store.
+
+        Args:
+            ids: Chunk vector IDs
+            parent_ids: Parent IDs of resumes removed entirely, dropped from
+                the matching matrix as well
+            namespace: Partition the IDs belong to; nothing outside it is touched
+        """
+        self.vectorstore.delete(ids=ids, namespace=namespace)
+        if self.lexical_index is not None:
+            self.lexical_index.delete(ids, namespace)
+        if self.matcher is not None and parent_ids:
+            self.matcher.delete(parent_ids, namespace)
+        self._index_changed()
+
+    def checkpoint_indexes(self):
+        """Make a batch of writes to the local side indexes durable, without rewriting them."""
+        if self.lexical_index is not None:
+            self.lexical_index.checkpoint()
+
+    def save_indexes(self):
+        """Persist local side indexes in full, e.g. at the end of an ingest."""
+        if self.lexical_index is not None:
+            self.lexical_index.save()
+
+    def clear_vectorstore(self, namespace=None):
+        """Clear documents from the vector store.
+
+        Args:
+            namespace: Partition to clear, leaving every other one intact;
+                all documents in every namespace if omitted
+        """
+        if namespace:
+            namespaces = [namespace]
+        else:
+            namespaces = {*self.namespaces()}
+            if self.lexical_index is not None:
+                namespaces.update(self.lexical_index.list_namespaces())
+            if self.matcher is not None:
+                namespaces.update(self.matcher.index.list_namespaces())
+            namespaces = [None, *sorted(namespaces)]
+
+        for name in namespaces:
+            self.vectorstore.delete(delete_all=True, namespace=name)
+            if self.lexical_index is not None:
+                self.lexical_index.clear(name)
+            if self.matcher is not None:
+                self.matcher.clear(name)
+        self._index_changed()
+        if namespace:
+            self.manifest.clear_namespace(namespace)
+            print(f"Namespace '{namespace}' cleared.")
+        else:
+            self.manifest.clear()
+            print("Vector store cleared.")
+
+    def index_stats(self, refresh: bool = False):
+        """Return describe_index_stats(), cached for INDEX_STATS_TTL seconds.
+
+        Args:
+            refresh: If True, bypass the cache and query the index.
+        """
+        now = time.monotonic()
+        if (
+            refresh
+            or self._index_stats is None
+            or now - self._index_stats_at > INDEX_STATS_TTL
+        ):
+            self._index_stats = self.index.describe_index_stats()
+            self._index_stats_at = now
+        return self._index_stats
+
+    def namespaces(self) -> list[str]:
+        """Non-default namespaces that hold vectors or ingested files."""
+        stats = self.index_stats(refresh=True)
+        names = stats.get("namespaces", {}) if isinstance(stats, dict) else getattr(stats, "namespaces", None) or {}
+        return sorted({name for name in names if name} | set(self.manifest.namespaces()))
+
+    def vector_count(self) -> int:
+        """Number of vectors in the index, using cached stats."""
+        return _total_vector_count(self.index_stats())
+
+    def is_empty(self) -> bool:
+        """Check whether the index holds any vectors, using cached stats."""
+        return self.vector_count() == 0
+
+    def _index_changed(self):
+        """Drop state derived from the index contents after a write."""
+        self._index_stats = None
+        self.answer_cache.invalidate()
+
+    def match_jobs(self, job_descriptions, k: int = MATCH_TOP_K, filter: dict | None = None, namespaces=None):
+        """Rank ingested resumes for each job description without the LLM.
+
+        Args:
+            job_descriptions: Job description texts
+            k: Candidates returned per job
+            filter: Optional metadata filter on resume fields
+            namespaces: Partitions to rank resumes from; the default namespace if omitted
+
+        Returns:
+            One ranked candidate list per job; see ResumeMatcher.match.
+        """
+        if self.matcher is None:
+            raise RuntimeError("Bulk matching is disabled; set MATCHING_ENABLED=true and re-ingest")
+        with stage_timer("match"):
+            return self.matcher.match(job_descriptions, k=k, filter=filter, namespaces=namespaces)
+
+    @staticmethod
+    def _format_context(docs) -> str:
+        """Stuff the retrieved documents into a single context string."""
+        return "\n\n".join(doc.page_content for doc in docs)
+
+    def build_context(self, question, docs):
+        """Assemble the prompt context for retrieved documents.
+
+        With CONTEXT_PACKING on, near-duplicates are dropped and the most
+        relevant sentences are packed into CONTEXT_TOKEN_BUDGET tokens with
+        source labels; otherwise the documents are stuffed whole.
+
+        Args:
+            question: The user question
+            docs: Documents returned by retriever()
+
+        Returns:
+            (context, report), where report has tokens_before, tokens_after
+            and tokens_saved.
+        """
+        with stage_timer("pack"):
+            if self.context_packer is None:
+                context = self._format_context(docs)
+                tokens = count_tokens(context)
+                report = {"tokens_before": tokens, "tokens_after": tokens, "tokens_saved": 0}
+            else:
+                context, report = self.context_packer.pack(question, docs)
+        CONTEXT_TOKENS.observe(report["tokens_after"])
+        CONTEXT_TOKENS_SAVED.inc(report["tokens_saved"])
+        return context, report
 
-    def clear_vectorstore(self):
-        """Clear all documents from the vector store"""
-        self.vectorstore.delete(delete_all=True)
-        print("Vector store cleared.")
+    def _dense_search(self, embedding, k, filter=None, namespaces=None):
+        """Top-k chunks by vector similarity across one or more namespaces.
+
+        Each namespace is searched on the shared fan-out pool and the hits
+        are merged by score, which is comparable across namespaces of the
+        same index.
+        """
+        vectorstore = self.vectorstore
+        if not namespaces:
+            return vectorstore.similarity_search_by_vector(embedding, k=k, filter=filter)
+
+        def search(namespace):
+            return vectorstore.similarity_search_by_vector_with_score(
+                embedding, k=k, filter=filter, namespace=namespace or None
+            )
+
+        if len(namespaces) == 1:
+            hits = search(namespaces[0])
+        else:
+            hits = [hit for result in self._fanout.map(search, namespaces) for hit in result]
+        return [doc for doc, _ in heapq.nlargest(k, hits, key=lambda hit: hit[1])]
+
+    @staticmethod
+    def query_filter(question: str) -> dict | None:
+        """Metadata filter for the constraints stated in a question, if filtering is on."""
+        return parse_query_constraints(question) if METADATA_FILTERING else None
+
+    @staticmethod
+    def cache_scope(namespaces, filter=None) -> str:
+        """
+        Answer-cache scope of a search: its namespaces ("" is the default one)
+        and its metadata filter, so questions that differ only in a constraint
+        ("under 3 years" vs "over 3 years") never share a cached answer.
+        """
+        scope = ",".join(sorted({namespace or "" for namespace in namespaces or [""]}))
+        return f"{scope}|{json.dumps(filter, sort_keys=True)}" if filter else scope
 
     @traceable(run_type="retriever")
-    def retriever(self, query: str):
-        """Retrieve relevant documents from the vector store"""
-        return self.vectorstore.similarity_search(query, k=7)
+    def retriever(self, query: str, embedding=None, filter=None, namespaces=None):
+        """Retrieve relevant documents from the vector store
+
+        Constraints stated in the query (skills, years of experience,
+        education, location) are pushed down as a metadata filter, so the
+        top-k is spent on eligible resumes; if nothing matches the filter
+        the search is repeated unfiltered. With hybrid search on, dense hits
+        are fused with BM25 hits using reciprocal rank fusion. With
+        reranking on, a wider candidate set is scored by the cross-encoder
+        and only its best passages are kept. With chunking enabled, more
+        child chunks than documents are fetched and collapsed back to at
+        most RETRIEVAL_K parent documents. Only the given namespaces are
+        searched; several are fanned out in parallel and merged.
+
+        Args:
+            query: The user question
+            embedding: Precomputed query embedding; computed here if omitted
+            filter: Pinecone-style metadata filter; parsed from the query
+                when omitted and METADATA_FILTERING is on
+            namespaces: Partitions to search; the default namespace if omitted
+        """
+        if embedding is None:
+            with stage_timer("embed"):
+                embedding = self.embeddings.embed_query(query)
+        if filter is None and METADATA_FILTERING:
+            filter = parse_query_constraints(query)
+        fetch_k = RETRIEVAL_K if CHUNK_STRATEGY == "none" else RETRIEVAL_K * CHILD_FETCH_MULTIPLIER
+        if self.reranker is not None:
+            fetch_k = max(fetch_k, RERANK_CANDIDATES)
+        with stage_timer("retrieve"):
+            docs = self._dense_search(embedding, fetch_k, filter, namespaces)
+            if filter and not docs:
+                logger.info(f"No documents match {filter}; retrying without the filter")
+                filter = None
+                docs = self._dense_search(embedding, fetch_k, namespaces=namespaces)
+            if self.lexical_index is not None:
+                lexical = self.lexical_index.search_documents(query, fetch_k * (4 if filter else 1), namespaces)
+                if filter:
+                    lexical = [d for d in lexical if match_filter(d.metadata, filter)][:fetch_k]
+                if lexical:
+                    docs = reciprocal_rank_fusion([docs, lexical], limit=fetch_k)
+        if self.reranker is not None:
+            with stage_timer("rerank"):
+                docs = self.reranker.rerank(query, docs)
+        with stage_timer("collapse"):
+            if CHUNK_STRATEGY == "none":
+                return docs[:RETRIEVAL_K]
+            return collapse_to_parents(docs, RETRIEVAL_K)
 
     @traceable(metadata={"llm": "gpt-3.5-turbo"})
-    def interpret_query(self, question, user_id=None):
+    def answer(self, question, user_id=None, before_generate=None, verbose=False, namespaces=None):
+        """Answer one question and report how long each stage took.
+
+        Args:
+            question: The user question
+            user_id: Optional user ID attached to the run metadata
+            before_generate: Optional callable run just before the LLM call,
+                e.g. a rate limiter; it is skipped on answer-cache hits
+            verbose: Print the Debug lines of the interactive session
+            namespaces: Partitions to answer from; the default namespace if omitted
+
+        Returns:
+            A dict with run_id, answer, docs, cached, context (token counts)
+            and timings (milliseconds per stage).
+        """
         run_id = str(uuid.uuid4())
+        start = time.perf_counter()
+        timings = {}
+        filter = self.query_filter(question)
+        scope = self.cache_scope(namespaces, filter)
+        self.follow_alias()
+
+        def mark(stage, since):
+            seconds = time.perf_counter() - since
+            timings[stage] = round(1000 * seconds, 1)
+            observe_stage(stage, seconds)
+
+        try:
+            t = time.perf_counter()
+            embedding = self.embeddings.embed_query(question)
+            mark("embed", t)
+
+            t = time.perf_counter()
+            cached = self.answer_cache.lookup(embedding, scope)
+            mark("cache", t)
+            if cached is not None:
+                if verbose:
+                    print(f"Debug: Answer cache hit (similarity {cached['similarity']:.3f})")
+                QUERIES.inc(outcome="cached")
+                mark("total", start)
+                return {
+                    "run_id": run_id,
+                    "answer": cached["answer"],
+                    "docs": cached["docs"],
+                    "cached": True,
+                    "context": None,
+                    "timings": timings,
+                }
+
+            t = time.perf_counter()
+            docs = self.retriever(question, embedding=embedding, filter=filter, namespaces=namespaces)
+            timings["retrieve"] = round(1000 * (time.perf_counter() - t), 1)
+            if verbose:
+                print(f"Debug: Retrieved {len(docs)} documents")
+
+            t = time.perf_counter()
+            context, report = self.build_context(question, docs)
+            timings["pack"] = round(1000 * (time.perf_counter() - t), 1)
+            if verbose:
+                print(
+                    f"Debug: Context {report['tokens_after']} tokens "
+                    f"({report['tokens_saved']} of {report['tokens_before']} saved)"
+                )
+
+            if before_generate is not None:
+                before_generate()
+
+            # Streamed internally so time-to-first-token can be measured
+            tokens = []
+            llm_start = time.perf_counter()
+            for token in self.qa_chain.stream(
+                {"context": context, "question": question},
+                config={"metadata": {"user_id": user_id} if user_id else {}},
+            ):
+                if not tokens:
+                    mark("llm_ttft", llm_start)
+                tokens.append(token)
+            mark("llm", llm_start)
+            answer = "".join(tokens)
+        except Exception:
+            QUERIES.inc(outcome="error")
+            mark("total", start)
+            raise
+
+        mark("total", start)
+        QUERIES.inc(outcome="answered")
+        self.answer_cache.store(question, embedding, answer, docs, time.perf_counter() - start, scope)
+        return {
+            "run_id": run_id,
+            "answer": answer,
+            "docs": docs,
+            "cached": False,
+            "context": report,
+            "timings": timings,
+        }
+
+    def interpret_query(self, question, user_id=None):
         print(f"Interpreting query: {question}")
-        docs = self.retriever(question)
-        print(f"Debug: Retrieved {len(docs)} documents")
-        print(f"Debug: QA Chain input keys: {self.qa_chain.input_keys}")
-        result = self.qa_chain.invoke(
-            {"query": question, "input_documents": docs},
+        result = self.answer(question, user_id, verbose=True)
+        sources = [doc.page_content for doc in result["docs"]]
+        return result["answer"], sources, result["run_id"]
+
+    async def astream_answer(self, question, docs, user_id=None, context=None):
+        """Stream answer tokens for already-retrieved documents.
+
+        Args:
+            question: The user question
+            docs: Documents returned by retriever() for this question
+            user_id: Optional user ID attached to the run metadata
+            context: Context from build_context(); built here if omitted
+        """
+        if context is None:
+            context, _ = self.build_context(question, docs)
+        first = True
+        llm_start = time.perf_counter()
+        async for token in self.qa_chain.astream(
+            {"context": context, "question": question},
             config={"metadata": {"user_id": user_id} if user_id else {}},
-        )
-        answer = result["result"] if "result" in result else result["answer"]
-        sources = [doc.page_content for doc in result["source_documents"]]
-        return answer, sources, run_id
+        ):
+            if first:
+                observe_stage("llm_ttft", time.perf_counter() - llm_start)
+                first = False
+            yield token
+        observe_stage("llm", time.perf_counter() - llm_start)
 
     def run_interactive_session(self):
         print("Start talking with the bot (type 'menu' to return to main menu)")
@@ -142,8 +741,7 @@ class RagEngine:
                 try:
                     # Check if we have any documents in the vector store
                     try:
-                        test_docs = self.retriever("test")
-                        if not test_docs:
+                        if self.is_empty():
                             print("\nℹ️ Note: The vector store appears to be empty. "
                                  "You can still ask questions, but results may be limited. "
                                  "Use the main menu to ingest documents.")
@@ -200,10 +798,8 @@ class RagEngine:
             print("\n")
 
     def log_feedback(self, run_id, score):
-        from langsmith import Client
-
-        ls_client = Client()
-        ls_client.create_feedback(run_id=run_id, score=score, key="user_score")
+        """Queue user feedback for a run; sending happens in the background."""
+        self.feedback.submit(run_id, score, key="user_score")
 
     def get_qa_chain(self):
         return self.qa_chain
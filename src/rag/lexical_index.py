@@ -0,0 +1,467 @@
+# @ IMPORT THE NECESSARY LIBRARIES
+import json
+import logging
+import math
+import os
+import re
+import shutil
+import threading
+from collections import Counter
+from urllib.parse import quote, unquote
+
+import numpy as np
+from langchain_core.documents import Document
+
+from src.config.settings import LEXICAL_INDEX_DIR, BM25_K1, BM25_B, BM25_COMPACT_DEAD_FRACTION
+
+logger = logging.getLogger(__name__)
+
+# Keeps tokens such as "c++", "c#", "node.js" and "ci/cd" intact
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#./\-]*[a-z0-9+#]|[a-z0-9]")
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase text and split it into lexical tokens."""
+    return _TOKEN.findall(text.lower())
+
+
+class BM25Index:
+    """
+    Compact BM25 inverted index persisted next to the data directory.
+
+    Postings are stored CSR-style: for term ``t`` the document rows are
+    ``docs[offsets[t]:offsets[t + 1]]`` with matching term frequencies in
+    ``tfs``. New documents go to an in-memory delta that :meth:`save` merges
+    into the arrays. Document text and metadata are appended to a
+    ``docs*.jsonl`` file and read back by byte offset only for returned hits.
+    Deleted documents are only masked until they make up
+    ``compact_dead_fraction`` of the rows; :meth:`save` then renumbers the
+    live rows and rewrites the documents file without them.
+
+    Between saves, :meth:`checkpoint` makes the delta durable cheaply: it
+    appends the offsets of the rows added and the rows deleted since the
+    last checkpoint to ``journal.log``, which loading replays on top of the
+    saved arrays. Its cost depends on the batch, not on the index size.
+    """
+
+    def __init__(
+        self,
+        directory: str = LEXICAL_INDEX_DIR,
+        k1: float = BM25_K1,
+        b: float = BM25_B,
+        compact_dead_fraction: float = BM25_COMPACT_DEAD_FRACTION,
+    ):
+        self.directory = directory
+        self.k1 = k1
+        self.b = b
+        self.compact_dead_fraction = compact_dead_fraction
+        self.docs_path = os.path.join(directory, "docs.jsonl")
+        self.postings_path = os.path.join(directory, "postings.npz")
+        self.meta_path = os.path.join(directory, "meta.json")
+        self.journal_path = os.path.join(directory, "journal.log")
+
+        self._lock = threading.RLock()
+        self._reset_state()
+
+        os.makedirs(directory, exist_ok=True)
+        self._load()
+
+    def _reset_state(self):
+        self._vocab: dict[str, int] = {}
+        self._offsets = np.zeros(1, dtype=np.int64)
+        self._docs = np.zeros(0, dtype=np.int32)
+        self._tfs = np.zeros(0, dtype=np.float32)
+        self._delta: dict[int, list[tuple[int, int]]] = {}
+
+        self._ids: list[str] = []
+        self._rows: dict[str, int] = {}
+        self._doc_offsets: list[int] = []
+        self._doc_len = np.zeros(0, dtype=np.float32)
+        self._live = np.zeros(0, dtype=bool)
+        self._retired_docs_path: str | None = None
+
+        self._generation = 0  # bumped by every save; journal records carry it
+        self._journaled_rows = 0
+        self._deleted_rows: list[int] = []  # deleted since the last checkpoint
+
+    def __len__(self):
+        return len(self._rows)
+
+    # @ PERSISTENCE
+
+    def _load(self):
+        if os.path.exists(self.meta_path) and os.path.exists(self.postings_path):
+            with open(self.meta_path) as f:
+                meta = json.load(f)
+            self._vocab = meta["vocab"]
+            self._ids = meta["ids"]
+            self.docs_path = os.path.join(self.directory, meta.get("docs_file", "docs.jsonl"))
+            self._generation = meta.get("generation", 0)
+            arrays = np.load(self.postings_path)
+            self._offsets = arrays["offsets"]
+            self._docs = arrays["docs"]
+            self._tfs = arrays["tfs"]
+            self._doc_offsets = arrays["doc_offsets"].tolist()
+            self._doc_len = arrays["doc_len"]
+            self._live = arrays["live"]
+            self._rows = {vector_id: row for row, vector_id in enumerate(self._ids) if self._live[row]}
+        self._replay_journal()
+        self._journaled_rows = len(self._ids)
+        if self._ids:
+            logger.info(f"Loaded BM25 index with {len(self._rows)} documents and {len(self._vocab)} terms")
+
+    def _replay_journal(self):
+        """Re-add the rows and deletes checkpointed since the last save."""
+        if not os.path.exists(self.journal_path):
+            return
+        records = []
+        with open(self.journal_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break  # torn last record
+                # Records of an earlier generation are already in the saved arrays
+                if record["generation"] == self._generation:
+                    records.append(record)
+        if not records:
+            return
+        with open(self.docs_path, encoding="utf-8") as f:
+            for record in records:
+                docs, ids = [], []
+                for offset in record["offsets"]:
+                    f.seek(offset)
+                    stored = json.loads(f.readline())
+                    docs.append(stored["text"])
+                    ids.append(stored["id"])
+                self._index_rows(docs, ids, record["offsets"])
+                self._delete_rows(record["deleted"])
+
+    def _index_rows(self, texts, ids, doc_offsets):
+        """Append rows for documents already written to the documents file."""
+        lengths = []
+        for text, vector_id, offset in zip(texts, ids, doc_offsets):
+            row = len(self._ids)
+            self._ids.append(vector_id)
+            self._rows[vector_id] = row
+            self._doc_offsets.append(offset)
+            tokens = tokenize(text)
+            lengths.append(len(tokens))
+            for term, tf in Counter(tokens).items():
+                term_id = self._vocab.setdefault(term, len(self._vocab))
+                self._delta.setdefault(term_id, []).append((row, tf))
+        self._doc_len = np.concatenate([self._doc_len, np.array(lengths, dtype=np.float32)])
+        self._live = np.concatenate([self._live, np.ones(len(lengths), dtype=bool)])
+
+    def _delete_rows(self, rows):
+        for row in rows:
+            self._live[row] = False
+            if self._rows.get(self._ids[row]) == row:
+                del self._rows[self._ids[row]]
+
+    def _merge_delta(self):
+        """Merge the delta into the CSR arrays, dropping postings of deleted documents."""
+        if not self._delta and self._live.all():
+            return
+        docs, tfs, offsets = [], [], [0]
+        for term_id in range(len(self._vocab)):
+            term_docs, term_tfs = self._postings(term_id)
+            docs.append(term_docs)
+            tfs.append(term_tfs)
+            offsets.append(offsets[-1] + len(term_docs))
+        self._docs = np.concatenate(docs) if docs else np.zeros(0, dtype=np.int32)
+        self._tfs = np.concatenate(tfs) if tfs else np.zeros(0, dtype=np.float32)
+        self._offsets = np.array(offsets, dtype=np.int64)
+        self._delta = {}
+
+    def compact(self):
+        """
+        Drop deleted documents for good: renumber the live rows, remap their
+        postings and copy their records to a new documents file, which
+        :meth:`save` then switches to.
+        """
+        with self._lock:
+            self._merge_delta()
+            live_rows = np.flatnonzero(self._live)
+            if len(live_rows) == len(self._ids):
+                return
+            new_rows = np.full(len(self._ids), -1, dtype=np.int32)
+            new_rows[live_rows] = np.arange(len(live_rows), dtype=np.int32)
+            # Postings of deleted rows were dropped by the merge
+            self._docs = new_rows[self._docs]
+
+            generation = int(re.sub(r"\D", "", os.path.basename(self.docs_path)) or 0) + 1
+            docs_path = os.path.join(self.directory, f"docs.{generation}.jsonl")
+            doc_offsets = []
+            with open(self.docs_path, encoding="utf-8") as src, open(docs_path, "w", encoding="utf-8") as dst:
+                for row in live_rows:
+                    src.seek(self._doc_offsets[row])
+                    doc_offsets.append(dst.tell())
+                    dst.write(src.readline())
+
+            dropped = len(self._ids) - len(live_rows)
+            self._ids = [self._ids[row] for row in live_rows]
+            self._rows = {vector_id: row for row, vector_id in enumerate(self._ids)}
+            self._doc_offsets = doc_offsets
+            self._doc_len = self._doc_len[live_rows]
+            self._live = np.ones(len(live_rows), dtype=bool)
+            self._retired_docs_path = self.docs_path
+            self.docs_path = docs_path
+            logger.info(f"Compacted BM25 index in {self.directory}: dropped {dropped} deleted documents")
+
+    def checkpoint(self):
+        """Append the rows added and deleted since the last checkpoint to the journal."""
+        with self._lock:
+            if self._retired_docs_path:
+                # Rows were renumbered by compact(); only a full save records that
+                self.save()
+                return
+            offsets = self._doc_offsets[self._journaled_rows:]
+            if not offsets and not self._deleted_rows:
+                return
+            record = {"generation": self._generation, "offsets": offsets, "deleted": self._deleted_rows}
+            with open(self.journal_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
+            self._journaled_rows = len(self._ids)
+            self._deleted_rows = []
+
+    def save(self):
+        """Compact and write the index atomically, replacing the journal."""
+        with self._lock:
+            self._generation += 1
+            dead = len(self._ids) - len(self._rows)
+            if dead and dead >= self.compact_dead_fraction * len(self._ids):
+                self.compact()
+            else:
+                self._merge_delta()
+            tmp_postings = f"{self.postings_path}.tmp.npz"
+            np.savez(
+                tmp_postings,
+                offsets=self._offsets,
+                docs=self._docs,
+                tfs=self._tfs,
+                doc_offsets=np.array(self._doc_offsets, dtype=np.int64),
+                doc_len=self._doc_len,
+                live=self._live,
+            )
+            tmp_meta = f"{self.meta_path}.tmp"
+            with open(tmp_meta, "w") as f:
+                json.dump({
+                    "vocab": self._vocab,
+                    "ids": self._ids,
+                    "docs_file": os.path.basename(self.docs_path),
+                    "generation": self._generation,
+                }, f)
+            os.replace(tmp_postings, self.postings_path)
+            # The meta file names the documents file, so it is switched last.
+            # Journal records left by a crash before the journal is removed
+            # belong to the previous generation and are ignored on load.
+            os.replace(tmp_meta, self.meta_path)
+            if os.path.exists(self.journal_path):
+                os.remove(self.journal_path)
+            self._journaled_rows = len(self._ids)
+            self._deleted_rows = []
+            retired, self._retired_docs_path = self._retired_docs_path, None
+            if retired and os.path.exists(retired):
+                os.remove(retired)
+
+    def clear(self):
+        with self._lock:
+            docs_files = [os.path.join(self.directory, name) for name in os.listdir(self.directory)
+                          if name.startswith("docs") and name.endswith(".jsonl")]
+            for path in (*docs_files, self.postings_path, self.meta_path, self.journal_path):
+                if os.path.exists(path):
+                    os.remove(path)
+            self._reset_state()
+            self.docs_path = os.path.join(self.directory, "docs.jsonl")
+
+    # @ WRITES
+
+    def add_documents(self, docs, ids):
+        """Index documents under their vector IDs, replacing earlier versions."""
+        with self._lock:
+            self.delete([i for i in ids if i in self._rows])
+            doc_offsets = []
+            with open(self.docs_path, "a", encoding="utf-8") as f:
+                for doc, vector_id in zip(docs, ids):
+                    doc_offsets.append(f.tell())
+                    f.write(json.dumps({"id": vector_id, "text": doc.page_content, "metadata": doc.metadata}, default=str) + "\n")
+            self._index_rows([doc.page_content for doc in docs], ids, doc_offsets)
+
+    def delete(self, ids):
+        with self._lock:
+            for vector_id in ids:
+                row = self._rows.pop(vector_id, None)
+                if row is not None:
+                    self._live[row] = False
+                    self._deleted_rows.append(row)
+
+    # @ QUERIES
+
+    def _postings(self, term_id: int):
+        if term_id + 1 < len(self._offsets):
+            start, end = self._offsets[term_id], self._offsets[term_id + 1]
+            docs, tfs = self._docs[start:end], self._tfs[start:end]
+        else:
+            docs, tfs = np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.float32)
+        extra = self._delta.get(term_id)
+        if extra:
+            docs = np.concatenate([docs, np.array([d for d, _ in extra], dtype=np.int32)])
+            tfs = np.concatenate([tfs, np.array([t for _, t in extra], dtype=np.float32)])
+        keep = self._live[docs]
+        return docs[keep], tfs[keep]
+
+    def search(self, query: str, k: int = 10):
+        """
+        Score documents against the query with BM25.
+
+        Returns:
+            Up to k (vector_id, score) pairs, best first.
+        """
+        with self._lock:
+            n_docs = len(self._rows)
+            if not n_docs:
+                return []
+            avg_len = float(self._doc_len[self._live].mean()) or 1.0
+            scores = np.zeros(len(self._ids), dtype=np.float32)
+            for term in set(tokenize(query)):
+                term_id = self._vocab.get(term)
+                if term_id is None:
+                    continue
+                docs, tfs = self._postings(term_id)
+                if not len(docs):
+                    continue
+                idf = math.log(1 + (n_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+                norm = self.k1 * (1 - self.b + self.b * self._doc_len[docs] / avg_len)
+                scores[docs] += idf * tfs * (self.k1 + 1) / (tfs + norm)
+
+            hits = np.flatnonzero(scores)
+            if not len(hits):
+                return []
+            k = min(k, len(hits))
+            top = hits[np.argpartition(-scores[hits], k - 1)[:k]]
+            top = top[np.argsort(-scores[top])]
+            return [(self._ids[row], float(scores[row])) for row in top]
+
+    def get_documents(self, ids):
+        """Read stored documents back by vector ID."""
+        docs = []
+        with self._lock, open(self.docs_path, encoding="utf-8") as f:
+            for vector_id in ids:
+                row = self._rows.get(vector_id)
+                if row is None:
+                    continue
+                f.seek(self._doc_offsets[row])
+                record = json.loads(f.readline())
+                docs.append(Document(page_content=record["text"], metadata=record["metadata"]))
+        return docs
+
+    def search_documents(self, query: str, k: int = 10):
+        """BM25 search returning Documents, best first."""
+        return self.get_documents([vector_id for vector_id, _ in self.search(query, k)])
+
+
+class PartitionedBM25Index:
+    """
+    One BM25Index per namespace, laid out like LocalIndex's shards.
+
+    The default namespace lives in ``directory`` and namespace ``ns`` in
+    ``directory/namespaces/<ns>``, so a search only reads the postings of the
+    partitions it targets and term statistics are never shared between
+    tenants. Partitions are opened on first use.
+    """
+
+    def __init__(self, directory: str = LEXICAL_INDEX_DIR):
+        self.directory = directory
+        self.namespaces_dir = os.path.join(directory, "namespaces")
+        self._partitions: dict[str | None, BM25Index] = {}
+        self._lock = threading.Lock()
+
+    def partition(self, namespace: str | None = None, create: bool = True) -> BM25Index | None:
+        """BM25 index of one namespace; None if it does not exist and ``create`` is False."""
+        namespace = namespace or None
+        with self._lock:
+            index = self._partitions.get(namespace)
+            if index is None:
+                directory = (
+                    os.path.join(self.namespaces_dir, quote(namespace, safe=""))
+                    if namespace else self.directory
+                )
+                if not create and namespace and not os.path.isdir(directory):
+                    return None
+                index = self._partitions[namespace] = BM25Index(directory)
+            return index
+
+    def list_namespaces(self) -> list[str]:
+        """Non-default namespaces stored on disk."""
+        if not os.path.isdir(self.namespaces_dir):
+            return []
+        return sorted(unquote(name) for name in os.listdir(self.namespaces_dir))
+
+    def add_documents(self, docs, ids, namespace: str | None = None):
+        self.partition(namespace).add_documents(docs, ids)
+
+    def delete(self, ids, namespace: str | None = None):
+        index = self.partition(namespace, create=False)
+        if index is not None:
+            index.delete(ids)
+
+    def save(self):
+        """Save every partition opened by this process."""
+        for index in list(self._partitions.values()):
+            index.save()
+
+    def checkpoint(self):
+        """Checkpoint every partition opened by this process."""
+        for index in list(self._partitions.values()):
+            index.checkpoint()
+
+    def clear(self, namespace: str | None = None):
+        """Empty one partition; a non-default one is removed from disk."""
+        index = self.partition(namespace, create=False)
+        if index is None:
+            return
+        index.clear()
+        if namespace:
+            with self._lock:
+                self._partitions.pop(namespace, None)
+            shutil.rmtree(index.directory, ignore_errors=True)
+
+    def search_documents(self, query: str, k: int = 10, namespaces=None):
+        """
+        BM25 search over one or more partitions, returning Documents best first.
+
+        BM25 scores are not comparable across partitions (each has its own
+        document frequencies), so results from several partitions are merged
+        by reciprocal rank fusion.
+        """
+        rankings = []
+        for namespace in namespaces or [None]:
+            index = self.partition(namespace, create=False)
+            if index is not None and len(index):
+                rankings.append(index.search_documents(query, k))
+        if len(rankings) <= 1:
+            return rankings[0] if rankings else []
+        return reciprocal_rank_fusion(rankings, limit=k)
+
+
+def reciprocal_rank_fusion(rankings, k: int = 60, limit: int | None = None):
+    """
+    Fuse several ranked document lists with reciprocal rank fusion.
+
+    Each document scores ``sum(1 / (k + rank))`` over the lists it appears
+    in; documents are matched by namespace, source and content.
+
+    Args:
+        rankings: Lists of Documents, each best first
+        k: RRF damping constant
+        limit: Maximum documents to return
+    """
+    scores, docs = {}, {}
+    for ranking in rankings:
+        for rank, doc in enumerate(ranking):
+            key = (doc.metadata.get("namespace"), doc.metadata.get("source"), doc.page_content)
+            scores[key] = scores.get(key, 0.0) + 1.0 / (k + rank + 1)
+            docs.setdefault(key, doc)
+    ordered = sorted(scores, key=scores.get, reverse=True)
+    return [docs[key] for key in ordered[:limit]]
@@ -0,0 +1,126 @@
+# @ IMPORT THE NECESSARY LIBRARIES
+import heapq
+import logging
+import sys
+
+import numpy as np
+
+from src.config.settings import MATCH_MATRIX_DIR, MATCH_TOP_K
+from src.data_processing.chunking import CHILD_KEYS, parent_id_for
+from src.storage.local_index import LocalIndex
+
+logger = logging.getLogger(__name__)
+
+# Chunk-level keys that say nothing about the resume as a whole
+_DROPPED_KEYS = (*CHILD_KEYS, "is_whole_document", "page_content")
+
+
+class ResumeMatcher:
+    """
+    Rank candidates for job descriptions without calling the LLM.
+
+    Ingest feeds each resume's chunk embeddings here; they are mean-pooled
+    into one vector per resume and kept in a file-backed LocalIndex matrix
+    (one row per ``parent_id``). :meth:`match` embeds a batch of job
+    descriptions and scores them against every resume with blocked matrix
+    multiplication, keeping the top k per job, so N jobs x M resumes costs
+    a few matmuls and bounded memory instead of N retrieval + LLM round-trips.
+    Resumes of each namespace are kept in their own shard of the matrix, so
+    matching within a tenant only scores that tenant's resumes.
+    """
+
+    def __init__(self, embeddings, directory: str = MATCH_MATRIX_DIR):
+        """
+        Args:
+            embeddings: LangChain embeddings used to encode job descriptions;
+                must be the model the resume vectors were produced with
+            directory: Where the resume matrix is stored
+        """
+        self.embeddings = embeddings
+        # Always exact: every job is scored against every resume
+        self.index = LocalIndex(directory, ivf_min_vectors=sys.maxsize)
+
+    @staticmethod
+    def _resume_metadata(doc) -> dict:
+        return {k: v for k, v in doc.metadata.items() if k not in _DROPPED_KEYS}
+
+    def add_resumes(self, docs, vectors, namespace: str | None = None) -> int:
+        """
+        Store one pooled vector per resume.
+
+        Args:
+            docs: Chunk documents, grouped by their ``parent_id`` metadata
+            vectors: Embedding of each chunk, aligned with ``docs``
+            namespace: Partition the resumes belong to
+
+        Returns:
+            The number of resumes written.
+        """
+        groups: dict[str, tuple[dict, list]] = {}
+        for doc, vector in zip(docs, vectors):
+            parent_id = doc.metadata.get("parent_id") or parent_id_for(
+                doc.metadata.get("source", doc.page_content[:200])
+            )
+            _, rows = groups.setdefault(parent_id, (self._resume_metadata(doc), []))
+            rows.append(vector)
+        if not groups:
+            return 0
+
+        records = []
+        for parent_id, (metadata, rows) in groups.items():
+            # Chunk vectors are unit length, so their mean points at the
+            # whole resume; LocalIndex re-normalizes it on write
+            pooled = np.mean(np.asarray(rows, dtype=np.float32), axis=0)
+            records.append({"id": parent_id, "values": pooled, "metadata": metadata})
+        self.index.upsert(vectors=records, namespace=namespace)
+        return len(records)
+
+    def delete(self, parent_ids, namespace: str | None = None):
+        """Drop resumes of one namespace by parent ID."""
+        if parent_ids:
+            self.index.delete(ids=list(parent_ids), namespace=namespace)
+
+    def clear(self, namespace: str | None = None):
+        """Drop every resume of one namespace."""
+        self.index.delete(delete_all=True, namespace=namespace)
+
+    def count(self) -> int:
+        return self.index.describe_index_stats()["total_vector_count"]
+
+    def match(self, job_descriptions, k: int = MATCH_TOP_K, filter: dict | None = None, namespaces=None):
+        """
+        Top-k resumes for each job description.
+
+        Args:
+            job_descriptions: Job description texts
+            k: Candidates returned per job
+            filter: Optional metadata filter on resume fields, e.g.
+                ``{"years_experience": {"$gte": 5}}``
+            namespaces: Partitions to search; the default namespace if omitted.
+                Cosine scores are comparable across partitions, so their
+                top-k lists are merged by score
+
+        Returns:
+            One list per job of ``{"parent_id", "source", "score", ...}``
+            dicts (the resume's extracted fields), best first.
+        """
+        if not job_descriptions:
+            return []
+        queries = np.asarray(self.embeddings.embed_documents(list(job_descriptions)), dtype=np.float32)
+        partitions = [
+            self.index.query_many(queries, top_k=k, namespace=namespace, filter=filter, include_metadata=True)
+            for namespace in namespaces or [None]
+        ]
+        logger.info(
+            f"Matched {len(job_descriptions)} job descriptions against {len(partitions)} partition(s) "
+            f"of {self.count()} resumes"
+        )
+        return [
+            [
+                {"parent_id": match["id"], "score": round(match["score"], 4), **match["metadata"]}
+                for match in heapq.nlargest(
+                    k, (m for result in results for m in result["matches"]), key=lambda m: m["score"]
+                )
+            ]
+            for results in zip(*partitions)
+        ]
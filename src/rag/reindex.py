@@ -0,0 +1,244 @@
+# @ IMPORT THE NECESSARY LIBRARIES
+import logging
+import os
+import random
+import time
+
+from src.config.settings import (
+    DATA_DIR,
+    LOCAL_INDEX_DIR,
+    PINECONE_ENVIRONMENT,
+    REINDEX_SAMPLE_QUERIES,
+    REINDEX_MIN_RECALL,
+    REINDEX_VERIFY_TIMEOUT,
+)
+from src.data_processing.ingest import ingest_incremental
+from src.rag.engine import _total_vector_count, get_vectorstore, open_side_indexes, write_documents
+from src.storage.index_alias import version_path
+
+logger = logging.getLogger(__name__)
+
+
+def _field(obj, name):
+    """Read a field of a Pinecone response object or of the local index's dicts."""
+    return obj[name] if isinstance(obj, dict) else getattr(obj, name)
+
+
+class IndexVersion:
+    """
+    An index version that is not live yet, with the surface ingest writes to.
+
+    It has its own vector index (``<name>`` in Pinecone, a suffixed
+    directory locally), side indexes and ingest manifest. The manifest is
+    saved after every batch and doubles as the build checkpoint.
+    """
+
+    def __init__(self, engine, name: str):
+        self.name = name
+        self.embeddings = engine.embeddings
+        self.index, _ = get_vectorstore(
+            engine.embeddings,
+            index_name=name,
+            environment=PINECONE_ENVIRONMENT,
+            recreate=False,
+            local_dir=version_path(LOCAL_INDEX_DIR, name),
+        )
+        self.manifest, self.lexical_index, self.matcher = open_side_indexes(engine.embeddings, name)
+        self.vectors_written = 0
+
+    def process_documents(self, docs, ids, namespace=None):
+        report = write_documents(
+            self.index, self.embeddings, docs, ids, self.lexical_index, self.matcher, namespace
+        )
+        self.vectors_written += report["upserted"]
+        print(
+            f"Reindex {self.name}: {self.vectors_written} vectors written "
+            f"({report['vectors_per_second']} vectors/s)"
+        )
+        return report
+
+    def delete_documents(self, ids, parent_ids=None, namespace=None):
+        self.index.delete(ids=ids, namespace=namespace)
+        if self.lexical_index is not None:
+            self.lexical_index.delete(ids, namespace)
+        if self.matcher is not None and parent_ids:
+            self.matcher.delete(parent_ids, namespace)
+
+    def checkpoint_indexes(self):
+        if self.lexical_index is not None:
+            self.lexical_index.checkpoint()
+
+    def save_indexes(self):
+        if self.lexical_index is not None:
+            self.lexical_index.save()
+
+
+def verify(
+    version: IndexVersion,
+    sample_size: int = REINDEX_SAMPLE_QUERIES,
+    min_recall: float = REINDEX_MIN_RECALL,
+    timeout: float = REINDEX_VERIFY_TIMEOUT,
+    live_manifest=None,
+) -> dict:
+    """
+    Check a built version before it goes live.
+
+    The index must hold exactly the vectors its manifest recorded (Pinecone
+    counts are eventually consistent, so this waits up to ``timeout``
+    seconds), and at least ``min_recall`` of a random sample of chunks,
+    re-embedded from their stored text, must retrieve themselves in the top 5.
+    Given the live version's manifest, the new version must also hold every
+    file the live one serves that still exists on disk, so a partition that
+    was not rebuilt is caught before the switch.
+
+    Args:
+        version: The built, not yet live, version
+        sample_size: Chunks sampled for the recall check
+        min_recall: Fraction of sampled chunks that must find themselves
+        timeout: Seconds to wait for the vector count to settle
+        live_manifest: Ingest manifest of the live version, if any
+
+    Returns:
+        A dict with expected, count, live, missing_files, sampled, recall
+        and passed.
+    """
+    missing = []
+    live_vectors = None
+    if live_manifest is not None:
+        live_vectors = sum(len(entry["ids"]) for entry in live_manifest.entries.values())
+        # Files are compared by path: manifests opened on another data directory key them differently
+        built = {
+            (entry.get("namespace"), version.manifest.source_path(key))
+            for key, entry in version.manifest.entries.items()
+        }
+        missing = sorted(
+            path for key, entry in live_manifest.entries.items()
+            for path in [live_manifest.source_path(key)]
+            if (entry.get("namespace"), path) not in built and os.path.exists(path)
+        )
+
+    ids = [(i, entry.get("namespace")) for entry in version.manifest.entries.values() for i in entry["ids"]]
+    deadline = time.monotonic() + timeout
+    while True:
+        count = _total_vector_count(version.index.describe_index_stats())
+        if count == len(ids) or time.monotonic() > deadline:
+            break
+        time.sleep(2)
+
+    sample = random.Random(0).sample(ids, min(sample_size, len(ids)))
+    hits = 0
+    found = []
+    for namespace in {namespace for _, namespace in sample}:
+        sampled = [i for i, ns in sample if ns == namespace]
+        fetched = _field(version.index.fetch(ids=sampled, namespace=namespace), "vectors")
+        found += [
+            (i, namespace, _field(fetched[i], "metadata").get("page_content", "")) for i in sampled if i in fetched
+        ]
+    vectors = version.embeddings.embed_documents([text for *_, text in found]) if found else []
+    for (vector_id, namespace, _), vector in zip(found, vectors):
+        result = version.index.query(vector=list(vector), top_k=5, namespace=namespace)
+        hits += vector_id in {_field(match, "id") for match in _field(result, "matches")}
+    recall = hits / len(sample) if sample else 1.0
+
+    report = {
+        "expected": len(ids),
+        "count": count,
+        "live": live_vectors,
+        "missing_files": len(missing),
+        "sampled": len(sample),
+        "recall": round(recall, 3),
+        "passed": count == len(ids) and not missing and recall >= min_recall,
+    }
+    if missing:
+        logger.warning(f"Index version '{version.name}' lacks {len(missing)} live files, e.g. {missing[:5]}")
+    logger.info(f"Verification of '{version.name}': {report}")
+    return report
+
+
+def reindex(engine, file_pattern="**/*.pdf", data_dir=DATA_DIR, switch: bool = True) -> dict:
+    """
+    Rebuild the corpus into a new index version and switch to it without downtime.
+
+    The live index keeps serving throughout. The new version ``<name>-v<n>``
+    is built from the source files with the current embedding model, then a
+    catch-up pass picks up files that changed meanwhile and retries files
+    that failed. An interrupted build resumes from its checkpoint on the next
+    call. Only a version that passes :func:`verify` is made live, by
+    rewriting the index alias; the previous version is kept for
+    :func:`rollback`. Other processes move over on their next query if they
+    use the same embedding model, otherwise when they are restarted with it.
+    Every namespace of the live index, the default one included, is
+    rebuilt from each directory and pattern its files were ingested from.
+
+    Args:
+        engine: The RagEngine whose index is rebuilt
+        file_pattern: Glob pattern of the default namespace's source files,
+            relative to data_dir; only used when the live manifest recorded
+            no source for it
+        data_dir: Root directory of the default namespace's documents, with
+            the same fallback role
+        switch: If False, stop after verification and leave the alias alone
+
+    Returns:
+        A dict with version, previous, status (incomplete,
+        verification_failed, verified or switched), the ingest summaries per
+        namespace and source, and the verification report.
+    """
+    alias = engine.index_alias
+    base = engine.index_name
+    entry = alias.entry(base)
+
+    name = entry["building"]
+    if name and alias.version_info(base, name).get("embedding_model") != engine.embedding_model:
+        logger.warning(f"Abandoning partial build '{name}', made with a different embedding model")
+        alias.abandon(base)
+        name = None
+    if name:
+        print(f"Resuming build of index version '{name}' from its checkpoint...")
+    else:
+        name = alias.next_version(base)
+        alias.begin(base, name, {
+            "embedding_model": engine.embedding_model,
+            "dimension": getattr(engine.embeddings, "dimension", None),
+        })
+        print(f"Building index version '{name}' while '{entry['active']}' stays live...")
+
+    version = IndexVersion(engine, name)
+    sources = {None: engine.manifest.sources.get("") or [{"file_pattern": file_pattern, "data_dir": data_dir}]}
+    for namespace in engine.manifest.namespaces():
+        if namespace in engine.manifest.sources:
+            sources[namespace] = engine.manifest.sources[namespace]
+        else:
+            logger.warning(f"Namespace '{namespace}' has no recorded source directory and is not rebuilt")
+
+    result = {"version": name, "previous": entry["active"], "ingest": {}, "catch_up": {}}
+    for key in ("ingest", "catch_up"):
+        for namespace, namespace_sources in sources.items():
+            result[key][namespace or ""] = [
+                ingest_incremental(version, source["file_pattern"], source["data_dir"], namespace=namespace)
+                for source in namespace_sources
+            ]
+    failed = sum(summary["failed"] for summaries in result["catch_up"].values() for summary in summaries)
+    if failed:
+        print(f"{failed} files could not be indexed; re-run to resume '{name}'.")
+        return {**result, "status": "incomplete"}
+
+    result["verification"] = verification = verify(version, live_manifest=engine.manifest)
+    if not verification["passed"]:
+        print(f"Index version '{name}' failed verification, not switching: {verification}")
+        return {**result, "status": "verification_failed"}
+    if not switch:
+        return {**result, "status": "verified"}
+
+    alias.switch(base, name, vectors=verification["count"], recall=verification["recall"])
+    engine.follow_alias()
+    print(f"Index '{base}' now serves '{name}'; '{entry['active']}' is kept for rollback.")
+    return {**result, "status": "switched"}
+
+
+def rollback(engine) -> str:
+    """Point the index alias back at the previous version; returns its name."""
+    name = engine.index_alias.rollback(engine.index_name)
+    engine.follow_alias()
+    print(f"Index '{engine.index_name}' rolled back to '{name}'.")
+    return name
@@ -0,0 +1,140 @@
+# @ IMPORT THE NECESSARY LIBRARIES
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+import numpy as np
+
+from src.config.settings import (
+    RERANK_MODEL,
+    RERANK_TOP_N,
+    RERANK_BUDGET_MS,
+    RERANK_BATCH_SIZE,
+    RERANK_WORKERS,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class CrossEncoderReranker:
+    """
+    Rerank retrieved passages with a cross-encoder under a latency budget.
+
+    All (query, passage) pairs of a query are scored in one batched CPU
+    pass on a small pool of ``workers`` threads; jobs beyond that queue.
+    The budget covers the wait in the queue plus scoring, including a
+    first-use model load: when it runs out, the dense order is kept so a
+    slow rerank never delays the answer. A job still queued at that point
+    is cancelled, and one whose deadline passed before a worker picked it
+    up is dropped unscored, so the queue never fills with work nobody is
+    waiting for. A forward pass that has already started cannot be
+    interrupted and finishes in the background.
+    """
+
+    def __init__(
+        self,
+        model_name: str = RERANK_MODEL,
+        top_n: int = RERANK_TOP_N,
+        budget_ms: float = RERANK_BUDGET_MS,
+        batch_size: int = RERANK_BATCH_SIZE,
+        workers: int = RERANK_WORKERS,
+    ):
+        """
+        Args:
+            model_name: sentence-transformers cross-encoder to load
+            top_n: Passages kept for the prompt
+            budget_ms: Per-query time budget for queueing and scoring
+            batch_size: Pairs per forward pass
+            workers: Scoring jobs run at once
+        """
+        self.model_name = model_name
+        self.top_n = top_n
+        self.budget_ms = budget_ms
+        self.batch_size = batch_size
+        self._model = None
+        self._load_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="rerank")
+
+        self._stats_lock = threading.Lock()
+        self.calls = 0
+        self.fallbacks = 0
+        self.expired = 0
+        self.total_seconds = 0.0
+
+    def _get_model(self):
+        with self._load_lock:
+            if self._model is None:
+                from sentence_transformers import CrossEncoder
+
+                logger.info(f"Loading reranker {self.model_name}...")
+                self._model = CrossEncoder(self.model_name, device="cpu")
+        return self._model
+
+    def warmup(self):
+        """Load the model in the background so the first query stays within budget."""
+        self._executor.submit(self._get_model)
+
+    def _score(self, query: str, passages: list[str]) -> np.ndarray:
+        model = self._get_model()
+        return np.asarray(
+            model.predict([(query, p) for p in passages], batch_size=self.batch_size),
+            dtype=np.float32,
+        )
+
+    def _score_before(self, deadline: float, query: str, passages: list[str]) -> np.ndarray | None:
+        """Score unless the caller's deadline passed while the job was queued."""
+        if time.monotonic() > deadline:
+            with self._stats_lock:
+                self.expired += 1
+            return None
+        return self._score(query, passages)
+
+    def _record(self, start: float, fallback: bool):
+        with self._stats_lock:
+            self.calls += 1
+            self.fallbacks += fallback
+            self.total_seconds += time.perf_counter() - start
+
+    def rerank(self, query: str, docs):
+        """
+        Return the best ``top_n`` documents for the query.
+
+        Falls back to the first ``top_n`` documents in their incoming (dense)
+        order when the budget is exceeded or scoring fails.
+        """
+        if len(docs) <= 1:
+            return list(docs[:self.top_n])
+
+        start = time.perf_counter()
+        budget = self.budget_ms / 1000
+        future = self._executor.submit(
+            self._score_before, time.monotonic() + budget, query, [d.page_content for d in docs]
+        )
+        try:
+            scores = future.result(timeout=budget)
+        except FutureTimeout:
+            future.cancel()  # succeeds while the job is still queued
+            self._record(start, fallback=True)
+            logger.warning(f"Rerank exceeded {self.budget_ms}ms budget, keeping dense order")
+            return list(docs[:self.top_n])
+        except Exception as e:
+            self._record(start, fallback=True)
+            logger.error(f"Rerank failed, keeping dense order: {e}")
+            return list(docs[:self.top_n])
+
+        if scores is None:  # expired in the queue just as the budget ran out
+            self._record(start, fallback=True)
+            return list(docs[:self.top_n])
+        self._record(start, fallback=False)
+        order = np.argsort(-scores)[:self.top_n]
+        return [docs[i] for i in order]
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            return {
+                "calls": self.calls,
+                "fallbacks": self.fallbacks,
+                "expired": self.expired,
+                "mean_ms": round(1000 * self.total_seconds / self.calls, 2) if self.calls else 0.0,
+            }
@@ -0,0 +1,172 @@
+import json
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.config.settings import (
+    UPSERT_BATCH_SIZE,
+    UPSERT_MAX_BATCH_BYTES,
+    UPSERT_WORKERS,
+    UPSERT_MAX_RETRIES,
+    UPSERT_BACKOFF,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _record_bytes(record: dict) -> int:
+    """Rough request size of one vector record: float payload plus JSON metadata."""
+    return len(record["id"]) + 4 * len(record["values"]) + len(
+        json.dumps(record["metadata"], default=str)
+    )
+
+
+class BulkUpserter:
+    """
+    Embed documents and upsert them into a Pinecone-style index in bulk.
+
+    Documents are embedded ``batch_size`` at a time on the calling thread and
+    split into requests bounded by both vector count and ``max_batch_bytes``.
+    Requests go to a bounded pool of ``workers`` threads, so the network
+    round-trip of one batch overlaps with embedding the next. Each request is
+    retried with exponential backoff; IDs that still fail are reported
+    instead of being silently dropped.
+    """
+
+    def __init__(
+        self,
+        index,
+        embeddings,
+        text_key: str = "page_content",
+        namespace: str | None = None,
+        batch_size: int = UPSERT_BATCH_SIZE,
+        max_batch_bytes: int = UPSERT_MAX_BATCH_BYTES,
+        workers: int = UPSERT_WORKERS,
+        max_retries: int = UPSERT_MAX_RETRIES,
+        backoff: float = UPSERT_BACKOFF,
+    ):
+        """
+        Args:
+            index: Object with the ``pc.Index`` upsert API
+            embeddings: LangChain embeddings used to encode page_content
+            text_key: Metadata key the document text is stored under
+            namespace: Index namespace to write to
+            batch_size: Maximum vectors per upsert request
+            max_batch_bytes: Maximum approximate bytes per upsert request
+            workers: Concurrent upsert requests
+            max_retries: Retries per request after the first attempt
+            backoff: Base delay in seconds, doubled on each retry
+        """
+        self.index = index
+        self.embeddings = embeddings
+        self.text_key = text_key
+        self.namespace = namespace
+        self.batch_size = batch_size
+        self.max_batch_bytes = max_batch_bytes
+        self.workers = workers
+        self.max_retries = max_retries
+        self.backoff = backoff
+
+    def _records(self, docs, ids, vectors):
+        for doc, vector_id, values in zip(docs, ids, vectors):
+            metadata = dict(doc.metadata)
+            metadata[self.text_key] = doc.page_content
+            yield {"id": vector_id, "values": list(values), "metadata": metadata}
+
+    def _requests(self, records):
+        """Split records into requests bounded by count and bytes."""
+        batch, size = [], 0
+        for record in records:
+            record_size = _record_bytes(record)
+            if batch and (len(batch) >= self.batch_size or size + record_size > self.max_batch_bytes):
+                yield batch
+                batch, size = [], 0
+            batch.append(record)
+            size += record_size
+        if batch:
+            yield batch
+
+    def _upsert_with_retry(self, batch):
+        """Upsert one request; returns the IDs that could not be written."""
+        for attempt in range(self.max_retries + 1):
+            try:
+                self.index.upsert(vectors=batch, namespace=self.namespace)
+                return []
+            except Exception as e:
+                if attempt == self.max_retries:
+                    logger.error(f"Upsert of {len(batch)} vectors failed after {attempt + 1} attempts: {e}")
+                    return [record["id"] for record in batch]
+                delay = self.backoff * (2 ** attempt) * (1 + random.random() * 0.1)
+                logger.warning(f"Upsert failed ({e}), retrying in {delay:.2f}s")
+                time.sleep(delay)
+
+    def upsert_documents(self, docs, ids, on_embedded=None) -> dict:
+        """
+        Embed and upsert documents under the given IDs.
+
+        Args:
+            docs: Documents to embed and upsert
+            ids: Vector ID of each document
+            on_embedded: Optional ``callback(batch_ids, vectors)`` called with
+                each embedded batch, so callers can reuse the vectors
+                without embedding the documents a second time
+
+        Returns:
+            A report dict with ``upserted``, ``failed_ids``, ``requests``,
+            ``seconds`` and ``vectors_per_second``.
+        """
+        if len(docs) != len(ids):
+            raise ValueError(f"Got {len(docs)} documents but {len(ids)} ids")
+
+        start = time.perf_counter()
+        failed_ids, upserted, requests = [], 0, 0
+        lock = threading.Lock()
+        # Bound queued requests so embedded vectors cannot pile up in memory
+        slots = threading.BoundedSemaphore(self.workers * 2)
+
+        def run(batch):
+            nonlocal upserted
+            try:
+                failed = self._upsert_with_retry(batch)
+                with lock:
+                    failed_ids.extend(failed)
+                    upserted += len(batch) - len(failed)
+            finally:
+                slots.release()
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for offset in range(0, len(docs), self.batch_size):
+                batch_docs = docs[offset:offset + self.batch_size]
+                batch_ids = ids[offset:offset + self.batch_size]
+                try:
+                    vectors = self.embeddings.embed_documents(
+                        [doc.page_content for doc in batch_docs]
+                    )
+                except Exception as e:
+                    logger.error(f"Embedding {len(batch_docs)} documents failed: {e}")
+                    with lock:
+                        failed_ids.extend(batch_ids)
+                    continue
+                if on_embedded is not None:
+                    on_embedded(batch_ids, vectors)
+
+                for request in self._requests(self._records(batch_docs, batch_ids, vectors)):
+                    slots.acquire()
+                    requests += 1
+                    pool.submit(run, request)
+
+        seconds = time.perf_counter() - start
+        report = {
+            "upserted": upserted,
+            "failed_ids": failed_ids,
+            "requests": requests,
+            "seconds": round(seconds, 3),
+            "vectors_per_second": round(upserted / seconds, 1) if seconds else 0.0,
+        }
+        logger.info(
+            f"Upserted {upserted} vectors in {report['seconds']}s "
+            f"({report['vectors_per_second']} vectors/s, {len(failed_ids)} failed)"
+        )
+        return report
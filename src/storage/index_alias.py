@@ -0,0 +1,139 @@
+import json
+import logging
+import os
+import re
+import time
+
+from src.config.settings import INDEX_ALIAS_PATH
+
+logger = logging.getLogger(__name__)
+
+
+def version_path(path: str, version: str | None) -> str:
+    """
+    Local file or directory of one index version.
+
+    ``None`` is the original, unversioned index, which keeps the configured
+    path; versions get a suffix, e.g. ``data/index`` -> ``data/index-resumes-v2``.
+    """
+    if not version:
+        return path
+    root, ext = os.path.splitext(path)
+    return f"{root}-{version}{ext}"
+
+
+class IndexAlias:
+    """
+    Pointer file naming the live version of each logical index.
+
+    RagEngine resolves its index name through the alias, so a reindex can
+    build ``<name>-v<n>`` next to the live index and go live with one atomic
+    file replace. Earlier versions are kept, newest first, for rollback.
+    """
+
+    def __init__(self, path: str = INDEX_ALIAS_PATH):
+        self.path = path
+        self._seen_mtime = None
+
+    def _read(self) -> dict:
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write(self, state: dict):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def _mtime(self):
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+
+    def entry(self, base: str) -> dict:
+        """Alias state of one index: active, previous, building and per-version info."""
+        entry = self._read().get(base, {})
+        return {
+            "active": entry.get("active", base),
+            "previous": entry.get("previous", []),
+            "building": entry.get("building"),
+            "versions": entry.get("versions", {}),
+        }
+
+    def _update(self, base: str, **changes) -> dict:
+        state = self._read()
+        entry = self.entry(base)
+        entry.update(changes)
+        state[base] = entry
+        self._write(state)
+        return entry
+
+    def resolve(self, base: str) -> str:
+        """Name of the live index behind ``base``."""
+        self._seen_mtime = self._mtime()
+        return self.entry(base)["active"]
+
+    def version_info(self, base: str, name: str) -> dict:
+        return self.entry(base)["versions"].get(name, {})
+
+    def changed(self) -> bool:
+        """Whether the alias file was rewritten since the last :meth:`resolve`; one stat call."""
+        return self._mtime() != self._seen_mtime
+
+    def next_version(self, base: str) -> str:
+        entry = self.entry(base)
+        numbers = [
+            int(match.group(1))
+            for name in (*entry["versions"], entry["active"], *entry["previous"])
+            if (match := re.fullmatch(rf"{re.escape(base)}-v(\d+)", name))
+        ]
+        # The original, unversioned index counts as v1
+        return f"{base}-v{max(numbers, default=1) + 1}"
+
+    def begin(self, base: str, name: str, info: dict):
+        """Record a version that is being built; it is not live until :meth:`switch`."""
+        versions = self.entry(base)["versions"]
+        versions[name] = {**info, "status": "building", "created_at": time.time()}
+        self._update(base, building=name, versions=versions)
+
+    def abandon(self, base: str):
+        entry = self.entry(base)
+        if entry["building"]:
+            entry["versions"].get(entry["building"], {})["status"] = "abandoned"
+        self._update(base, building=None, versions=entry["versions"])
+
+    def switch(self, base: str, name: str, **info) -> str:
+        """Make ``name`` live and return the version it replaced."""
+        entry = self.entry(base)
+        previous = entry["active"]
+        versions = entry["versions"]
+        versions.setdefault(name, {}).update(info, status="active", activated_at=time.time())
+        if previous in versions:
+            versions[previous]["status"] = "previous"
+        self._update(
+            base,
+            active=name,
+            previous=[previous] + [p for p in entry["previous"] if p not in (previous, name)],
+            building=None if entry["building"] == name else entry["building"],
+            versions=versions,
+        )
+        logger.info(f"Index alias '{base}' now points at '{name}' (was '{previous}')")
+        return previous
+
+    def rollback(self, base: str) -> str:
+        """Point the alias back at the most recent previous version and return it."""
+        entry = self.entry(base)
+        if not entry["previous"]:
+            raise ValueError(f"Index '{base}' has no previous version to roll back to")
+        target, rest = entry["previous"][0], entry["previous"][1:]
+        versions = entry["versions"]
+        versions.setdefault(entry["active"], {})["status"] = "rolled_back"
+        versions.setdefault(target, {})["status"] = "active"
+        self._update(base, active=target, previous=[entry["active"]] + rest, versions=versions)
+        logger.warning(f"Index alias '{base}' rolled back to '{target}' (was '{entry['active']}')")
+        return target
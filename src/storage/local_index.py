@@ -0,0 +1,801 @@
+import json
+import logging
+import os
+import shutil
+import threading
+import uuid
+from urllib.parse import quote, unquote
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.vectorstores import VectorStore
+
+from src.config.settings import (
+    LOCAL_INDEX_DIR,
+    LOCAL_IVF_MIN_VECTORS,
+    LOCAL_IVF_NPROBE,
+    LOCAL_COMPACT_DEAD_FRACTION,
+    LOCAL_QUANTIZATION,
+    LOCAL_RESCORE_FACTOR,
+    MATCH_ROW_BLOCK,
+    MATCH_QUERY_BLOCK,
+)
+from src.storage.memory_index import match_filter
+from src.storage.quantization import get_quantizer
+
+logger = logging.getLogger(__name__)
+
+_ASSIGN_BLOCK = 65536  # rows scored against centroids per matmul
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms == 0, 1.0, norms)
+
+
+def _nearest(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    out = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), _ASSIGN_BLOCK):
+        block = vectors[start:start + _ASSIGN_BLOCK]
+        out[start:start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+    return out
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k largest scores, best first, via argpartition."""
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    part = np.argpartition(-scores, k - 1)[:k]
+    return part[np.argsort(-scores[part])]
+
+
+class LocalIndex:
+    """
+    File-backed vector index with the ``pc.Index`` API.
+
+    Vectors are L2-normalized on write and kept in a memory-mapped float32
+    matrix (``vectors.f32``), so cosine similarity is a single matrix-vector
+    product. IDs and metadata are replayed from an append-only log
+    (``records.jsonl``). Deletes only tombstone rows; once dead rows or
+    superseded log records pass ``compact_dead_fraction`` the files are
+    rewritten with the live rows only. Queries are exact by default; once
+    the index holds ``ivf_min_vectors`` live vectors a spherical k-means
+    coarse quantizer is trained on a background thread, and from then on
+    only the ``nprobe`` closest lists are scanned.
+
+    With ``quantization`` set, a compressed copy of every vector (float16,
+    int8 or sign bits, see src.storage.quantization) is kept in its own
+    memory-mapped file and scanned instead of the float32 matrix; only the
+    best ``top_k * rescore_factor`` candidates are rescored exactly from the
+    float32 file, so the pages a query touches shrink by 2-32x.
+
+    Like Pinecone, vectors live in namespaces. The default namespace is
+    stored in ``directory`` itself and every other namespace is a child
+    LocalIndex under ``directory/namespaces/``, so a query scans only the
+    namespace it targets.
+    """
+
+    def __init__(
+        self,
+        directory: str = LOCAL_INDEX_DIR,
+        ivf_min_vectors: int = LOCAL_IVF_MIN_VECTORS,
+        nprobe: int = LOCAL_IVF_NPROBE,
+        quantization: str = LOCAL_QUANTIZATION,
+        rescore_factor: int = LOCAL_RESCORE_FACTOR,
+        compact_dead_fraction: float = LOCAL_COMPACT_DEAD_FRACTION,
+    ):
+        self.directory = directory
+        self.quantization = quantization
+        self.ivf_min_vectors = ivf_min_vectors
+        self.nprobe = nprobe
+        self.compact_dead_fraction = compact_dead_fraction
+        self.quantizer = get_quantizer(quantization)
+        self.rescore_factor = rescore_factor or (self.quantizer.rescore_factor if self.quantizer else 1)
+        self.matrix_path = os.path.join(directory, "vectors.f32")
+        self.records_path = os.path.join(directory, "records.jsonl")
+        self.meta_path = os.path.join(directory, "meta.json")
+        self.ivf_path = os.path.join(directory, "ivf.npy")
+        self.codes_path = os.path.join(directory, f"vectors.{quantization}")
+        self.quant_path = os.path.join(directory, f"{quantization}.json")
+        self.namespaces_dir = os.path.join(directory, "namespaces")
+        self.compact_marker_path = os.path.join(directory, "compacting")
+        self._shards: dict[str, LocalIndex] = {}
+
+        self.dimension: int | None = None
+        self._ids: list[str | None] = []
+        self._metadata: list[dict | None] = []
+        self._rows: dict[str, int] = {}
+        self._matrix = None
+        self._live = np.zeros(0, dtype=bool)
+        self._centroids = None
+        self._assignments = None
+        self._ivf_trained_on = 0
+        self._ivf_thread: threading.Thread | None = None
+        self._epoch = 0  # bumped by delete_all, so a stale background build is discarded
+        self._log_records = 0  # lines in records.jsonl
+        self._codes = None
+        self._quant_fitted_on = 0
+        self._lock = threading.RLock()
+
+        os.makedirs(directory, exist_ok=True)
+        self._load()
+
+    # @ PERSISTENCE
+
+    def _load(self):
+        self._finish_compaction()
+        if not os.path.exists(self.meta_path):
+            return
+        with open(self.meta_path) as f:
+            self.dimension = json.load(f)["dimension"]
+        codes_existed = os.path.exists(self.codes_path) and os.path.exists(self.quant_path)
+        self._map(os.path.getsize(self.matrix_path) // (self.dimension * 4))
+
+        if os.path.exists(self.records_path):
+            with open(self.records_path) as f:
+                for line in f:
+                    record = json.loads(line)
+                    self._log_records += 1
+                    if record["op"] == "put":
+                        self._set_row(record["row"], record["id"], record["metadata"])
+                    else:
+                        self._clear_row(record["row"])
+
+        if os.path.exists(self.ivf_path):
+            self._centroids = np.load(self.ivf_path)
+            self._assign_all()
+        if self.quantizer is not None:
+            if codes_existed:
+                with open(self.quant_path) as f:
+                    state = json.load(f)
+                self.quantizer.load_state(state)
+                self._quant_fitted_on = state.get("fitted_on", 0)
+            else:
+                # Quantization was switched on for an existing index
+                self._encode_all(refit=True)
+        logger.info(f"Loaded local index from {self.directory} with {len(self._rows)} vectors")
+        self._maybe_build_ivf()
+
+    def _map(self, capacity: int):
+        if self._matrix is not None:
+            self._matrix.flush()
+            self._matrix = None
+        if capacity:
+            self._matrix = np.memmap(
+                self.matrix_path, dtype=np.float32, mode="r+",
+                shape=(capacity, self.dimension),
+            )
+        live = np.zeros(capacity, dtype=bool)
+        live[:len(self._live)] = self._live[:capacity]
+        self._live = live
+        if self.quantizer is not None:
+            self._map_codes(capacity)
+
+    def _map_codes(self, capacity: int):
+        self._codes = None
+        if not capacity:
+            return
+        code_size = self.quantizer.code_size(self.dimension)
+        with open(self.codes_path, "ab") as f:
+            f.truncate(capacity * code_size * np.dtype(self.quantizer.dtype).itemsize)
+        self._codes = np.memmap(
+            self.codes_path, dtype=self.quantizer.dtype, mode="r+", shape=(capacity, code_size),
+        )
+
+    def _capacity(self) -> int:
+        return 0 if self._matrix is None else self._matrix.shape[0]
+
+    def _ensure_capacity(self, rows: int):
+        capacity = self._capacity()
+        if rows <= capacity:
+            return
+        new_capacity = max(rows, capacity * 2, 1024)
+        with open(self.matrix_path, "ab") as f:
+            f.truncate(new_capacity * self.dimension * 4)
+        self._map(new_capacity)
+        if self._assignments is not None:
+            assignments = np.full(new_capacity, -1, dtype=np.int32)
+            assignments[:len(self._assignments)] = self._assignments
+            self._assignments = assignments
+
+    def _set_dimension(self, dimension: int):
+        self.dimension = dimension
+        with open(self.meta_path, "w") as f:
+            json.dump({"dimension": dimension}, f)
+
+    def _set_row(self, row: int, vector_id: str, metadata: dict):
+        while len(self._ids) <= row:
+            self._ids.append(None)
+            self._metadata.append(None)
+        self._ids[row] = vector_id
+        self._metadata[row] = metadata
+        self._rows[vector_id] = row
+        self._live[row] = True
+
+    def _clear_row(self, row: int):
+        vector_id = self._ids[row]
+        if vector_id is not None:
+            self._rows.pop(vector_id, None)
+        self._ids[row] = None
+        self._metadata[row] = None
+        self._live[row] = False
+
+    def _reset(self):
+        self._matrix = self._codes = None
+        for path in (
+            self.matrix_path, self.records_path, self.meta_path, self.ivf_path, self.codes_path, self.quant_path,
+        ):
+            if os.path.exists(path):
+                os.remove(path)
+        if self.quantizer is not None:
+            self.quantizer = type(self.quantizer)()
+        self._quant_fitted_on = 0
+        self.dimension = None
+        self._ids, self._metadata, self._rows = [], [], {}
+        self._live = np.zeros(0, dtype=bool)
+        self._centroids = self._assignments = None
+        self._ivf_trained_on = 0
+        self._log_records = 0
+        self._epoch += 1
+
+    # @ COMPACTION
+
+    def _compacted_paths(self) -> list[tuple[str, str]]:
+        paths = [self.matrix_path, self.records_path]
+        if self.quantizer is not None:
+            paths.append(self.codes_path)
+        return [(f"{path}.compact", path) for path in paths]
+
+    def _finish_compaction(self):
+        """Complete or discard a compaction interrupted by a crash."""
+        if os.path.exists(self.compact_marker_path):
+            # Every rewritten file was complete before the marker was written
+            for tmp_path, path in self._compacted_paths():
+                if os.path.exists(tmp_path):
+                    os.replace(tmp_path, path)
+            os.remove(self.compact_marker_path)
+        for tmp_path, _ in self._compacted_paths():
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _maybe_compact(self):
+        used, live = len(self._ids), len(self._rows)
+        threshold = self.compact_dead_fraction
+        if used - live > threshold * used or self._log_records - live > threshold * self._log_records:
+            self.compact()
+
+    def compact(self):
+        """
+        Rewrite the vector, code and record files with only the live rows.
+
+        Rows are renumbered in their current order. The new files are written
+        next to the old ones and swapped in behind a marker file, so a crash
+        at any point leaves either the old or the new index.
+        """
+        with self._lock:
+            if self.dimension is None:
+                return
+            live_rows = np.flatnonzero(self._live[:len(self._ids)])
+            if len(live_rows) == len(self._ids) and self._log_records == len(live_rows):
+                return
+            (matrix_tmp, _), (records_tmp, _), *codes = self._compacted_paths()
+            with open(matrix_tmp, "wb") as f:
+                for start in range(0, len(live_rows), _ASSIGN_BLOCK):
+                    f.write(np.ascontiguousarray(self._matrix[live_rows[start:start + _ASSIGN_BLOCK]]).tobytes())
+            if codes:
+                with open(codes[0][0], "wb") as f:
+                    for start in range(0, len(live_rows), _ASSIGN_BLOCK):
+                        f.write(np.ascontiguousarray(self._codes[live_rows[start:start + _ASSIGN_BLOCK]]).tobytes())
+            with open(records_tmp, "w") as f:
+                for new_row, row in enumerate(live_rows):
+                    f.write(json.dumps({
+                        "op": "put", "row": new_row, "id": self._ids[row], "metadata": self._metadata[row],
+                    }) + "\n")
+
+            dropped = len(self._ids) - len(live_rows)
+            ids = [self._ids[row] for row in live_rows]
+            metadata = [self._metadata[row] for row in live_rows]
+            assignments = None if self._assignments is None else self._assignments[live_rows]
+            # Release the memory maps before their files are replaced
+            for mapped in (self._matrix, self._codes):
+                if mapped is not None:
+                    mapped.flush()
+            self._matrix = self._codes = None
+            with open(self.compact_marker_path, "w"):
+                pass
+            self._finish_compaction()
+
+            self._ids, self._metadata = ids, metadata
+            self._rows = {vector_id: row for row, vector_id in enumerate(ids)}
+            self._live = np.zeros(0, dtype=bool)
+            self._map(len(ids))
+            self._live[:] = True
+            self._assignments = assignments
+            self._log_records = len(ids)
+            logger.info(f"Compacted local index in {self.directory}: dropped {dropped} dead rows")
+
+    # @ IVF COARSE INDEX
+
+    def _nearest_centroids(self, vectors: np.ndarray) -> np.ndarray:
+        return _nearest(vectors, self._centroids)
+
+    def _assign_all(self):
+        self._assignments = np.full(self._capacity(), -1, dtype=np.int32)
+        rows = np.flatnonzero(self._live)
+        if len(rows):
+            self._assignments[rows] = self._nearest_centroids(self._matrix[rows])
+        self._ivf_trained_on = len(rows)
+
+    def build_ivf(self, nlist: int | None = None, iterations: int = 10, seed: int = 0):
+        """
+        Train the coarse quantizer with spherical k-means over live vectors.
+
+        The lock is only held to copy the training sample and to install the
+        lists; k-means itself runs on the copy, so queries and writes go on
+        meanwhile (exact, or with the previous lists).
+
+        Args:
+            nlist: Number of inverted lists; defaults to sqrt(live vectors)
+            iterations: k-means iterations
+            seed: Random seed for centroid initialization
+        """
+        with self._lock:
+            rows = np.flatnonzero(self._live)
+            if not len(rows):
+                return
+            epoch = self._epoch
+            nlist = min(nlist or max(int(np.sqrt(len(rows))), 1), len(rows))
+            rng = np.random.default_rng(seed)
+            sample = rows if len(rows) <= nlist * 256 else rng.choice(rows, nlist * 256, replace=False)
+            data = np.array(self._matrix[np.sort(sample)])
+
+        centroids = data[rng.choice(len(data), nlist, replace=False)].copy()
+        for _ in range(iterations):
+            assign = _nearest(data, centroids)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assign, data)
+            counts = np.bincount(assign, minlength=nlist)
+            filled = counts > 0
+            centroids[filled] = _normalize(sums[filled])
+
+        with self._lock:
+            if epoch != self._epoch:
+                return  # the index was emptied while training
+            self._centroids = centroids
+            np.save(self.ivf_path, self._centroids)
+            self._assign_all()
+            logger.info(f"Built IVF index with {nlist} lists over {len(rows)} vectors")
+
+    def _maybe_build_ivf(self):
+        """Start training the lists on a background thread once the index is large enough."""
+        live = len(self._rows)
+        if live < self.ivf_min_vectors:
+            return
+        # Retrain once the corpus has grown well past what the lists were fit on
+        if self._centroids is not None and live <= 4 * self._ivf_trained_on:
+            return
+        if self._ivf_thread is not None and self._ivf_thread.is_alive():
+            return
+        self._ivf_thread = threading.Thread(target=self._build_ivf_in_background, name="local-ivf", daemon=True)
+        self._ivf_thread.start()
+
+    def _build_ivf_in_background(self):
+        try:
+            self.build_ivf()
+        except Exception as e:
+            logger.error(f"Building the IVF index in {self.directory} failed: {e}")
+
+    # @ QUANTIZED CODES
+
+    def _encode_all(self, refit: bool = False):
+        """Re-encode every row, refitting the quantizer on (a sample of) live vectors first."""
+        rows = np.flatnonzero(self._live)
+        if refit and self.quantizer.needs_fit and len(rows):
+            sample = rows if len(rows) <= 100000 else np.sort(
+                np.random.default_rng(0).choice(rows, 100000, replace=False)
+            )
+            self.quantizer.fit(np.asarray(self._matrix[sample]))
+        for start in range(0, len(self._ids), _ASSIGN_BLOCK):
+            block = np.asarray(self._matrix[start:min(start + _ASSIGN_BLOCK, len(self._ids))])
+            self._codes[start:start + len(block)] = self.quantizer.encode(block)
+        self._codes.flush()
+        self._quant_fitted_on = len(rows)
+        with open(self.quant_path, "w") as f:
+            json.dump({**self.quantizer.state(), "fitted_on": self._quant_fitted_on}, f)
+        logger.info(f"Encoded {len(rows)} vectors as {self.quantizer.name}")
+
+    def _encode_rows(self, rows, values: np.ndarray):
+        # Fitted quantizers are refit whenever the corpus doubles, so the
+        # per-dimension ranges keep up with what has been added
+        if self.quantizer.needs_fit and len(self._rows) >= 2 * self._quant_fitted_on:
+            self._encode_all(refit=True)
+            return
+        self._codes[rows] = self.quantizer.encode(values)
+        self._codes.flush()
+
+    def _rescore(self, candidates: np.ndarray, query: np.ndarray, top_k: int):
+        """Exact float32 scores for approximate candidates; returns (rows, scores) best first."""
+        candidates = np.sort(np.asarray(candidates, dtype=np.int64))  # sequential reads from the mmap
+        exact = self._matrix[candidates] @ query
+        order = top_k_indices(exact, top_k)
+        return candidates[order], exact[order]
+
+    # @ NAMESPACES
+
+    def _shard(self, namespace: str, create: bool = False) -> "LocalIndex | None":
+        """Child index of a namespace; None if it does not exist and ``create`` is False."""
+        with self._lock:
+            shard = self._shards.get(namespace)
+            if shard is None:
+                directory = os.path.join(self.namespaces_dir, quote(namespace, safe=""))
+                if not create and not os.path.isdir(directory):
+                    return None
+                shard = self._shards[namespace] = LocalIndex(
+                    directory,
+                    ivf_min_vectors=self.ivf_min_vectors,
+                    nprobe=self.nprobe,
+                    quantization=self.quantization,
+                    rescore_factor=self.rescore_factor,
+                    compact_dead_fraction=self.compact_dead_fraction,
+                )
+            return shard
+
+    def list_namespaces(self) -> list[str]:
+        """Non-default namespaces stored on disk, including empty ones."""
+        if not os.path.isdir(self.namespaces_dir):
+            return []
+        return sorted(unquote(name) for name in os.listdir(self.namespaces_dir))
+
+    # @ PINECONE INDEX API
+
+    def upsert(self, vectors, namespace=None, **kwargs):
+        if namespace:
+            return self._shard(namespace, create=True).upsert(vectors)
+        records = []
+        for vector in vectors:
+            if isinstance(vector, dict):
+                records.append((vector["id"], vector["values"], vector.get("metadata") or {}))
+            else:
+                records.append((vector[0], vector[1], vector[2] if len(vector) > 2 else {}))
+        if not records:
+            return {"upserted_count": 0}
+
+        values = _normalize(np.asarray([r[1] for r in records], dtype=np.float32))
+        with self._lock:
+            if self.dimension is None:
+                self._set_dimension(values.shape[1])
+            elif values.shape[1] != self.dimension:
+                raise ValueError(
+                    f"Vector dimension {values.shape[1]} does not match index dimension {self.dimension}"
+                )
+
+            rows, next_row = [], len(self._ids)
+            for vector_id, _, _ in records:
+                row = self._rows.get(vector_id)
+                if row is None:
+                    row, next_row = next_row, next_row + 1
+                    self._rows[vector_id] = row
+                rows.append(row)
+            self._ensure_capacity(next_row)
+
+            self._matrix[rows] = values
+            self._matrix.flush()
+            with open(self.records_path, "a") as f:
+                for row, (vector_id, _, metadata) in zip(rows, records):
+                    self._set_row(row, vector_id, dict(metadata))
+                    f.write(json.dumps({"op": "put", "row": row, "id": vector_id, "metadata": metadata}) + "\n")
+            self._log_records += len(records)
+
+            if self._centroids is not None:
+                self._assignments[rows] = self._nearest_centroids(values)
+            if self.quantizer is not None:
+                self._encode_rows(rows, values)
+            # Overwrites leave superseded records behind in the log
+            self._maybe_compact()
+            self._maybe_build_ivf()
+        return {"upserted_count": len(records)}
+
+    def _candidate_rows(self, query: np.ndarray, filter):
+        live = self._live[:len(self._ids)]
+        if filter:
+            live = live & np.fromiter(
+                (m is not None and match_filter(m, filter) for m in self._metadata),
+                dtype=bool, count=len(self._metadata),
+            )
+        if self._centroids is None:
+            return None, live
+
+        probe = top_k_indices(self._centroids @ query, self.nprobe)
+        return np.flatnonzero(live & np.isin(self._assignments[:len(self._ids)], probe)), live
+
+    def query(
+        self,
+        vector=None,
+        top_k=10,
+        namespace=None,
+        filter=None,
+        include_values=False,
+        include_metadata=False,
+        id=None,
+        **kwargs,
+    ):
+        if namespace:
+            shard = self._shard(namespace)
+            if shard is None:
+                return {"matches": [], "namespace": namespace}
+            response = shard.query(
+                vector=vector, top_k=top_k, filter=filter,
+                include_values=include_values, include_metadata=include_metadata, id=id,
+            )
+            return {**response, "namespace": namespace}
+        with self._lock:
+            if not self._rows:
+                return {"matches": [], "namespace": ""}
+            if id is not None:
+                vector = self._matrix[self._rows[id]]
+            query = _normalize(np.asarray(vector, dtype=np.float32))
+
+            rows, live = self._candidate_rows(query, filter)
+            if rows is None or len(rows) < top_k:
+                # Full scan: one matvec over the whole matrix (or its codes), masked
+                if self.quantizer is None:
+                    scores = self._matrix[:len(self._ids)] @ query
+                    scores[~live] = -np.inf
+                    best = [i for i in top_k_indices(scores, top_k) if live[i]]
+                    best_scores = scores[best]
+                else:
+                    scores = self.quantizer.scores(self._codes[:len(self._ids)], query)
+                    scores[~live] = -np.inf
+                    candidates = [i for i in top_k_indices(scores, top_k * self.rescore_factor) if live[i]]
+                    best, best_scores = self._rescore(candidates, query, top_k)
+            elif self.quantizer is None:
+                scores = self._matrix[rows] @ query
+                order = top_k_indices(scores, top_k)
+                best, best_scores = rows[order], scores[order]
+            else:
+                scores = self.quantizer.scores(self._codes[rows], query)
+                candidates = rows[top_k_indices(scores, top_k * self.rescore_factor)]
+                best, best_scores = self._rescore(candidates, query, top_k)
+
+            matches = []
+            for row, score in zip(best, best_scores):
+                match = {"id": self._ids[row], "score": float(score)}
+                if include_values:
+                    match["values"] = self._matrix[row].tolist()
+                if include_metadata:
+                    match["metadata"] = dict(self._metadata[row])
+                matches.append(match)
+        return {"matches": matches, "namespace": ""}
+
+    def query_many(
+        self,
+        vectors,
+        top_k=10,
+        namespace=None,
+        filter=None,
+        include_metadata=False,
+        row_block=MATCH_ROW_BLOCK,
+        query_block=MATCH_QUERY_BLOCK,
+    ):
+        """
+        Exact top-k for many query vectors at once.
+
+        Scores are computed with blocked matrix multiplication: at most
+        ``query_block`` x ``row_block`` scores exist at a time, each block's
+        best k are taken with argpartition and merged into a running top-k
+        per query, so memory stays bounded however many rows are stored.
+        With quantization the blocks score the compressed codes, the running
+        lists hold ``top_k * rescore_factor`` candidates and those are
+        rescored in float32 at the end.
+
+        Returns:
+            One ``{"matches": [...]}`` dict per query vector, best first.
+        """
+        if namespace:
+            shard = self._shard(namespace)
+            if shard is None:
+                return [{"matches": []} for _ in range(len(vectors))]
+            return shard.query_many(vectors, top_k, None, filter, include_metadata, row_block, query_block)
+        queries = _normalize(np.asarray(vectors, dtype=np.float32).reshape(len(vectors), -1))
+        with self._lock:
+            n_rows = len(self._ids)
+            eligible = self._live[:n_rows].copy()
+            if filter:
+                eligible &= np.fromiter(
+                    (m is not None and match_filter(m, filter) for m in self._metadata),
+                    dtype=bool, count=n_rows,
+                )
+            k = min(top_k, int(eligible.sum()))
+            width = min(k * self.rescore_factor, int(eligible.sum()))
+            if k <= 0:
+                return [{"matches": []} for _ in range(len(queries))]
+            # Added to scores so excluded rows can never be picked
+            penalty = np.where(eligible, 0.0, -np.inf).astype(np.float32)
+
+            results = []
+            for q_start in range(0, len(queries), query_block):
+                block = queries[q_start:q_start + query_block]
+                best_scores = np.full((len(block), width), -np.inf, dtype=np.float32)
+                best_rows = np.full((len(block), width), -1, dtype=np.int64)
+                for r_start in range(0, n_rows, row_block):
+                    mask = eligible[r_start:r_start + row_block]
+                    if not mask.any():
+                        continue
+                    if self.quantizer is None:
+                        scores = block @ self._matrix[r_start:r_start + len(mask)].T
+                    else:
+                        scores = self.quantizer.scores_many(self._codes[r_start:r_start + len(mask)], block)
+                    if not mask.all():
+                        scores += penalty[r_start:r_start + len(mask)]
+                    block_k = min(width, scores.shape[1])
+                    # Partition for the largest scores in place of negating a copy
+                    part = np.argpartition(scores, -block_k, axis=1)[:, -block_k:]
+                    merged_scores = np.concatenate([best_scores, np.take_along_axis(scores, part, axis=1)], axis=1)
+                    merged_rows = np.concatenate([best_rows, part + r_start], axis=1)
+                    keep = np.argpartition(merged_scores, -width, axis=1)[:, -width:]
+                    best_scores = np.take_along_axis(merged_scores, keep, axis=1)
+                    best_rows = np.take_along_axis(merged_rows, keep, axis=1)
+
+                if self.quantizer is None:
+                    order = np.argsort(-best_scores, axis=1)
+                    best_scores = np.take_along_axis(best_scores, order, axis=1)
+                    best_rows = np.take_along_axis(best_rows, order, axis=1)
+                else:
+                    ranked = [
+                        self._rescore(rows[(rows >= 0) & np.isfinite(scores)], query, k)
+                        for rows, scores, query in zip(best_rows, best_scores, block)
+                    ]
+                    best_rows = [rows for rows, _ in ranked]
+                    best_scores = [scores for _, scores in ranked]
+                for rows, scores in zip(best_rows, best_scores):
+                    matches = []
+                    for row, score in zip(rows, scores):
+                        if row < 0 or score == -np.inf:
+                            continue
+                        match = {"id": self._ids[row], "score": float(score)}
+                        if include_metadata:
+                            match["metadata"] = dict(self._metadata[row])
+                        matches.append(match)
+                    results.append({"matches": matches})
+        return results
+
+    def fetch(self, ids, namespace=None, **kwargs):
+        if namespace:
+            shard = self._shard(namespace)
+            vectors = {} if shard is None else shard.fetch(ids)["vectors"]
+            return {"vectors": vectors, "namespace": namespace}
+        with self._lock:
+            vectors = {
+                i: {
+                    "id": i,
+                    "values": self._matrix[self._rows[i]].tolist(),
+                    "metadata": dict(self._metadata[self._rows[i]]),
+                }
+                for i in ids
+                if i in self._rows
+            }
+        return {"vectors": vectors, "namespace": ""}
+
+    def delete(self, ids=None, delete_all=False, namespace=None, filter=None, **kwargs):
+        """Delete from one namespace; ``delete_all`` empties only that namespace, as in Pinecone."""
+        if namespace:
+            if not delete_all:
+                shard = self._shard(namespace)
+                if shard is not None:
+                    shard.delete(ids=ids, filter=filter)
+                return {}
+            # Under both locks, so no write to the shard can land while its
+            # directory is being removed and _shard cannot reopen it halfway
+            with self._lock:
+                shard = self._shard(namespace)
+                if shard is not None:
+                    with shard._lock:
+                        shard.delete(delete_all=True)
+                        self._shards.pop(namespace, None)
+                        shutil.rmtree(shard.directory, ignore_errors=True)
+            return {}
+        with self._lock:
+            if delete_all:
+                self._reset()
+                return {}
+            rows = [self._rows[i] for i in ids or [] if i in self._rows]
+            if filter:
+                rows += [r for r, m in enumerate(self._metadata) if m is not None and match_filter(m, filter)]
+            if not rows:
+                return {}
+            with open(self.records_path, "a") as f:
+                for row in set(rows):
+                    self._clear_row(row)
+                    f.write(json.dumps({"op": "del", "row": row}) + "\n")
+            self._log_records += len(set(rows))
+            self._maybe_compact()
+        return {}
+
+    def describe_index_stats(self, **kwargs):
+        with self._lock:
+            namespaces = {"": {"vector_count": len(self._rows)}} if self._rows else {}
+            for name in self.list_namespaces():
+                count = len(self._shard(name)._rows)
+                if count:
+                    namespaces[name] = {"vector_count": count}
+            return {
+                "dimension": self.dimension or next(
+                    (self._shards[name].dimension for name in namespaces if name), None
+                ),
+                "total_vector_count": sum(ns["vector_count"] for ns in namespaces.values()),
+                "namespaces": namespaces,
+                "ivf_lists": 0 if self._centroids is None else len(self._centroids),
+            }
+
+
+class LocalVectorStore(VectorStore):
+    """
+    LangChain vector store over a :class:`LocalIndex`, or any other object
+    with the ``pc.Index`` API such as InMemoryIndex.
+
+    Mirrors the surface RagEngine uses from the Pinecone store (add_documents,
+    similarity_search, similarity_search_by_vector, delete(delete_all) and
+    as_retriever), and stores page text under the same ``text_key``.
+    """
+
+    def __init__(self, index: LocalIndex, embedding, text_key: str = "page_content"):
+        self.index = index
+        self._embedding = embedding
+        self._text_key = text_key
+
+    @property
+    def embeddings(self):
+        return self._embedding
+
+    def add_texts(self, texts, metadatas=None, ids=None, **kwargs):
+        texts = list(texts)
+        ids = list(ids) if ids else [str(uuid.uuid4()) for _ in texts]
+        metadatas = metadatas or [{} for _ in texts]
+        vectors = self._embedding.embed_documents(texts)
+        records = []
+        for vector_id, text, metadata, values in zip(ids, texts, metadatas, vectors):
+            metadata = dict(metadata)
+            metadata[self._text_key] = text
+            records.append({"id": vector_id, "values": values, "metadata": metadata})
+        self.index.upsert(vectors=records, namespace=kwargs.get("namespace"))
+        return ids
+
+    def similarity_search_by_vector_with_score(self, embedding, k=4, filter=None, namespace=None, **kwargs):
+        response = self.index.query(
+            vector=embedding, top_k=k, filter=filter, include_metadata=True, namespace=namespace,
+        )
+        results = []
+        for match in response["matches"]:
+            metadata = match["metadata"]
+            text = metadata.pop(self._text_key, "")
+            results.append((Document(page_content=text, metadata=metadata), match["score"]))
+        return results
+
+    def similarity_search_by_vector(self, embedding, k=4, filter=None, namespace=None, **kwargs):
+        return [doc for doc, _ in self.similarity_search_by_vector_with_score(embedding, k, filter, namespace)]
+
+    def similarity_search_with_score(self, query, k=4, filter=None, namespace=None, **kwargs):
+        return self.similarity_search_by_vector_with_score(
+            self._embedding.embed_query(query), k, filter, namespace
+        )
+
+    def similarity_search(self, query, k=4, filter=None, namespace=None, **kwargs):
+        return [doc for doc, _ in self.similarity_search_with_score(query, k, filter, namespace)]
+
+    def _select_relevance_score_fn(self):
+        # Cosine similarity in [-1, 1] mapped to [0, 1]
+        return lambda score: (score + 1) / 2
+
+    def delete(self, ids=None, delete_all=None, filter=None, namespace=None, **kwargs):
+        self.index.delete(ids=ids, delete_all=bool(delete_all), filter=filter, namespace=namespace)
+        return True
+
+    def stats(self):
+        return self.index.describe_index_stats()
+
+    @classmethod
+    def from_texts(cls, texts, embedding, metadatas=None, ids=None, directory=LOCAL_INDEX_DIR, **kwargs):
+        store = cls(LocalIndex(directory), embedding)
+        store.add_texts(texts, metadatas=metadatas, ids=ids)
+        return store
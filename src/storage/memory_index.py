@@ -0,0 +1,193 @@
+import threading
+import time
+
+import numpy as np
+
+
+def _match_condition(value, condition) -> bool:
+    if not isinstance(condition, dict):
+        condition = {"$eq": condition}
+    for op, expected in condition.items():
+        values = value if isinstance(value, list) else [value]
+        if op == "$exists":
+            ok = bool(expected)  # the field is present
+        elif op == "$eq":
+            ok = expected in values
+        elif op == "$ne":
+            ok = expected not in values
+        elif op == "$in":
+            ok = any(v in expected for v in values)
+        elif op == "$nin":
+            ok = not any(v in expected for v in values)
+        elif op in ("$gt", "$gte", "$lt", "$lte"):
+            if value is None or isinstance(value, (list, str)):
+                return False
+            ok = {
+                "$gt": value > expected,
+                "$gte": value >= expected,
+                "$lt": value < expected,
+                "$lte": value <= expected,
+            }[op]
+        else:
+            raise ValueError(f"Unsupported filter operator: {op}")
+        if not ok:
+            return False
+    return True
+
+
+def match_filter(metadata: dict, filter: dict | None) -> bool:
+    """
+    Evaluate a Pinecone-style metadata filter against one metadata dict.
+
+    Supports $eq, $ne, $in, $nin, $gt, $gte, $lt, $lte, $exists, $and and
+    $or, plus the implicit ``{"field": value}`` equality form. List-valued
+    metadata matches when any element matches, as in Pinecone.
+    """
+    if not filter:
+        return True
+    for key, condition in filter.items():
+        if key == "$and":
+            if not all(match_filter(metadata, f) for f in condition):
+                return False
+        elif key == "$or":
+            if not any(match_filter(metadata, f) for f in condition):
+                return False
+        elif key not in metadata:
+            if not (isinstance(condition, dict) and condition.get("$exists") is False):
+                return False
+        elif not _match_condition(metadata[key], condition):
+            return False
+    return True
+
+
+class InMemoryIndex:
+    """
+    In-process stand-in for a Pinecone ``pc.Index``.
+
+    Implements upsert, query, fetch, delete and describe_index_stats with the
+    same arguments and dict-shaped responses, so code written against a
+    Pinecone index can run without the service. ``latency`` adds a fixed
+    delay per call and ``fail_every`` makes every n-th upsert raise, which is
+    useful for exercising retry and throughput behaviour.
+    """
+
+    def __init__(self, dimension: int | None = None, latency: float = 0.0, fail_every: int = 0):
+        self.dimension = dimension
+        self.latency = latency
+        self.fail_every = fail_every
+        self.calls = {"upsert": 0, "query": 0, "fetch": 0, "delete": 0, "describe_index_stats": 0}
+        self._namespaces: dict[str, dict[str, tuple]] = {}
+        self._lock = threading.Lock()
+
+    def _call(self, name):
+        with self._lock:
+            self.calls[name] += 1
+            count = self.calls[name]
+        if self.latency:
+            time.sleep(self.latency)
+        return count
+
+    @staticmethod
+    def _record(vector):
+        if isinstance(vector, dict):
+            return vector["id"], vector["values"], vector.get("metadata") or {}
+        if len(vector) == 2:
+            return vector[0], vector[1], {}
+        return vector[0], vector[1], vector[2] or {}
+
+    def upsert(self, vectors, namespace=None, **kwargs):
+        count = self._call("upsert")
+        if self.fail_every and count % self.fail_every == 0:
+            raise ConnectionError("injected upsert failure")
+
+        namespace = namespace or ""
+        with self._lock:
+            store = self._namespaces.setdefault(namespace, {})
+            for vector in vectors:
+                vector_id, values, metadata = self._record(vector)
+                values = np.asarray(values, dtype=np.float32)
+                if self.dimension is None:
+                    self.dimension = len(values)
+                elif len(values) != self.dimension:
+                    raise ValueError(
+                        f"Vector dimension {len(values)} does not match index dimension {self.dimension}"
+                    )
+                store[vector_id] = (values, dict(metadata))
+        return {"upserted_count": len(vectors)}
+
+    def query(
+        self,
+        vector=None,
+        top_k=10,
+        namespace=None,
+        filter=None,
+        include_values=False,
+        include_metadata=False,
+        id=None,
+        **kwargs,
+    ):
+        self._call("query")
+        with self._lock:
+            store = dict(self._namespaces.get(namespace or "", {}))
+        if id is not None:
+            vector = store[id][0]
+
+        items = [(i, v, m) for i, (v, m) in store.items() if match_filter(m, filter)]
+        if not items:
+            return {"matches": [], "namespace": namespace or ""}
+
+        matrix = np.stack([v for _, v, _ in items])
+        query = np.asarray(vector, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1) * (np.linalg.norm(query) or 1.0)
+        scores = matrix @ query / np.where(norms == 0, 1.0, norms)
+        top = np.argsort(-scores)[:top_k]
+
+        matches = []
+        for i in top:
+            vector_id, values, metadata = items[i]
+            match = {"id": vector_id, "score": float(scores[i])}
+            if include_values:
+                match["values"] = values.tolist()
+            if include_metadata:
+                match["metadata"] = dict(metadata)
+            matches.append(match)
+        return {"matches": matches, "namespace": namespace or ""}
+
+    def fetch(self, ids, namespace=None, **kwargs):
+        self._call("fetch")
+        with self._lock:
+            store = self._namespaces.get(namespace or "", {})
+            vectors = {
+                i: {"id": i, "values": store[i][0].tolist(), "metadata": dict(store[i][1])}
+                for i in ids
+                if i in store
+            }
+        return {"vectors": vectors, "namespace": namespace or ""}
+
+    def delete(self, ids=None, delete_all=False, namespace=None, filter=None, **kwargs):
+        self._call("delete")
+        namespace = namespace or ""
+        with self._lock:
+            store = self._namespaces.get(namespace, {})
+            if delete_all:
+                store.clear()
+            elif filter:
+                for vector_id in [i for i, (_, m) in store.items() if match_filter(m, filter)]:
+                    del store[vector_id]
+            for vector_id in ids or []:
+                store.pop(vector_id, None)
+        return {}
+
+    def describe_index_stats(self, filter=None, **kwargs):
+        self._call("describe_index_stats")
+        with self._lock:
+            namespaces = {
+                name: {"vector_count": len(store)}
+                for name, store in self._namespaces.items()
+                if store
+            }
+        return {
+            "dimension": self.dimension,
+            "total_vector_count": sum(ns["vector_count"] for ns in namespaces.values()),
+            "namespaces": namespaces,
+        }
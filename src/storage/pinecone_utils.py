@@ -1,4 +1,6 @@
+import json
 import logging
+import os
 from typing import Optional, Dict, Any
 from pinecone import Pinecone as PineconeClient, ServerlessSpec
 from pinecone import ServerlessSpec, PodSpec
@@ -6,10 +8,46 @@ from src.config.settings import (
     PINECONE_API_KEY,
     PINECONE_INDEX_NAME,
     PINECONE_ENVIRONMENT,
+    INDEX_DESCRIPTOR_PATH,
 )
 
 logger = logging.getLogger(__name__)
 
+
+def load_index_descriptor(index_name: str, path: str = INDEX_DESCRIPTOR_PATH) -> Optional[Dict[str, Any]]:
+    """Return the cached {dimension, host} of an index verified earlier, if any."""
+    try:
+        with open(path) as f:
+            return json.load(f).get(index_name)
+    except (OSError, ValueError):
+        return None
+
+
+def save_index_descriptor(index_name: str, descriptor: Optional[Dict[str, Any]], path: str = INDEX_DESCRIPTOR_PATH):
+    """Store (or with None, drop) the cached descriptor of an index."""
+    try:
+        with open(path) as f:
+            descriptors = json.load(f)
+    except (OSError, ValueError):
+        descriptors = {}
+    if descriptor is None:
+        descriptors.pop(index_name, None)
+    else:
+        descriptors[index_name] = descriptor
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(descriptors, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def _embedding_dimension(embeddings) -> int:
+    """Dimension from the embedder's metadata, falling back to one inference call."""
+    dimension = getattr(embeddings, "dimension", None)
+    if dimension:
+        return dimension
+    return len(embeddings.embed_query("test"))
+
 def init_pinecone():
     """Initialize and return a Pinecone client."""
     return PineconeClient(api_key=PINECONE_API_KEY)
@@ -19,6 +57,7 @@ def delete_existing_index(pc, index_name: str):
     if index_name in pc.list_indexes().names():
         logger.info(f"Deleting existing index: {index_name}")
         pc.delete_index(index_name)
+        save_index_descriptor(index_name, None)
         return True
     return False
 
@@ -51,10 +90,15 @@ def get_or_create_index(
     embeddings, 
     index_name: str = PINECONE_INDEX_NAME, 
     environment: str = PINECONE_ENVIRONMENT,
-    recreate: bool = True
+    recreate: bool = False
 ):
     """
     Get or create a Pinecone index with the correct dimensions.
+
+    The embedding dimension is read from the embedder (model config) rather
+    than from an inference call. Once an index has been verified its
+    dimension and host are cached in INDEX_DESCRIPTOR_PATH, so later starts
+    connect straight to the host without listing or describing indexes.
     
     Args:
         embeddings: The embedding model to use
@@ -65,8 +109,13 @@ def get_or_create_index(
     pc = init_pinecone()
     
     # Get the embedding dimension
-    embedding_dimension = len(embeddings.embed_query("test"))
+    embedding_dimension = _embedding_dimension(embeddings)
     logger.info(f"Using embedding dimension: {embedding_dimension}")
+
+    descriptor = load_index_descriptor(index_name)
+    if descriptor and descriptor.get("dimension") == embedding_dimension and descriptor.get("host"):
+        logger.info(f"Using cached descriptor for index '{index_name}'")
+        return pc.Index(host=descriptor["host"])
     
     # Check if index exists
     if index_name in pc.list_indexes().names():
@@ -87,12 +136,19 @@ def get_or_create_index(
                 raise ValueError(
                     f"Dimension mismatch: Index has dimension {index_dimension} "
                     f"but model requires {embedding_dimension}. "
-                    "Set recreate=True to automatically recreate the index."
+                    "Run `python -m src.main reindex` to build a matching index version "
+                    "without downtime, or set recreate=True to delete and recreate it in place."
                 )
     else:
         # Create new index if it doesn't exist
         create_new_index(pc, index_name, embedding_dimension, environment)
-    
+
+    try:
+        host = pc.describe_index(index_name).host
+        save_index_descriptor(index_name, {"dimension": embedding_dimension, "host": host})
+        return pc.Index(host=host)
+    except Exception as e:
+        logger.warning(f"Could not cache descriptor for index '{index_name}': {e}")
     return pc.Index(index_name)
 
 
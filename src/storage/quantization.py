@@ -0,0 +1,152 @@
+import numpy as np
+
+# Rows converted to float32 at a time when scoring compressed codes; small
+# enough that the converted block stays in cache for the matmul
+_SCORE_BLOCK = 512
+
+# Bits set per byte; np.bitwise_count only exists from NumPy 2.0
+_POPCOUNT_TABLE = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+_popcount = getattr(np, "bitwise_count", None) or _POPCOUNT_TABLE.__getitem__
+
+
+class Quantizer:
+    """
+    Compressed form of unit-length float32 vectors for approximate scoring.
+
+    ``scores`` ranks codes against a query; it only has to preserve the
+    order well enough that the true top-k lands among the candidates that
+    LocalIndex then rescores exactly against its float32 matrix.
+    """
+
+    name = "none"
+    dtype = np.float32
+    rescore_factor = 1  # candidates rescored per requested result
+    needs_fit = False
+
+    def code_size(self, dimension: int) -> int:
+        return dimension
+
+    def fit(self, vectors: np.ndarray):
+        pass
+
+    def state(self) -> dict:
+        return {}
+
+    def load_state(self, state: dict):
+        pass
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        return np.asarray(vectors, dtype=self.dtype)
+
+    def scores(self, codes: np.ndarray, query: np.ndarray) -> np.ndarray:
+        """Approximate dot products of ``codes`` with one query, higher is closer."""
+        return self.scores_many(codes, query[None, :])[0]
+
+    def scores_many(self, codes: np.ndarray, queries: np.ndarray) -> np.ndarray:
+        """Approximate (queries x codes) dot products."""
+        out = np.empty((len(queries), len(codes)), dtype=np.float32)
+        prepared = self._prepare(queries).T
+        for start in range(0, len(codes), _SCORE_BLOCK):
+            block = codes[start:start + _SCORE_BLOCK]
+            out[:, start:start + len(block)] = (block.astype(np.float32) @ prepared).T
+        return out
+
+    def _prepare(self, queries: np.ndarray) -> np.ndarray:
+        return np.asarray(queries, dtype=np.float32)
+
+
+class Float16Quantizer(Quantizer):
+    """
+    Half precision: 2 bytes per dimension, near-lossless for unit vectors.
+
+    Halves storage, but NumPy's float16 -> float32 conversion is slow, so
+    scans cost more CPU than int8; prefer int8 when query time matters.
+    """
+
+    name = "float16"
+    dtype = np.float16
+    rescore_factor = 2
+
+
+class Int8Quantizer(Quantizer):
+    """
+    Per-dimension symmetric scalar quantization: 1 byte per dimension.
+
+    Dimension d is stored as ``round(x_d / scale_d)`` with ``scale_d`` set so
+    the largest magnitude seen while fitting maps to 127. The scales are
+    folded into the query, so scoring is a single int8-to-float matmul.
+    """
+
+    name = "int8"
+    dtype = np.int8
+    rescore_factor = 4
+    needs_fit = True
+
+    def __init__(self):
+        self.scale = None
+
+    def fit(self, vectors: np.ndarray):
+        peak = np.abs(np.asarray(vectors, dtype=np.float32)).max(axis=0)
+        self.scale = np.where(peak > 0, peak / 127.0, 1.0 / 127.0).astype(np.float32)
+
+    def state(self) -> dict:
+        return {"scale": None if self.scale is None else self.scale.tolist()}
+
+    def load_state(self, state: dict):
+        if state.get("scale") is not None:
+            self.scale = np.asarray(state["scale"], dtype=np.float32)
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        if self.scale is None:
+            self.fit(vectors)
+        return np.clip(np.rint(np.asarray(vectors, dtype=np.float32) / self.scale), -127, 127).astype(np.int8)
+
+    def _prepare(self, queries: np.ndarray) -> np.ndarray:
+        return np.asarray(queries, dtype=np.float32) * self.scale
+
+
+class BinaryQuantizer(Quantizer):
+    """
+    One sign bit per dimension (32x smaller than float32).
+
+    Candidates are ranked by Hamming distance between the sign bits of the
+    query and of each vector, computed with XOR and popcount over packed
+    bytes; the prefilter is coarse, so many more candidates are rescored.
+    """
+
+    name = "binary"
+    dtype = np.uint8
+    rescore_factor = 64
+
+    def code_size(self, dimension: int) -> int:
+        return (dimension + 7) // 8
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        return np.packbits(np.asarray(vectors) > 0, axis=-1)
+
+    def scores_many(self, codes: np.ndarray, queries: np.ndarray) -> np.ndarray:
+        bits = self.encode(queries)
+        out = np.empty((len(queries), len(codes)), dtype=np.float32)
+        for start in range(0, len(codes), _SCORE_BLOCK):
+            block = codes[start:start + _SCORE_BLOCK]
+            for i, query_bits in enumerate(bits):
+                distance = _popcount(np.bitwise_xor(block, query_bits)).sum(axis=1, dtype=np.int32)
+                out[i, start:start + len(block)] = -distance
+        return out
+
+
+QUANTIZERS = {
+    "float16": Float16Quantizer,
+    "int8": Int8Quantizer,
+    "binary": BinaryQuantizer,
+}
+
+
+def get_quantizer(name: str) -> Quantizer | None:
+    """Quantizer by name; None for "none" (plain float32 scoring)."""
+    if not name or name == "none":
+        return None
+    try:
+        return QUANTIZERS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown quantization '{name}', expected none, {', '.join(QUANTIZERS)}") from None
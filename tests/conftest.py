@@ -0,0 +1,26 @@
+"""
+Shared test setup: every backend is pointed at its offline fake.
+
+Settings are read when src.config.settings is first imported, so the
+environment is fixed here, before any test module imports from src.
+"""
+import os
+import tempfile
+
+_STATE_DIR = tempfile.mkdtemp(prefix="rag-tests-")
+
+os.environ.update({
+    "EMBEDDING_BACKEND": "hash",
+    "VECTORSTORE_BACKEND": "memory",
+    "LLM_BACKEND": "fake",
+    "FAKE_LLM_TOKEN_DELAY": "0",
+    "LANGCHAIN_API_KEY": "",
+    "RERANK_ENABLED": "false",
+    "ANSWER_CACHE_ENABLED": "false",
+    "METRICS_FILE": "",
+    "DATA_DIR": os.path.join(_STATE_DIR, "data"),
+    "CACHE_DIR": os.path.join(_STATE_DIR, "cache"),
+    "LOCAL_INDEX_DIR": os.path.join(_STATE_DIR, "index"),
+    "LEXICAL_INDEX_DIR": os.path.join(_STATE_DIR, "lexical"),
+    "MATCH_MATRIX_DIR": os.path.join(_STATE_DIR, "resumes"),
+})
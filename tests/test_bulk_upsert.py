@@ -0,0 +1,77 @@
+from langchain_core.documents import Document
+
+from src.embeddings.embeddings import HashEmbeddings
+from src.storage.bulk_upsert import BulkUpserter, _record_bytes
+from src.storage.memory_index import InMemoryIndex
+
+
+class RecordingIndex(InMemoryIndex):
+    """InMemoryIndex that keeps every upsert request it receives."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.requests = []
+
+    def upsert(self, vectors, namespace=None, **kwargs):
+        self.requests.append(list(vectors))
+        return super().upsert(vectors, namespace=namespace, **kwargs)
+
+
+def _docs(count, words=5):
+    docs = [Document(page_content=" ".join(f"word{i}-{w}" for w in range(words)), metadata={"n": i})
+            for i in range(count)]
+    return docs, [f"id-{i}" for i in range(count)]
+
+
+def test_transient_failures_are_retried():
+    index = InMemoryIndex(fail_every=2)
+    docs, ids = _docs(40)
+    upserter = BulkUpserter(index, HashEmbeddings(dimension=16), batch_size=10, workers=1, max_retries=2, backoff=0)
+
+    report = upserter.upsert_documents(docs, ids)
+
+    assert report["upserted"] == 40
+    assert report["failed_ids"] == []
+    assert index.describe_index_stats()["total_vector_count"] == 40
+    # Every other call failed and was retried
+    assert index.calls["upsert"] > report["requests"]
+
+
+def test_ids_are_reported_once_retries_are_exhausted():
+    index = InMemoryIndex(fail_every=1)
+    docs, ids = _docs(12)
+    upserter = BulkUpserter(index, HashEmbeddings(dimension=16), batch_size=5, max_retries=2, backoff=0)
+
+    report = upserter.upsert_documents(docs, ids)
+
+    assert report["upserted"] == 0
+    assert sorted(report["failed_ids"]) == sorted(ids)
+    assert index.calls["upsert"] == report["requests"] * 3
+
+
+def test_requests_are_bounded_by_count_and_bytes():
+    index = RecordingIndex()
+    docs, ids = _docs(50, words=40)
+    embeddings = HashEmbeddings(dimension=32)
+    one_record = 4 * 32 + len(docs[0].page_content)
+    upserter = BulkUpserter(index, embeddings, batch_size=20, max_batch_bytes=3 * one_record + 100, backoff=0)
+
+    report = upserter.upsert_documents(docs, ids)
+
+    assert report["upserted"] == 50
+    assert len(index.requests) == report["requests"]
+    assert len(index.requests) > 50 // 20
+    for request in index.requests:
+        assert len(request) <= 20
+        assert sum(_record_bytes(record) for record in request) <= upserter.max_batch_bytes
+    assert sorted(r["id"] for request in index.requests for r in request) == sorted(ids)
+
+
+def test_embedded_vectors_are_passed_to_the_callback():
+    docs, ids = _docs(7)
+    seen = {}
+    BulkUpserter(InMemoryIndex(), HashEmbeddings(dimension=16), batch_size=3).upsert_documents(
+        docs, ids, on_embedded=lambda batch_ids, vectors: seen.update(zip(batch_ids, vectors))
+    )
+
+    assert sorted(seen) == sorted(ids)
@@ -0,0 +1,41 @@
+from langchain_core.documents import Document
+
+from src.rag.context_packer import ContextPacker, count_tokens
+
+
+def _resume(name, lines):
+    return Document(page_content="\n".join(lines), metadata={"source": f"{name}.pdf"})
+
+
+DOCS = [
+    _resume("alice", [
+        "Built payment services in Python and Go.",
+        "She enjoys hiking and photography on weekends.",
+        "Alice led the migration of billing to Kubernetes.",
+    ] + [f"Attended internal training session number {i} on office safety." for i in range(30)]),
+    _resume("bob", [
+        "Bob works on forecasting models with PyTorch.",
+        "Built payment services in Python and Go.",
+    ]),
+]
+
+
+def test_relevant_sentences_fill_the_budget():
+    packer = ContextPacker(token_budget=60)
+
+    context, report = packer.pack("Who built payment services in Python?", DOCS)
+
+    assert report["tokens_after"] <= 60 < report["tokens_before"]
+    assert "payment services" in context
+    assert "number 29" not in context
+    # Bob's copy of the same sentence is a duplicate of Alice's
+    assert context.count("payment services") == 1
+    assert "forecasting models" in context
+    assert context.index("[1] alice.pdf") < context.index("payment")
+
+
+def test_whole_passages_are_kept_when_they_fit():
+    context, report = ContextPacker(token_budget=10_000).pack("anything", DOCS[1:] * 2)
+
+    assert report["sentences"] is None and report["passages"] == 1
+    assert count_tokens(context) == report["tokens_after"]
@@ -0,0 +1,83 @@
+import multiprocessing
+import threading
+import time
+
+import pytest
+
+import src.data_processing.document_loader as loader
+from src.data_processing.document_loader import iter_documents, list_document_files, prefetch
+
+
+def _fake_parse(path, timeout):
+    if "hang" in path:
+        time.sleep(60)
+    return [(f"text of {path}", {"source": path})], None
+
+
+def _wait_for_no_children(seconds=5.0):
+    deadline = time.monotonic() + seconds
+    while multiprocessing.active_children() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    return not multiprocessing.active_children()
+
+
+def test_prefetch_stops_and_closes_the_source_when_the_consumer_leaves():
+    closed = threading.Event()
+
+    def source():
+        try:
+            for i in range(1000):
+                yield i
+        finally:
+            closed.set()
+
+    items = prefetch(source(), maxsize=2, put_timeout=0.05)
+    assert next(items) == 0
+    items.close()
+
+    assert closed.wait(2)
+
+
+def test_prefetch_reraises_producer_errors():
+    def source():
+        yield 1
+        raise RuntimeError("parser exploded")
+
+    with pytest.raises(RuntimeError, match="parser exploded"):
+        list(prefetch(source(), maxsize=1))
+
+
+def test_hung_parse_is_failed_and_its_worker_recycled(monkeypatch):
+    monkeypatch.setattr(loader, "_parse_file", _fake_parse)
+    paths = ["a.txt", "hang.txt", "b.txt", "c.txt"]
+
+    start = time.monotonic()
+    results = {path: error for path, _, error in iter_documents(paths, workers=2, timeout=0.5)}
+
+    assert time.monotonic() - start < 10
+    assert results["hang.txt"].startswith("timed out")
+    assert [results[p] for p in ("a.txt", "b.txt", "c.txt")] == [None, None, None]
+    assert _wait_for_no_children()
+
+
+def test_closing_iter_documents_early_kills_the_pool(monkeypatch):
+    monkeypatch.setattr(loader, "_parse_file", _fake_parse)
+    documents = iter_documents(["a.txt", "hang.txt", "hang2.txt"], workers=3, timeout=30)
+
+    path, docs, error = next(documents)
+    assert path == "a.txt" and error is None
+    documents.close()
+
+    assert _wait_for_no_children()
+
+
+def test_file_patterns_cannot_leave_the_data_directory(tmp_path):
+    (tmp_path / "data").mkdir()
+    (tmp_path / "data" / "cv.pdf").write_text("x")
+    (tmp_path / "secret.pdf").write_text("x")
+    (tmp_path / "data" / "link.pdf").symlink_to(tmp_path / "secret.pdf")
+
+    assert list_document_files("*.pdf", str(tmp_path / "data")) == [str(tmp_path / "data" / "cv.pdf")]
+    for pattern in ("../*.pdf", "/etc/*", "sub/../../*.pdf"):
+        with pytest.raises(ValueError):
+            list_document_files(pattern, str(tmp_path / "data"))
@@ -0,0 +1,59 @@
+import multiprocessing
+
+import numpy as np
+
+from src.embeddings.embeddings import DiskEmbeddingStore
+
+
+def _vectors(values, dimension=4):
+    return np.repeat(np.asarray(values, dtype=np.float32)[:, None], dimension, axis=1)
+
+
+def test_torn_tails_are_dropped_before_appending(tmp_path):
+    store = DiskEmbeddingStore(str(tmp_path))
+    store.put_many(["a", "b"], _vectors([1, 2]))
+    # A writer crashed halfway through a row and an offset line
+    with open(store.matrix_path, "ab") as f:
+        f.write(b"\x00" * 5)
+    with open(store.offsets_path, "a") as f:
+        f.write("c\t")
+
+    DiskEmbeddingStore(str(tmp_path)).put_many(["c", "d"], _vectors([3, 4]))
+
+    reloaded = DiskEmbeddingStore(str(tmp_path))
+    assert len(reloaded) == 4
+    for key, value in zip("abcd", [1, 2, 3, 4]):
+        assert reloaded.get(key).tolist() == [value] * 4
+
+
+def test_writers_sharing_a_directory_see_each_others_rows(tmp_path):
+    first, second = DiskEmbeddingStore(str(tmp_path)), DiskEmbeddingStore(str(tmp_path))
+    first.put_many(["a", "b"], _vectors([1, 2]))
+    second.put_many(["b", "c"], _vectors([9, 3]))
+
+    reloaded = DiskEmbeddingStore(str(tmp_path))
+    assert len(reloaded) == 3
+    assert reloaded.get("b").tolist() == [2] * 4
+    assert reloaded.get("c").tolist() == [3] * 4
+
+
+def _write(directory, worker):
+    store = DiskEmbeddingStore(directory)
+    for i in range(20):
+        store.put_many([f"{worker}-{i}", f"shared-{i}"], _vectors([worker * 100 + i, -1]))
+
+
+def test_concurrent_processes_do_not_corrupt_the_store(tmp_path):
+    processes = [multiprocessing.Process(target=_write, args=(str(tmp_path), w)) for w in range(4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(30)
+        assert process.exitcode == 0
+
+    store = DiskEmbeddingStore(str(tmp_path))
+    assert len(store) == 4 * 20 + 20
+    assert store._rows == len(store)
+    for worker in range(4):
+        for i in range(20):
+            assert store.get(f"{worker}-{i}").tolist() == [worker * 100 + i] * 4
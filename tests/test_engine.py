@@ -0,0 +1,84 @@
+from langchain_core.documents import Document
+
+import src.rag.engine as engine_module
+from src.embeddings.embeddings import HashEmbeddings
+from src.rag.engine import RagEngine
+from src.storage.memory_index import InMemoryIndex
+
+
+class CountingEmbeddings(HashEmbeddings):
+    """HashEmbeddings that counts how often it is called."""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = {"embed_query": 0, "embed_documents": 0}
+
+    def embed_query(self, text):
+        self.calls["embed_query"] += 1
+        return super().embed_query(text)
+
+    def embed_documents(self, texts):
+        self.calls["embed_documents"] += 1
+        return super().embed_documents(texts)
+
+
+def _engine(monkeypatch):
+    embeddings = CountingEmbeddings()
+    monkeypatch.setattr(engine_module, "create_embeddings", lambda lazy=True: embeddings)
+    engine = RagEngine(lazy=True)
+    engine.process_documents(
+        [
+            Document(page_content="Alice is a backend engineer who builds payment services.",
+                     metadata={"source": "alice.pdf"}),
+            Document(page_content="Bob is a data scientist working on forecasting models.",
+                     metadata={"source": "bob.pdf"}),
+        ],
+        ids=["alice", "bob"],
+    )
+    assert isinstance(engine.index, InMemoryIndex)
+    embeddings.calls = dict.fromkeys(embeddings.calls, 0)
+    engine.index.calls = dict.fromkeys(engine.index.calls, 0)
+    return engine, embeddings
+
+
+def test_answer_embeds_and_queries_once_per_question(monkeypatch):
+    engine, embeddings = _engine(monkeypatch)
+    questions = ["Who builds payment services?", "Tell me about the forecasting work."]
+
+    for number, question in enumerate(questions, start=1):
+        result = engine.answer(question)
+
+        assert result["docs"]
+        assert embeddings.calls["embed_query"] == number
+        assert engine.index.calls["query"] == number
+
+
+def test_interpret_query_reuses_the_answer_path(monkeypatch):
+    engine, embeddings = _engine(monkeypatch)
+
+    answer, sources, run_id = engine.interpret_query("Who builds payment services?")
+
+    assert answer and sources and run_id
+    assert embeddings.calls["embed_query"] == 1
+    assert engine.index.calls["query"] == 1
+
+
+def test_cached_answers_require_the_same_filter(monkeypatch):
+    engine, _ = _engine(monkeypatch)
+    engine.answer_cache.enabled = True
+    engine.answer_cache.threshold = -1.0  # any question is "similar" enough
+
+    assert not engine.answer("python developers with more than 3 years")["cached"]
+    assert not engine.answer("python developers with less than 3 years")["cached"]
+    assert engine.answer("python devs with under 3 years of experience")["cached"]
+    assert not engine.answer("python devs with under 3 years", namespaces=["other"])["cached"]
+
+
+def test_context_packing_does_not_embed_sentences(monkeypatch):
+    engine, embeddings = _engine(monkeypatch)
+    engine.context_packer.token_budget = 10
+
+    result = engine.answer("Who builds payment services?")
+
+    assert result["context"]["tokens_saved"] > 0
+    assert embeddings.calls == {"embed_query": 1, "embed_documents": 0}
@@ -0,0 +1,57 @@
+import json
+
+from src.monitoring.feedback import FeedbackSink
+
+
+class StubClient:
+    """LangSmith client stand-in that records feedback or fails on demand."""
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.created = []
+
+    def create_feedback(self, **kwargs):
+        if self.fail:
+            raise ConnectionError("LangSmith unavailable")
+        self.created.append(kwargs)
+
+
+def _sink(client, spill_path, **kwargs):
+    options = {"flush_interval": 0.01, "max_retries": 1, "backoff": 0}
+    return FeedbackSink(client_factory=lambda: client, spill_path=str(spill_path), **{**options, **kwargs})
+
+
+def test_undeliverable_records_are_spilled_and_replayed(tmp_path):
+    spill_path = tmp_path / "feedback.jsonl"
+    down = StubClient(fail=True)
+    sink = _sink(down, spill_path)
+    for i in range(5):
+        sink.submit(f"run-{i}", score=i % 2)
+    sink.close()
+
+    spilled = [json.loads(line) for line in spill_path.read_text().splitlines()]
+    assert sorted(r["run_id"] for r in spilled) == [f"run-{i}" for i in range(5)]
+    assert down.created == []
+
+    up = StubClient()
+    sink = _sink(up, spill_path)
+    sink.close()
+
+    assert not spill_path.exists()
+    # Replayed records keep their feedback IDs, so a retry is not counted twice
+    assert sorted(r["feedback_id"] for r in up.created) == sorted(r["feedback_id"] for r in spilled)
+
+
+def test_records_beyond_the_queue_are_spilled(tmp_path):
+    spill_path = tmp_path / "feedback.jsonl"
+    spill_path.write_text("".join(json.dumps(
+        {"feedback_id": f"f{i}", "run_id": f"run-{i}", "key": "user_score", "score": 1, "comment": None}
+    ) + "\n" for i in range(4)) + '{"torn": ')
+    client = StubClient()
+    sink = _sink(client, spill_path, queue_size=2)
+    sink.close()
+
+    # Two fit the queue and are sent; the rest wait in the spill file for the next start
+    replayed = [json.loads(line) for line in spill_path.read_text().splitlines()]
+    assert sorted(r["feedback_id"] for r in client.created + replayed) == ["f0", "f1", "f2", "f3"]
+    assert len(client.created) == 2
@@ -0,0 +1,53 @@
+import src.data_processing.document_loader as loader
+from src.data_processing.ingest import ingest_incremental
+from src.data_processing.manifest import IngestManifest
+
+
+def _fake_parse(path, timeout):
+    with open(path) as f:
+        return [(f.read(), {"source": path})], None
+
+
+class RecordingEngine:
+    """The surface ingest writes to, keeping the vector IDs it holds."""
+
+    def __init__(self, manifest):
+        self.manifest = manifest
+        self.ids = set()
+
+    def process_documents(self, docs, ids, namespace=None):
+        self.ids.update(ids)
+        return {"failed_ids": []}
+
+    def delete_documents(self, ids, parent_ids=None, namespace=None):
+        self.ids.difference_update(ids)
+
+    def checkpoint_indexes(self):
+        pass
+
+    def save_indexes(self):
+        pass
+
+
+def test_ingesting_another_pattern_keeps_the_first_one(tmp_path, monkeypatch):
+    monkeypatch.setattr(loader, "_parse_file", _fake_parse)
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    (data_dir / "a.pdf").write_text("Alice, Python engineer")
+    (data_dir / "b.txt").write_text("Bob, Go engineer")
+    engine = RecordingEngine(IngestManifest(str(tmp_path / "manifest.json"), str(data_dir)))
+
+    first = ingest_incremental(engine, "**/*.pdf", str(data_dir))
+    second = ingest_incremental(engine, "**/*.txt", str(data_dir))
+
+    assert first["added"] == 1 and second["added"] == 1
+    assert second["removed"] == 0
+    assert sorted(engine.manifest.entries) == ["a.pdf", "b.txt"]
+    assert all(i in engine.ids for entry in engine.manifest.entries.values() for i in entry["ids"])
+    assert len(engine.manifest.sources[""]) == 2
+
+    (data_dir / "a.pdf").unlink()
+    third = ingest_incremental(engine, "**/*.txt", str(data_dir))
+
+    assert third["removed"] == 1
+    assert sorted(engine.manifest.entries) == ["b.txt"]
@@ -0,0 +1,88 @@
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+
+import src.monitoring.langsmith_monitor as monitor_module
+from src.monitoring.langsmith_monitor import LangSmithMonitor
+
+TODAY = date(2026, 3, 10)
+
+
+def _run(day, ms=100, run_type="chain", error=None, tokens=10):
+    start = datetime.combine(day, datetime.min.time()) + timedelta(hours=12)
+    return SimpleNamespace(
+        start_time=start,
+        end_time=start + timedelta(milliseconds=ms),
+        run_type=run_type,
+        error=error,
+        prompt_tokens=tokens,
+        completion_tokens=0,
+        total_tokens=tokens,
+        feedback_stats={"user_score": {"n": 1, "avg": 1.0}},
+    )
+
+
+class StubClient:
+    """list_runs yields runs lazily and counts how many were consumed."""
+
+    def __init__(self, runs):
+        self.runs = runs
+        self.calls = []
+        self.consumed = 0
+
+    def list_runs(self, project_name, start_time, end_time, select):
+        self.calls.append((start_time.date(), end_time.date()))
+
+        def stream():
+            for run in self.runs:
+                if start_time <= run.start_time < end_time:
+                    self.consumed += 1
+                    yield run
+
+        return stream()
+
+
+def _monitor(tmp_path, runs, monkeypatch):
+    monkeypatch.setattr(monitor_module, "utc_today", lambda: TODAY)
+    client = StubClient(runs)
+    return LangSmithMonitor(client=client, cache_path=str(tmp_path / "cache.json"), grace_days=2), client
+
+
+def test_runs_are_streamed_into_daily_stats(tmp_path, monkeypatch):
+    runs = [_run(TODAY - timedelta(days=5), ms=100 + i) for i in range(1000)]
+    runs += [_run(TODAY - timedelta(days=4), run_type="llm", error="boom")]
+    monitor, client = _monitor(tmp_path, runs, monkeypatch)
+
+    days = monitor.aggregate(str(TODAY - timedelta(days=5)), str(TODAY - timedelta(days=3)))
+
+    assert list(days) == [TODAY - timedelta(days=i) for i in (5, 4, 3)]
+    assert client.calls == [(TODAY - timedelta(days=5), TODAY - timedelta(days=2))]
+    assert client.consumed == 1001
+    chain = days[TODAY - timedelta(days=5)]["chain"].summary()
+    assert chain["runs"] == 1000 and chain["tokens"]["total"] == 10000
+    assert 100 <= chain["latency_ms"]["p50"] <= 1100 * 1.05
+    assert days[TODAY - timedelta(days=4)]["llm"].summary()["error_rate"] == 1.0
+    assert days[TODAY - timedelta(days=3)] == {}
+
+
+def test_only_days_past_the_grace_period_are_cached(tmp_path, monkeypatch):
+    runs = [_run(TODAY - timedelta(days=i)) for i in range(6)]
+    monitor, client = _monitor(tmp_path, runs, monkeypatch)
+    first, last = str(TODAY - timedelta(days=5)), str(TODAY)
+
+    monitor.aggregate(first, last)
+    # A late run lands on a recent day after the first report
+    runs.append(_run(TODAY - timedelta(days=2)))
+    days = monitor.aggregate(first, last)
+
+    # Days 5..3 come from the cache; the last three days are fetched again
+    assert client.calls[1] == (TODAY - timedelta(days=2), TODAY + timedelta(days=1))
+    assert days[TODAY - timedelta(days=2)]["chain"].runs == 2
+    assert days[TODAY - timedelta(days=5)]["chain"].runs == 1
+
+    # Once the day leaves the grace period it is frozen with the late run included
+    monkeypatch.setattr(monitor_module, "utc_today", lambda: TODAY + timedelta(days=1))
+    late_day = str(TODAY - timedelta(days=2))
+    monitor.aggregate(late_day, late_day)
+    days = monitor.aggregate(late_day, late_day)
+    assert len(client.calls) == 3
+    assert days[TODAY - timedelta(days=2)]["chain"].runs == 2
@@ -0,0 +1,78 @@
+import os
+
+from langchain_core.documents import Document
+
+from src.rag.lexical_index import BM25Index
+
+
+def _doc(i):
+    return Document(page_content=f"candidate {i} knows python and skill{i}", metadata={"n": i})
+
+
+def _docs_files(directory):
+    return sorted(name for name in os.listdir(directory) if name.endswith(".jsonl"))
+
+
+def test_deleted_documents_are_compacted_away(tmp_path):
+    index = BM25Index(str(tmp_path), compact_dead_fraction=0.5)
+    index.add_documents([_doc(i) for i in range(10)], [f"id-{i}" for i in range(10)])
+    index.save()
+    size = os.path.getsize(index.docs_path)
+
+    # Below the threshold deletes are only masked
+    index.delete([f"id-{i}" for i in range(4)])
+    index.save()
+    assert _docs_files(tmp_path) == ["docs.jsonl"]
+
+    index.delete([f"id-{i}" for i in range(4, 7)])
+    index.save()
+
+    assert _docs_files(tmp_path) == ["docs.1.jsonl"]
+    assert os.path.getsize(index.docs_path) < size / 2
+    reloaded = BM25Index(str(tmp_path))
+    assert len(reloaded._ids) == len(reloaded) == 3
+    assert [d.metadata["n"] for d in reloaded.search_documents("skill8")] == [8]
+    assert sorted(d.metadata["n"] for d in reloaded.search_documents("python")) == [7, 8, 9]
+
+    # Rows keep being appended and compacted after the renumbering
+    reloaded.add_documents([_doc(20), _doc(8)], ["id-20", "id-8"])
+    reloaded.delete(["id-7", "id-9"])
+    reloaded.save()
+    assert _docs_files(tmp_path) == ["docs.2.jsonl"]
+    assert sorted(d.metadata["n"] for d in BM25Index(str(tmp_path)).search_documents("python")) == [8, 20]
+
+
+def test_clear_removes_every_documents_file(tmp_path):
+    index = BM25Index(str(tmp_path), compact_dead_fraction=0.1)
+    index.add_documents([_doc(i) for i in range(3)], ["a", "b", "c"])
+    index.delete(["a"])
+    index.save()
+    index.clear()
+
+    assert _docs_files(tmp_path) == []
+    index.add_documents([_doc(5)], ["e"])
+    index.save()
+    assert [d.metadata["n"] for d in BM25Index(str(tmp_path)).search_documents("skill5")] == [5]
+
+
+def test_checkpoints_are_replayed_without_a_full_save(tmp_path):
+    index = BM25Index(str(tmp_path))
+    index.add_documents([_doc(i) for i in range(3)], [f"id-{i}" for i in range(3)])
+    index.save()
+    postings = os.path.getmtime(index.postings_path)
+
+    index.add_documents([_doc(3), _doc(10)], ["id-3", "id-1"])
+    index.delete(["id-0"])
+    index.checkpoint()
+    index.add_documents([_doc(4)], ["id-4"])  # never checkpointed
+
+    assert os.path.getmtime(index.postings_path) == postings
+    reloaded = BM25Index(str(tmp_path))
+    assert sorted(reloaded._rows) == ["id-1", "id-2", "id-3"]
+    assert [d.metadata["n"] for d in reloaded.search_documents("skill10")] == [10]
+    assert reloaded.search_documents("skill1") == []
+
+    # A full save folds the journal into the arrays
+    reloaded.save()
+    assert not os.path.exists(reloaded.journal_path)
+    assert sorted(d.metadata["n"] for d in BM25Index(str(tmp_path)).search_documents("python")) == [2, 3, 10]
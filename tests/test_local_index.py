@@ -0,0 +1,102 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+from src.storage.local_index import LocalIndex
+
+
+def _vectors(count, dimension=8, seed=0):
+    return np.random.default_rng(seed).normal(size=(count, dimension)).astype(np.float32)
+
+
+def _upsert(index, vectors, prefix="v", namespace=None):
+    index.upsert(
+        [{"id": f"{prefix}{i}", "values": v.tolist(), "metadata": {"n": i}} for i, v in enumerate(vectors)],
+        namespace=namespace,
+    )
+
+
+def _top_id(index, vector, **kwargs):
+    return index.query(vector=vector.tolist(), top_k=1, include_metadata=True, **kwargs)["matches"][0]["id"]
+
+
+@pytest.mark.parametrize("quantization", ["none", "int8"])
+def test_deletes_are_compacted_past_the_threshold(tmp_path, quantization):
+    vectors = _vectors(100)
+    index = LocalIndex(str(tmp_path), ivf_min_vectors=sys.maxsize, quantization=quantization,
+                       compact_dead_fraction=0.5)
+    _upsert(index, vectors)
+    size = os.path.getsize(index.records_path)
+
+    index.delete(ids=[f"v{i}" for i in range(20)])
+    assert len(index._ids) == 100  # only tombstoned so far
+    index.delete(ids=[f"v{i}" for i in range(20, 60)])
+
+    assert len(index._ids) == len(index._rows) == 40
+    assert os.path.getsize(index.records_path) < size / 2
+    assert os.path.getsize(index.matrix_path) == 40 * 8 * 4
+    for reopened in (index, LocalIndex(str(tmp_path), ivf_min_vectors=sys.maxsize, quantization=quantization)):
+        assert reopened.describe_index_stats()["total_vector_count"] == 40
+        assert _top_id(reopened, vectors[75]) == "v75"
+        assert reopened.fetch(["v99"])["vectors"]["v99"]["metadata"] == {"n": 99}
+
+    # Writes after the renumbering go to new rows
+    _upsert(index, vectors[:5], prefix="w")
+    assert _top_id(index, vectors[3]) == "w3"
+
+
+def test_overwrites_are_compacted_too(tmp_path):
+    vectors = _vectors(10)
+    index = LocalIndex(str(tmp_path), ivf_min_vectors=sys.maxsize, compact_dead_fraction=0.5)
+    for _ in range(3):
+        _upsert(index, vectors)
+
+    with open(index.records_path) as f:
+        assert sum(1 for _ in f) <= 20
+
+
+def test_interrupted_compaction_is_completed_on_load(tmp_path):
+    vectors = _vectors(20)
+    index = LocalIndex(str(tmp_path), ivf_min_vectors=sys.maxsize, compact_dead_fraction=1.0)
+    _upsert(index, vectors)
+    index.delete(ids=[f"v{i}" for i in range(10)])
+    # Simulate a crash right after the marker was written
+    finish = index._finish_compaction
+    index._finish_compaction = lambda: None
+    index.compact()
+    index._finish_compaction = finish
+
+    reopened = LocalIndex(str(tmp_path), ivf_min_vectors=sys.maxsize)
+    assert not os.path.exists(reopened.compact_marker_path)
+    assert len(reopened._ids) == 10
+    assert _top_id(reopened, vectors[15]) == "v15"
+
+
+def test_ivf_is_trained_in_the_background_not_by_queries(tmp_path):
+    vectors = _vectors(400, dimension=16)
+    index = LocalIndex(str(tmp_path), ivf_min_vectors=300, nprobe=4)
+    _upsert(index, vectors[:200])
+    assert index._ivf_thread is None
+
+    _upsert(index, vectors[200:], prefix="x")
+    index._ivf_thread.join(10)
+
+    assert index.describe_index_stats()["ivf_lists"] > 0
+    assert _top_id(index, vectors[250]) == "x50"
+
+
+def test_deleting_a_namespace_removes_its_shard(tmp_path):
+    vectors = _vectors(5)
+    index = LocalIndex(str(tmp_path), ivf_min_vectors=sys.maxsize)
+    _upsert(index, vectors, namespace="acme")
+    _upsert(index, vectors)
+
+    index.delete(delete_all=True, namespace="acme")
+
+    assert index.list_namespaces() == []
+    assert index.query(vector=vectors[0].tolist(), namespace="acme")["matches"] == []
+    assert index.describe_index_stats()["total_vector_count"] == 5
+    _upsert(index, vectors[:2], namespace="acme")
+    assert index.describe_index_stats()["namespaces"]["acme"] == {"vector_count": 2}
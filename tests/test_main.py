@@ -0,0 +1,22 @@
+import src.main as main_module
+from src.main import HealthCareBot, required_env_vars
+
+
+def test_required_env_vars_follow_the_backends():
+    assert required_env_vars("local", "fake") == []
+    assert required_env_vars("memory", "mistral") == ["MISTRAL_API_KEY"]
+    assert set(required_env_vars("pinecone", "fake")) == {
+        "PINECONE_API_KEY", "PINECONE_INDEX_NAME", "PINECONE_ENVIRONMENT",
+    }
+
+
+def test_clear_without_an_engine_exits_early(monkeypatch, capsys):
+    monkeypatch.setattr(main_module, "required_env_vars", lambda: ["UNSET_FOR_TEST"])
+    monkeypatch.delenv("UNSET_FOR_TEST", raising=False)
+    monkeypatch.setattr("builtins.input", lambda prompt: (_ for _ in ()).throw(AssertionError("prompted")))
+    bot = HealthCareBot()
+
+    bot.clear_data("acme")
+
+    assert bot.engine is None
+    assert "Cannot clear data" in capsys.readouterr().out
@@ -0,0 +1,63 @@
+import pytest
+
+from src.data_processing.metadata import extract_location, parse_query_constraints
+from src.storage.memory_index import match_filter
+
+
+def _soft(field, condition):
+    return {"$or": [{field: condition}, {field: {"$exists": False}}]}
+
+
+@pytest.mark.parametrize("question, condition", [
+    ("candidates with 5+ years", {"$gte": 5.0}),
+    ("at least 4 years of experience", {"$gte": 4.0}),
+    ("more than 6 yrs", {"$gt": 6.0}),
+    ("less than 3 years", {"$lt": 3.0}),
+    ("under 5 years of experience", {"$lt": 5.0}),
+    ("no more than 2 years", {"$lte": 2.0}),
+    ("8 years of experience or less", {"$lte": 8.0}),
+    ("3-5 years", {"$gte": 3.0, "$lte": 5.0}),
+    ("between 2 and 6 years", {"$gte": 2.0, "$lte": 6.0}),
+])
+def test_years_bound_follows_the_qualifier(question, condition):
+    assert parse_query_constraints(question) == _soft("years_experience", condition)
+
+
+@pytest.mark.parametrize("question, city", [
+    ("engineers based in Berlin", "berlin"),
+    ("nurses in new york city", "new york"),
+    ("who is in NYC?", "new york"),
+    ("data scientists from Bengaluru", "bangalore"),
+])
+def test_known_cities_become_location_filters(question, city):
+    assert parse_query_constraints(question) == _soft("location", {"$eq": city})
+
+
+@pytest.mark.parametrize("question", ["PhD in Computer Science", "experience in Machine Learning", "who works in Sales"])
+def test_other_phrases_are_not_locations(question):
+    constraints = parse_query_constraints(question) or {}
+    assert "location" not in str(constraints)
+
+
+def test_header_line_is_a_location_only_for_known_cities():
+    assert extract_location("Jane Doe, MBA\nProduct manager") is None
+    assert extract_location("Jane Doe\nAustin, TX\n") == "austin"
+    # An explicit label is trusted even for places outside the list
+    assert extract_location("Location: Smallville, KS") == "smallville"
+
+
+def test_stated_location_in_the_header_matches_the_question():
+    resume = "Candidate 7\nBackend Engineer based in Berlin\n\nSkills\npython"
+    constraints = parse_query_constraints("python engineers with 3+ years in Berlin")
+
+    assert extract_location(resume) == "berlin"
+    assert match_filter({"skills": ["python"], "location": "berlin", "years_experience": 4.0}, constraints)
+    assert not match_filter({"skills": ["python"], "location": "london"}, constraints)
+
+
+def test_soft_constraints_keep_resumes_missing_the_field():
+    constraints = parse_query_constraints("python engineers with 3+ years in Berlin")
+
+    assert match_filter({"skills": ["python"]}, constraints)
+    assert not match_filter({"skills": ["python"], "years_experience": 1.0}, constraints)
+    assert not match_filter({"skills": ["go"]}, constraints)
@@ -0,0 +1,25 @@
+from src.data_processing.ingest import ingest_incremental
+from src.data_processing.manifest import IngestManifest
+from src.rag.engine import RagEngine
+from src.rag.reindex import reindex
+from src.storage.index_alias import IndexAlias
+
+
+def test_reindex_rebuilds_the_default_namespace_from_its_recorded_source(tmp_path):
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    for name in ("alice", "bob", "carol"):
+        (data_dir / f"{name}.txt").write_text(f"{name.title()} is a backend engineer based in Berlin.")
+    engine = RagEngine(lazy=True)
+    engine.index_alias = IndexAlias(str(tmp_path / "alias.json"))
+    engine.manifest = IngestManifest(str(tmp_path / "manifest.json"), str(data_dir))
+    ingest_incremental(engine, "**/*.txt", str(data_dir))
+
+    # The default arguments name another pattern and directory
+    result = reindex(engine, switch=False)
+
+    assert result["status"] == "verified"
+    assert [summary["added"] for summary in result["ingest"][""]] == [3]
+    verification = result["verification"]
+    assert verification["missing_files"] == 0
+    assert verification["count"] == verification["live"] == 3
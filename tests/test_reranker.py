@@ -0,0 +1,59 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from langchain_core.documents import Document
+
+from src.rag.reranker import CrossEncoderReranker
+
+
+class BlockingReranker(CrossEncoderReranker):
+    """Scores by passage length once ``release`` is set, without a model."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.release = threading.Event()
+        self.scored = 0
+
+    def _score(self, query, passages):
+        self.release.wait(5)
+        self.scored += 1
+        return np.array([len(p) for p in passages], dtype=np.float32)
+
+
+DOCS = [Document(page_content="a" * n) for n in (1, 3, 2)]
+
+
+def test_scores_within_budget():
+    reranker = BlockingReranker(top_n=2, budget_ms=2000)
+    reranker.release.set()
+
+    assert [len(d.page_content) for d in reranker.rerank("q", DOCS)] == [3, 2]
+    assert reranker.stats()["fallbacks"] == 0
+
+
+def test_concurrent_queries_queue_instead_of_skipping():
+    reranker = BlockingReranker(top_n=2, budget_ms=2000, workers=1)
+    reranker.release.set()
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: reranker.rerank("q", DOCS), range(16)))
+
+    assert all([len(d.page_content) for d in result] == [3, 2] for result in results)
+    assert reranker.scored == 16
+    assert reranker.stats()["calls"] == 16
+    assert reranker.stats()["fallbacks"] == 0
+
+
+def test_queued_jobs_past_their_budget_are_not_scored():
+    reranker = BlockingReranker(top_n=2, budget_ms=50, workers=1)
+
+    # The first job holds the worker past its budget; the second times out in the queue
+    assert reranker.rerank("q", DOCS) == DOCS[:2]
+    assert reranker.rerank("q", DOCS) == DOCS[:2]
+
+    reranker.release.set()
+    reranker._executor.submit(lambda: None).result(5)
+    assert reranker.scored == 1
+    assert reranker.stats()["fallbacks"] == 2
+    assert [len(d.page_content) for d in reranker.rerank("q", DOCS)] == [3, 2]